@@ -0,0 +1,119 @@
+"""
+Slot booking under contention: many concurrent clients book overlapping
+slots in one queue through BookRecordUseCase. Reports throughput and
+created/conflict counts, then checks that no two records overlap.
+
+Usage (against a disposable database, DATABASE_URL from .env):
+    python -m benchmarks.booking_contention [--clients 50] [--attempts 20] [--slots 40]
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.orm import aliased
+
+import src.app.internal.data.models  # noqa: F401
+from src.app.internal.data.models.attachment_model import AttachmentModel  # noqa: F401
+from src.app.internal.data.models.queue_model import QueueModel
+from src.app.internal.data.models.record_model import RecordModel, UrgencyLevel
+from src.app.internal.data.models.user_model import UserModel
+from src.app.internal.data.repositories.queue_repository import QueueRepository
+from src.app.internal.data.repositories.record_repository import RecordRepository
+from src.app.internal.data.unit_of_work import UnitOfWork
+from src.app.internal.domain.services.book_record import BookRecordUseCase, SlotTakenError
+from src.config.database import AsyncSessionLocal, Base, engine
+
+INTERVAL = timedelta(minutes=30)
+
+
+async def client(user_id, queue_id, base, slots, attempts, counts):
+    for _ in range(attempts):
+        # Шаг 10 минут при интервале 30 — соседние попытки почти всегда пересекаются
+        when = base + timedelta(minutes=10 * random.randrange(slots * 3))
+        async with AsyncSessionLocal() as db:
+            use_case = BookRecordUseCase(
+                record_repo=RecordRepository(db),
+                queue_repo=QueueRepository(db),
+                uow=UnitOfWork(db),
+            )
+            try:
+                await use_case.execute(
+                    user_id=user_id,
+                    queue_id=queue_id,
+                    purpose="bench",
+                    meeting_datetime=when,
+                    urgency_level=UrgencyLevel.MEDIUM,
+                )
+                counts["created"] += 1
+            except SlotTakenError:
+                counts["conflict"] += 1
+
+
+async def count_overlaps(db, queue_id) -> int:
+    a, b = aliased(RecordModel), aliased(RecordModel)
+    return await db.scalar(
+        select(func.count())
+        .select_from(a)
+        .join(b, and_(
+            a.queue_id == b.queue_id,
+            a.record_id < b.record_id,
+            func.abs(func.extract("epoch", a.meeting_datetime - b.meeting_datetime)) < INTERVAL.total_seconds(),
+        ))
+        .where(a.queue_id == queue_id)
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--attempts", type=int, default=20)
+    parser.add_argument("--slots", type=int, default=40)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    async with AsyncSessionLocal() as db:
+        user = UserModel(uuid=uuid4(), login=f"bench-{uuid4().hex[:12]}", password_hash="x",
+                         email=f"bench-{uuid4().hex[:12]}@example.com")
+        queue = QueueModel(queue_id=uuid4(), name=f"bench-{uuid4().hex[:12]}", owner_id=user.uuid,
+                           record_interval=INTERVAL)
+        db.add(user)
+        await db.commit()
+        db.add(queue)
+        await db.commit()
+        user_id, queue_id = user.uuid, queue.queue_id
+
+    base = datetime(2100, 1, 1)
+    counts = {"created": 0, "conflict": 0}
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            client(user_id, queue_id, base, args.slots, args.attempts, counts)
+            for _ in range(args.clients)
+        ])
+        elapsed = time.perf_counter() - start
+
+        async with AsyncSessionLocal() as db:
+            overlaps = await count_overlaps(db, queue_id)
+
+        total = counts["created"] + counts["conflict"]
+        print(f"attempts   {total}")
+        print(f"created    {counts['created']}")
+        print(f"conflicts  {counts['conflict']}")
+        print(f"throughput {total / elapsed:.1f} bookings/s")
+        print(f"overlaps   {overlaps}")
+        if overlaps:
+            raise SystemExit("overlapping records found")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(RecordModel).where(RecordModel.queue_id == queue_id))
+            await db.execute(delete(QueueModel).where(QueueModel.queue_id == queue_id))
+            await db.execute(delete(UserModel).where(UserModel.uuid == user_id))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
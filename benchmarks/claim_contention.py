@@ -0,0 +1,104 @@
+"""
+Concurrent "claim next" on one queue: --managers clients drain a queue of
+--records pending records through RecordRepository.claim_next_record.
+Reports claims per second and claim latency, and checks that every record
+was claimed exactly once.
+
+Usage (against a disposable, migrated database, DATABASE_URL from .env):
+    python -m benchmarks.claim_contention [--managers 20] [--records 5000]
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select
+
+import src.app.internal.data.models  # noqa: F401
+from src.app.internal.data.models.attachment_model import AttachmentModel  # noqa: F401
+from src.app.internal.data.models.queue_model import QueueModel
+from src.app.internal.data.models.record_model import RecordModel, UrgencyLevel
+from src.app.internal.data.models.user_model import UserModel
+from src.app.internal.data.repositories.record_repository import RecordRepository
+from src.app.internal.domain.entities.record_entity import RecordEntity
+from src.config.database import AsyncSessionLocal
+
+INTERVAL = timedelta(minutes=30)
+
+
+async def manager(queue_id, manager_id, claimed, latencies):
+    while True:
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            record = await RecordRepository(db).claim_next_record(queue_id, manager_id)
+            latencies.append(time.perf_counter() - start)
+        if record is None:
+            return
+        claimed.append(record.record_id)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--managers", type=int, default=20)
+    parser.add_argument("--records", type=int, default=5000)
+    args = parser.parse_args()
+
+    async with AsyncSessionLocal() as db:
+        user = UserModel(uuid=uuid4(), login=f"bench-{uuid4().hex[:12]}", password_hash="x",
+                         email=f"bench-{uuid4().hex[:12]}@example.com")
+        queue = QueueModel(queue_id=uuid4(), name=f"bench-{uuid4().hex[:12]}", owner_id=user.uuid,
+                           record_interval=INTERVAL)
+        db.add(user)
+        await db.commit()
+        db.add(queue)
+        await db.commit()
+        user_id, queue_id = user.uuid, queue.queue_id
+
+    base = datetime(2100, 1, 1)
+    try:
+        async with AsyncSessionLocal() as db:
+            await RecordRepository(db).create_records([
+                RecordEntity(
+                    user_id=user_id, queue_id=queue_id, purpose="bench",
+                    meeting_datetime=base + INTERVAL * i, urgency_level=random.choice(list(UrgencyLevel)),
+                )
+                for i in range(args.records)
+            ])
+
+        claimed, latencies = [], []
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            manager(queue_id, user_id, claimed, latencies) for _ in range(args.managers)
+        ])
+        elapsed = time.perf_counter() - start
+
+        async with AsyncSessionLocal() as db:
+            unclaimed = await db.scalar(
+                select(func.count())
+                .select_from(RecordModel)
+                .where(RecordModel.queue_id == queue_id, RecordModel.claimed_by.is_(None))
+            )
+
+        duplicates = sum(count - 1 for count in Counter(claimed).values() if count > 1)
+        latencies.sort()
+        print(f"claimed    {len(claimed)} of {args.records}")
+        print(f"throughput {len(claimed) / elapsed:.1f} claims/s")
+        print(f"p50/p99    {latencies[len(latencies) // 2] * 1000:.1f} / "
+              f"{latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+        print(f"duplicates {duplicates}")
+        print(f"unclaimed  {unclaimed}")
+        if duplicates or unclaimed:
+            raise SystemExit("claims are not exclusive or the queue was not drained")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(RecordModel).where(RecordModel.queue_id == queue_id))
+            await db.execute(delete(QueueModel).where(QueueModel.queue_id == queue_id))
+            await db.execute(delete(UserModel).where(UserModel.uuid == user_id))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Concurrent-request throughput: synchronous Session inside async handlers
+(the old repository layer) against the AsyncSession path.
+
+Usage (DATABASE_URL from .env):
+    python -m benchmarks.concurrent_throughput [--requests 500] [--latency-ms 2]
+
+Every simulated request runs one short query. --latency-ms adds pg_sleep to it
+to stand in for network round-trip time to a remote database, which is where
+a blocked event loop hurts the most.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import func, select, text
+
+from src.config.database import AsyncSessionLocal, SessionLocal, async_engine
+
+CONCURRENCY_LEVELS = [1, 10, 50]
+
+
+def _statement(latency_ms: float):
+    if latency_ms > 0:
+        return select(func.pg_sleep(latency_ms / 1000))
+    return text("SELECT 1")
+
+
+async def sync_request(stmt) -> None:
+    # Так выглядел обработчик до перехода: синхронный вызов прямо в корутине
+    db = SessionLocal()
+    try:
+        db.execute(stmt)
+    finally:
+        db.close()
+
+
+async def async_request(stmt) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(stmt)
+
+
+async def run(handler, stmt, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await handler(stmt)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    stmt = _statement(args.latency_ms)
+    # Прогрев обоих пулов соединений
+    await run(sync_request, stmt, 20, 5)
+    await run(async_request, stmt, 20, 5)
+
+    print(f"{'concurrency':>12} {'sync req/s':>12} {'async req/s':>12}")
+    for concurrency in CONCURRENCY_LEVELS:
+        sync_rps = await run(sync_request, stmt, args.requests, concurrency)
+        async_rps = await run(async_request, stmt, args.requests, concurrency)
+        print(f"{concurrency:>12} {sync_rps:>12.1f} {async_rps:>12.1f}")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
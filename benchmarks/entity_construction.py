@@ -0,0 +1,99 @@
+"""
+Entity construction and list serialization for 10k-row lists, without a
+database: ORM instance + from_orm, validated constructor, and
+model_construct from column rows; then response_model re-validation
+against direct JSON serialization (page_response).
+
+Usage:
+    python -m benchmarks.entity_construction [--rows 10000] [--repeat 5]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+import src.app.internal.data.models  # noqa: F401
+from src.app.internal.data.models.attachment_model import AttachmentModel  # noqa: F401
+from src.app.internal.data.models.queue_model import QueueModel
+from src.app.internal.data.models.record_model import RecordModel, Status, UrgencyLevel
+from src.app.internal.data.pagination import Page
+from src.app.internal.data.statements import build_entities
+from src.app.internal.domain.entities.queue_entity import QueueEntity
+from src.app.internal.domain.entities.record_entity import RecordEntity
+from src.app.internal.presentation.api.json_response import page_response
+from src.app.internal.presentation.scheme.page_schema import PageResponse
+from src.app.internal.presentation.scheme.queue_schema import QueueResponse
+from src.app.internal.presentation.scheme.record_schema import RecordResponse
+
+
+def record_rows(n):
+    base = datetime(2100, 1, 1)
+    owner, queue = uuid4(), uuid4()
+    return [
+        {
+            "record_id": uuid4(), "user_id": owner, "queue_id": queue, "purpose": f"purpose {i}",
+            "meeting_datetime": base + timedelta(minutes=30 * i), "urgency_level": UrgencyLevel.MEDIUM,
+            "status": Status.PENDING, "manager_comment": None,
+        }
+        for i in range(n)
+    ]
+
+
+def queue_rows(n):
+    owner = uuid4()
+    return [
+        {
+            "queue_id": uuid4(), "name": f"queue-{i}", "owner_id": owner, "cleanup_interval": timedelta(days=1),
+            "record_interval": timedelta(minutes=30), "comments_limit": 5,
+        }
+        for i in range(n)
+    ]
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'entity':<8} {'path':<28} {'median ms':>10}")
+    for name, model, entity_cls, response_cls, data in [
+        ("record", RecordModel, RecordEntity, RecordResponse, record_rows(args.rows)),
+        ("queue", QueueModel, QueueEntity, QueueResponse, queue_rows(args.rows)),
+    ]:
+        # Строки результата select(*COLUMNS) дают доступ к колонкам через _mapping
+        rows = [SimpleNamespace(_mapping=row) for row in data]
+        orm_objects = [model(**row) for row in data]
+
+        for path, fn in [
+            ("orm instance + from_orm", lambda: [entity_cls.from_orm(model(**row)) for row in data]),
+            ("from_orm (loaded objects)", lambda: [entity_cls.from_orm(obj) for obj in orm_objects]),
+            ("columns + Entity(**row)", lambda: [entity_cls(**row._mapping) for row in rows]),
+            ("columns + model_construct", lambda: build_entities(entity_cls, rows)),
+        ]:
+            print(f"{name:<8} {path:<28} {timed(fn, args.repeat):>10.2f}")
+
+        page = Page(items=build_entities(entity_cls, rows), next_cursor="cursor")
+        adapter = TypeAdapter(PageResponse[response_cls])
+        for path, fn in [
+            ("response_model validate+dump", lambda: adapter.dump_json(adapter.validate_python(page, from_attributes=True))),
+            ("page_response dump only", lambda: page_response(page, entity_cls, response_cls)),
+        ]:
+            print(f"{name:<8} {path:<28} {timed(fn, args.repeat):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
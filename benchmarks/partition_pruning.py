@@ -0,0 +1,151 @@
+"""
+Partition pruning on records: fills one queue with --rows generated records
+spread over --months months, creates the monthly partitions, copies the same
+rows into an unpartitioned records_flat and compares EXPLAIN (ANALYZE, BUFFERS)
+of the hot queries (queue page for a month, collision check, record by id
+through record_locator, cleanup scan).
+
+Usage (against a disposable, migrated database, DATABASE_URL from .env):
+    python -m benchmarks.partition_pruning [--rows 20000000] [--months 24]
+"""
+import argparse
+import re
+import time
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from src.app.internal.data.partitions import (
+    add_months, create_partition, existing_partitions, partition_name, stored_columns
+)
+from src.config.database import engine
+
+START = date(2024, 1, 1)
+
+QUERIES = {
+    "queue page, one month": (
+        "SELECT * FROM {table} WHERE queue_id = :queue_id "
+        "AND meeting_datetime >= :month_lo AND meeting_datetime < :month_hi "
+        "ORDER BY meeting_datetime, record_id LIMIT 50"
+    ),
+    "collision check": (
+        "SELECT EXISTS (SELECT 1 FROM {table} WHERE queue_id = :queue_id "
+        "AND meeting_datetime > :slot - interval '30 minutes' AND meeting_datetime < :slot + interval '30 minutes')"
+    ),
+    "record by id": (
+        "SELECT * FROM {table} WHERE record_id = :record_id "
+        "AND meeting_datetime = (SELECT meeting_datetime FROM record_locator WHERE record_id = :record_id)"
+    ),
+    "cleanup scan": (
+        "SELECT record_id FROM {table} WHERE queue_id = :queue_id AND status = 'COMPLETED' "
+        "AND meeting_datetime < :month_lo LIMIT 500"
+    ),
+}
+
+_TIMING = re.compile(r"Execution Time: ([\d.]+) ms")
+_BUFFERS = re.compile(r"shared hit=(\d+)(?: read=(\d+))?")
+
+
+def explain(conn, sql, params):
+    plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params).scalars().all()
+    execution = next((float(m.group(1)) for line in plan if (m := _TIMING.search(line))), 0.0)
+    # Первая строка с буферами относится к корню плана — это сумма по всему запросу
+    buffers = next(
+        (int(m.group(1)) + int(m.group(2) or 0) for line in plan if (m := _BUFFERS.search(line))), 0
+    )
+    scanned = sum(1 for line in plan if " on records_" in line or " on records_flat" in line)
+    return execution, buffers, scanned
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000_000)
+    parser.add_argument("--months", type=int, default=24)
+    args = parser.parse_args()
+
+    user_id, queue_id = uuid4(), uuid4()
+    step = timedelta(days=30 * args.months) / args.rows
+    months = [add_months(START, offset) for offset in range(args.months)]
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO users (uuid, login, password_hash, email, email_notifications, telegram_notifications) "
+                "VALUES (:id, :login, 'x', :email, false, false)"
+            ),
+            {"id": user_id, "login": f"bench-{user_id}", "email": f"bench-{user_id}@example.com"},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO queues (queue_id, name, owner_id, cleanup_interval, record_interval) "
+                "VALUES (:id, :name, :owner, interval '30 days', interval '30 minutes')"
+            ),
+            {"id": queue_id, "name": f"bench-{queue_id}", "owner": user_id},
+        )
+
+    existing = set()
+    try:
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            existing = existing_partitions(conn)
+            conn.execute(
+                text(
+                    "INSERT INTO records (record_id, user_id, queue_id, purpose, meeting_datetime, urgency_level, status) "
+                    "SELECT gen_random_uuid(), :user_id, :queue_id, 'bench', "
+                    ":start + n * :step, 'MEDIUM', "
+                    "(CASE WHEN n % 3 = 0 THEN 'COMPLETED' ELSE 'PENDING' END)::status "
+                    "FROM generate_series(0, :rows - 1) AS n"
+                ),
+                {"user_id": user_id, "queue_id": queue_id, "start": datetime.combine(START, datetime.min.time()),
+                 "step": step, "rows": args.rows},
+            )
+        for month in months:
+            if month not in existing:
+                with engine.begin() as conn:
+                    create_partition(conn, month)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE records_flat (LIKE records INCLUDING ALL)"))
+            columns = ", ".join(stored_columns(conn))
+            conn.execute(
+                text(f"INSERT INTO records_flat ({columns}) SELECT {columns} FROM records WHERE queue_id = :queue_id"),
+                {"queue_id": queue_id},
+            )
+            conn.execute(text("ANALYZE records"))
+            conn.execute(text("ANALYZE records_flat"))
+        print(f"loaded {args.rows} rows into {args.months} partitions in {time.perf_counter() - start:.1f} s")
+
+        middle = months[len(months) // 2]
+        params = {
+            "queue_id": queue_id,
+            "month_lo": datetime.combine(middle, datetime.min.time()),
+            "month_hi": datetime.combine(add_months(middle, 1), datetime.min.time()),
+            "slot": datetime.combine(middle, datetime.min.time()) + timedelta(days=10, hours=12),
+        }
+        with engine.connect() as conn:
+            params["record_id"] = conn.execute(
+                text(
+                    "SELECT record_id FROM records WHERE queue_id = :queue_id "
+                    "AND meeting_datetime >= :month_lo AND meeting_datetime < :month_hi LIMIT 1"
+                ),
+                params,
+            ).scalar()
+        print(f"{'query':<24} {'table':<12} {'exec ms':>10} {'buffers':>10} {'relations':>10}")
+        with engine.connect() as conn:
+            for name, sql in QUERIES.items():
+                for table in ("records", "records_flat"):
+                    execution, buffers, scanned = explain(conn, sql.format(table=table), params)
+                    print(f"{name:<24} {table:<12} {execution:>10.2f} {buffers:>10} {scanned:>10}")
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS records_flat"))
+            conn.execute(text("DELETE FROM records WHERE queue_id = :queue_id"), {"queue_id": queue_id})
+            for month in months:
+                if month not in existing:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {partition_name(month)}"))
+            conn.execute(text("DELETE FROM queues WHERE queue_id = :queue_id"), {"queue_id": queue_id})
+            conn.execute(text("DELETE FROM users WHERE uuid = :user_id"), {"user_id": user_id})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Plan checks for filtered record lists: loads one queue with --rows records
+(--active-share of them PENDING/CONFIRMED), builds the same statements as
+RecordRepository list pages and asserts via EXPLAIN (FORMAT JSON) which
+index serves each of them. Partition indexes are resolved to the parent
+index name. Exits with status 1 if any plan uses an unexpected index.
+
+Usage (against a disposable, migrated database, DATABASE_URL from .env):
+    python -m benchmarks.record_filter_plans [--rows 200000] [--active-share 0.05]
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import select, text
+
+from src.app.internal.data.models.record_model import ACTIVE_STATUSES, RecordModel, Status, UrgencyLevel
+from src.app.internal.data.pagination import keyset
+from src.app.internal.data.repositories.record_repository import (
+    RECORD_COLUMNS, RECORD_PAGE_KEY, RECORD_PAGE_KEY_TYPES, _apply_filter,
+)
+from src.app.internal.domain.entities.record_entity import RecordFilter
+from src.config.database import engine
+
+START = datetime(2024, 1, 1)
+ACTIVE = RecordFilter(statuses=ACTIVE_STATUSES)
+
+
+def index_names(plan) -> set:
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", ()):
+        names |= index_names(child)
+    return names
+
+
+def root_index(conn, name: str) -> str:
+    # Индексы секций наследуют индекс родительской таблицы; поднимаемся до корня
+    while True:
+        parent = conn.execute(
+            text(
+                "SELECT parent.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE child.relname = :name"
+            ),
+            {"name": name},
+        ).scalar()
+        if parent is None:
+            return name
+        name = parent
+
+
+def explain_indexes(conn, stmt) -> set:
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()[0]["Plan"]
+    return {root_index(conn, name) for name in index_names(plan)}
+
+
+def page(owner_column, owner_id, filters=None, cursor=None):
+    stmt = select(*RECORD_COLUMNS).where(owner_column == owner_id)
+    return keyset(
+        _apply_filter(stmt, filters), RECORD_PAGE_KEY, cursor, RECORD_PAGE_KEY_TYPES, 50,
+        descending=filters is not None and filters.descending,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--active-share", type=float, default=0.05)
+    args = parser.parse_args()
+
+    user_id, queue_id = uuid4(), uuid4()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO users (uuid, login, password_hash, email, email_notifications, telegram_notifications) "
+                "VALUES (:id, :login, 'x', :email, false, false)"
+            ),
+            {"id": user_id, "login": f"bench-{user_id}", "email": f"bench-{user_id}@example.com"},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO queues (queue_id, name, owner_id, cleanup_interval, record_interval) "
+                "VALUES (:id, :name, :owner, interval '30 days', interval '30 minutes')"
+            ),
+            {"id": queue_id, "name": f"bench-{queue_id}", "owner": user_id},
+        )
+
+    failures = 0
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO records (record_id, user_id, queue_id, purpose, meeting_datetime, urgency_level, status) "
+                    "SELECT gen_random_uuid(), :user_id, :queue_id, 'bench', :start + n * interval '30 minutes', "
+                    "(ARRAY['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'])[1 + n % 4]::urgencylevel, "
+                    "(CASE WHEN random() < :active THEN 'PENDING' ELSE 'COMPLETED' END)::status "
+                    "FROM generate_series(0, :rows - 1) AS n"
+                ),
+                {"user_id": user_id, "queue_id": queue_id, "start": START, "active": args.active_share,
+                 "rows": args.rows},
+            )
+            conn.execute(text("ANALYZE records"))
+
+        middle = START + timedelta(minutes=30 * args.rows // 2)
+        cases = [
+            ("queue, active", page(RecordModel.queue_id, queue_id, ACTIVE), "ix_records_queue_active"),
+            ("queue, pending only", page(RecordModel.queue_id, queue_id, RecordFilter(statuses=(Status.PENDING,))),
+             "ix_records_queue_active"),
+            ("queue, active, latest first",
+             page(RecordModel.queue_id, queue_id, RecordFilter(statuses=ACTIVE.statuses, descending=True)),
+             "ix_records_queue_active"),
+            ("queue, active, urgent, window",
+             page(RecordModel.queue_id, queue_id, RecordFilter(
+                 statuses=ACTIVE.statuses, urgency_levels=(UrgencyLevel.HIGH, UrgencyLevel.CRITICAL),
+                 since=middle, until=middle + timedelta(days=7),
+             )),
+             "ix_records_queue_active"),
+            ("user, active", page(RecordModel.user_id, user_id, ACTIVE), "ix_records_user_active"),
+            ("queue, completed", page(RecordModel.queue_id, queue_id, RecordFilter(statuses=(Status.COMPLETED,))),
+             "ix_records_queue_meeting"),
+        ]
+
+        with engine.connect() as conn:
+            for name, stmt, expected in cases:
+                used = explain_indexes(conn, stmt)
+                ok = expected in used
+                failures += not ok
+                print(f"{'ok  ' if ok else 'FAIL'} {name:<32} expected {expected}, used {', '.join(sorted(used)) or '-'}")
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM records WHERE queue_id = :queue_id"), {"queue_id": queue_id})
+            conn.execute(text("DELETE FROM queues WHERE queue_id = :queue_id"), {"queue_id": queue_id})
+            conn.execute(text("DELETE FROM users WHERE uuid = :user_id"), {"user_id": user_id})
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
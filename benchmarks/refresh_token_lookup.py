@@ -0,0 +1,113 @@
+"""
+Latency of refresh-token lookup as the refresh_tokens table grows.
+
+Usage (against a disposable database, DATABASE_URL from .env):
+    python -m benchmarks.refresh_token_lookup
+
+The selector/verifier path should stay flat for every table size, the legacy
+path (bcrypt against every live row) grows linearly with it.
+"""
+import asyncio
+import secrets
+import statistics
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import src.app.internal.data.models  # noqa: F401
+from src.app.internal.data.models.attachment_model import AttachmentModel  # noqa: F401
+from src.app.internal.data.models.refresh_token_model import RefreshTokenModel
+from src.app.internal.data.models.user_model import UserModel
+from src.app.internal.data.repositories.auth_repository import AuthRepository, pwd_context
+from sqlalchemy import delete, insert
+
+from src.config.database import AsyncSessionLocal, Base, engine
+
+SELECTOR_SIZES = [100, 1_000, 10_000, 50_000]
+# Каждая legacy-строка стоит один полный bcrypt, поэтому размеры меньше
+LEGACY_SIZES = [10, 50, 100]
+ROUNDS = 20
+
+
+async def _make_user(db) -> UserModel:
+    user = UserModel(
+        uuid=uuid4(),
+        login=f"bench-{uuid4().hex[:12]}",
+        password_hash="x",
+        email=f"bench-{uuid4().hex[:12]}@example.com",
+    )
+    db.add(user)
+    await db.commit()
+    return user
+
+
+async def _fill(db, user_uuid, count: int, legacy: bool) -> None:
+    # Один общий хеш для всех строк-заглушек: ни одна из них не совпадёт с искомым токеном
+    filler_hash = pwd_context.hash(secrets.token_urlsafe(32))
+    expires_at = datetime.utcnow() + timedelta(days=7)
+    await db.execute(
+        insert(RefreshTokenModel),
+        [
+            {
+                "id": uuid4(),
+                "user_uuid": user_uuid,
+                "selector": None if legacy else secrets.token_urlsafe(12),
+                "token_hash": filler_hash,
+                "expires_at": expires_at,
+                "revoked": False,
+            }
+            for _ in range(count)
+        ],
+    )
+    await db.commit()
+
+
+async def _cleanup(db, user_uuid) -> None:
+    await db.execute(delete(RefreshTokenModel).where(RefreshTokenModel.user_uuid == user_uuid))
+    await db.commit()
+
+
+async def _measure(repo: AuthRepository, raw_token: str, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        found = await repo.find_valid_refresh_token(raw_token)
+        timings.append(time.perf_counter() - start)
+        assert found is not None
+    return statistics.median(timings) * 1000
+
+
+async def main() -> None:
+    Base.metadata.create_all(bind=engine)
+    db = AsyncSessionLocal()
+    user = await _make_user(db)
+    repo = AuthRepository(db)
+
+    try:
+        print("selector/verifier lookup")
+        for size in SELECTOR_SIZES:
+            await _fill(db, user.uuid, size, legacy=False)
+            raw = await repo.create_refresh_token(user.uuid)
+            print(f"  {size:>7} rows: {await _measure(repo, raw, ROUNDS):8.2f} ms")
+            await _cleanup(db, user.uuid)
+
+        print("legacy scan")
+        for size in LEGACY_SIZES:
+            await _fill(db, user.uuid, size, legacy=True)
+            legacy_raw = secrets.token_urlsafe(32)
+            db.add(RefreshTokenModel(
+                user_uuid=user.uuid,
+                token_hash=pwd_context.hash(legacy_raw),
+                expires_at=datetime.utcnow() + timedelta(days=7),
+            ))
+            await db.commit()
+            print(f"  {size:>7} rows: {await _measure(repo, legacy_raw, 3):8.2f} ms")
+            await _cleanup(db, user.uuid)
+    finally:
+        await db.delete(user)
+        await db.commit()
+        await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+Write-path latency: ORM add/commit/refresh and SELECT-modify-flush against
+INSERT ... RETURNING / UPDATE ... RETURNING (RecordRepository).
+
+Usage (against a disposable database, DATABASE_URL from .env):
+    python -m benchmarks.write_path [--rows 1000]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import delete, select
+
+import src.app.internal.data.models  # noqa: F401
+from src.app.internal.data.models.attachment_model import AttachmentModel  # noqa: F401
+from src.app.internal.data.models.queue_model import QueueModel
+from src.app.internal.data.models.record_model import RecordModel
+from src.app.internal.data.models.user_model import UserModel
+from src.app.internal.data.repositories.record_repository import RecordRepository
+from src.app.internal.domain.entities.record_entity import RecordEntity
+from src.config.database import AsyncSessionLocal, Base, engine
+
+
+async def orm_create(db, user_id, queue_id, when):
+    db_record = RecordModel(record_id=uuid4(), user_id=user_id, queue_id=queue_id, purpose="bench", meeting_datetime=when)
+    db.add(db_record)
+    await db.commit()
+    await db.refresh(db_record)
+    return RecordEntity.from_orm(db_record)
+
+
+async def orm_update(db, record_id):
+    db_record = await db.scalar(select(RecordModel).where(RecordModel.record_id == record_id))
+    db_record.manager_comment = "updated"
+    await db.commit()
+    await db.refresh(db_record)
+    return RecordEntity.from_orm(db_record)
+
+
+async def timed(calls):
+    timings = []
+    for call in calls:
+        start = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, sum(timings)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    async with AsyncSessionLocal() as db:
+        user = UserModel(uuid=uuid4(), login=f"bench-{uuid4().hex[:12]}", password_hash="x",
+                         email=f"bench-{uuid4().hex[:12]}@example.com")
+        queue = QueueModel(queue_id=uuid4(), name=f"bench-{uuid4().hex[:12]}", owner_id=user.uuid)
+        db.add(user)
+        await db.commit()
+        db.add(queue)
+        await db.commit()
+        user_id, queue_id = user.uuid, queue.queue_id
+
+    base = datetime(2100, 1, 1)
+    repo_db = AsyncSessionLocal()
+    orm_db = AsyncSessionLocal()
+    repo = RecordRepository(repo_db)
+    try:
+        orm_ids, repo_ids = [], []
+
+        async def orm_insert(i):
+            orm_ids.append((await orm_create(orm_db, user_id, queue_id, base + timedelta(hours=i))).record_id)
+
+        async def repo_insert(i):
+            entity = RecordEntity(user_id=user_id, queue_id=queue_id, purpose="bench",
+                                  meeting_datetime=base + timedelta(hours=args.rows + i))
+            repo_ids.append((await repo.create_record(entity)).record_id)
+
+        print(f"{'operation':<10} {'path':<12} {'median ms':>10} {'total s':>9}")
+        for name, path, calls in [
+            ("insert", "orm+refresh", [lambda i=i: orm_insert(i) for i in range(args.rows)]),
+            ("insert", "returning", [lambda i=i: repo_insert(i) for i in range(args.rows)]),
+        ]:
+            median, total = await timed(calls)
+            print(f"{name:<10} {path:<12} {median:>10.3f} {total:>9.2f}")
+
+        for name, path, calls in [
+            ("update", "orm+refresh", [lambda r=r: orm_update(orm_db, r) for r in orm_ids]),
+            ("update", "returning", [lambda r=r: repo.update_record_partial(r, {"manager_comment": "updated"}) for r in repo_ids]),
+        ]:
+            median, total = await timed(calls)
+            print(f"{name:<10} {path:<12} {median:>10.3f} {total:>9.2f}")
+    finally:
+        await repo_db.close()
+        await orm_db.close()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(RecordModel).where(RecordModel.queue_id == queue_id))
+            await db.execute(delete(QueueModel).where(QueueModel.queue_id == queue_id))
+            await db.execute(delete(UserModel).where(UserModel.uuid == user_id))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""baseline schema
+
+Схема в том виде, в каком её создавал Base.metadata.create_all при старте приложения.
+Для существующей базы, созданной так, выполнить один раз: alembic stamp 0001
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+URGENCY_LEVEL = sa.Enum("LOW", "MEDIUM", "HIGH", "CRITICAL", name="urgencylevel")
+STATUS = sa.Enum("PENDING", "CONFIRMED", "COMPLETED", "CANCELLED", "REJECTED", name="status")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("login", sa.String(50), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(100), nullable=False),
+        sa.Column("email_notifications", sa.Boolean(), nullable=False),
+        sa.Column("telegram_login", sa.String(50), nullable=True, unique=True),
+        sa.Column("telegram_notifications", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_users_login", "users", ["login"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_uuid", postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey("users.uuid", ondelete="CASCADE"), nullable=False),
+        sa.Column("token_hash", sa.String(255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("revoked", sa.Boolean(), nullable=False),
+    )
+
+    op.create_table(
+        "queues",
+        sa.Column("queue_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.uuid"), nullable=False),
+        sa.Column("cleanup_interval", sa.Interval(), nullable=False),
+        sa.Column("record_interval", sa.Interval(), nullable=False),
+    )
+    op.create_index("ix_queues_name", "queues", ["name"], unique=True)
+    op.create_index("ix_queues_owner_id", "queues", ["owner_id"])
+
+    op.create_table(
+        "records",
+        sa.Column("record_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.uuid"), nullable=False),
+        sa.Column("queue_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("queues.queue_id"), nullable=False),
+        sa.Column("purpose", sa.Text(), nullable=False),
+        sa.Column("meeting_datetime", sa.DateTime(), nullable=False),
+        sa.Column("urgency_level", URGENCY_LEVEL, nullable=False),
+        sa.Column("status", STATUS, nullable=False),
+        sa.Column("manager_comment", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_records_user_id", "records", ["user_id"])
+    op.create_index("ix_records_queue_id", "records", ["queue_id"])
+
+    op.create_table(
+        "comments",
+        sa.Column("comment_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("queue_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("queues.queue_id"), nullable=False),
+        sa.Column("record_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("records.record_id"), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(), nullable=False),
+    )
+
+    op.create_table(
+        "attachments",
+        sa.Column("attachment_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("record_id", postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey("records.record_id", ondelete="CASCADE"), nullable=False),
+        sa.Column("object_key", sa.String(512), nullable=False, unique=True),
+        sa.Column("original_filename", sa.String(255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_attachments_record_id", "attachments", ["record_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("attachments")
+    op.drop_table("comments")
+    op.drop_table("records")
+    op.drop_table("queues")
+    op.drop_table("refresh_tokens")
+    op.drop_table("users")
+    STATUS.drop(op.get_bind(), checkfirst=True)
+    URGENCY_LEVEL.drop(op.get_bind(), checkfirst=True)
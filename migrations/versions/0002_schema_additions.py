@@ -0,0 +1,33 @@
+"""columns added after the baseline
+
+refresh_tokens.selector — индексный поиск refresh-токена;
+queues.records_version — версия расписания для in-memory индексов слотов;
+queues.comments_limit — сколько последних комментариев хранить.
+Все столбцы nullable или с константным DEFAULT, поэтому ALTER не переписывает таблицы.
+
+До перехода на Alembic эти столбцы появлялись только в таблицах, которые create_all создавал
+с нуля: в базе, помеченной alembic stamp 0001, они могут уже быть, а могут отсутствовать.
+Поэтому добавление идёт через ADD COLUMN IF NOT EXISTS.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE refresh_tokens ADD COLUMN IF NOT EXISTS selector VARCHAR(32)")
+    op.execute("ALTER TABLE queues ADD COLUMN IF NOT EXISTS records_version BIGINT NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE queues ADD COLUMN IF NOT EXISTS comments_limit INTEGER NOT NULL DEFAULT 5")
+
+
+def downgrade() -> None:
+    op.drop_column("queues", "comments_limit")
+    op.drop_column("queues", "records_version")
+    op.drop_column("refresh_tokens", "selector")
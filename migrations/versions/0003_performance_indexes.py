@@ -0,0 +1,42 @@
+"""performance indexes, built online
+
+CREATE INDEX CONCURRENTLY не блокирует запись в таблицы, но не может выполняться
+в транзакции, поэтому индексы строятся в autocommit-блоке. Прерванная сборка оставляет
+невалидный индекс: его нужно удалить (DROP INDEX CONCURRENTLY) и повторить миграцию.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (имя, таблица, колонки, unique)
+INDEXES = [
+    ("ix_refresh_tokens_selector", "refresh_tokens", ["selector"], True),
+    ("ix_records_queue_meeting", "records", ["queue_id", "meeting_datetime", "record_id"], False),
+    ("ix_records_user_meeting", "records", ["user_id", "meeting_datetime", "record_id"], False),
+    ("ix_queues_owner_name", "queues", ["owner_id", "name"], False),
+    ("ix_comments_queue_created", "comments", ["queue_id", "created_at"], False),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=unique,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
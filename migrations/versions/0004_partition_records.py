@@ -0,0 +1,82 @@
+"""partition records by meeting_datetime
+
+records становится секционированной по диапазону meeting_datetime таблицей. Первичный ключ
+секционированной таблицы обязан содержать ключ секционирования, поэтому он становится
+(record_id, meeting_datetime), а внешние ключи comments/attachments -> records снимаются:
+их удаление выполняет код (RecordRepository.delete_record и очистка).
+
+Все строки сначала попадают в секцию records_default; помесячные секции создаёт
+python -m src.app.internal.data.partitions ensure, перенося в них строки из default.
+
+Миграция копирует таблицу целиком под эксклюзивной блокировкой — выполнять в окно обслуживания.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "record_id, user_id, queue_id, purpose, meeting_datetime, urgency_level, status, manager_comment"
+
+RECORDS_DDL = """
+CREATE TABLE records (
+    record_id UUID NOT NULL,
+    user_id UUID NOT NULL REFERENCES users (uuid),
+    queue_id UUID NOT NULL REFERENCES queues (queue_id),
+    purpose TEXT NOT NULL,
+    meeting_datetime TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    urgency_level urgencylevel NOT NULL,
+    status status NOT NULL,
+    manager_comment TEXT,
+    {primary_key}
+){partitioning}
+"""
+
+INDEXES = [
+    "CREATE INDEX ix_records_user_id ON records (user_id)",
+    "CREATE INDEX ix_records_queue_id ON records (queue_id)",
+    "CREATE INDEX ix_records_queue_meeting ON records (queue_id, meeting_datetime, record_id)",
+    "CREATE INDEX ix_records_user_meeting ON records (user_id, meeting_datetime, record_id)",
+]
+
+
+def _replace_records(primary_key: str, partitioning: str) -> None:
+    op.execute("ALTER TABLE records RENAME TO records_old")
+    op.execute("ALTER TABLE records_old RENAME CONSTRAINT records_pkey TO records_old_pkey")
+    for name in ("ix_records_user_id", "ix_records_queue_id", "ix_records_queue_meeting", "ix_records_user_meeting"):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute(RECORDS_DDL.format(primary_key=primary_key, partitioning=partitioning))
+    if partitioning:
+        op.execute("CREATE TABLE records_default PARTITION OF records DEFAULT")
+    op.execute(f"INSERT INTO records ({COLUMNS}) SELECT {COLUMNS} FROM records_old")
+    op.execute("DROP TABLE records_old")
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE comments DROP CONSTRAINT IF EXISTS comments_record_id_fkey")
+    op.execute("ALTER TABLE attachments DROP CONSTRAINT IF EXISTS attachments_record_id_fkey")
+    _replace_records(
+        primary_key="CONSTRAINT records_pkey PRIMARY KEY (record_id, meeting_datetime)",
+        partitioning=" PARTITION BY RANGE (meeting_datetime)",
+    )
+
+
+def downgrade() -> None:
+    # Архивные секции (схема archive) в обратную миграцию не возвращаются
+    _replace_records(primary_key="CONSTRAINT records_pkey PRIMARY KEY (record_id)", partitioning="")
+    op.execute(
+        "ALTER TABLE attachments ADD CONSTRAINT attachments_record_id_fkey "
+        "FOREIGN KEY (record_id) REFERENCES records (record_id) ON DELETE CASCADE"
+    )
+    op.execute(
+        "ALTER TABLE comments ADD CONSTRAINT comments_record_id_fkey "
+        "FOREIGN KEY (record_id) REFERENCES records (record_id)"
+    )
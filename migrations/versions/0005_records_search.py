@@ -0,0 +1,31 @@
+"""full-text search over records
+
+Генерируемая колонка records.search_vector (purpose с весом A, manager_comment с весом B)
+и GIN-индекс по ней. Добавление STORED-колонки переписывает все секции records,
+а индекс на секционированной таблице нельзя строить CONCURRENTLY — выполнять в окно обслуживания.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(purpose, '')), 'A') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(manager_comment, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.execute(f"ALTER TABLE records ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED")
+    op.execute("CREATE INDEX ix_records_search ON records USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_records_search")
+    op.execute("ALTER TABLE records DROP COLUMN search_vector")
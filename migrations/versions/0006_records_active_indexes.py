@@ -0,0 +1,35 @@
+"""partial indexes on active records
+
+Частичные индексы (queue_id|user_id, meeting_datetime, record_id) WHERE status IN ('PENDING', 'CONFIRMED')
+для отфильтрованных списков. Индекс на секционированной таблице нельзя строить CONCURRENTLY:
+создание держит SHARE-блокировку records (чтения идут, записи ждут) на время сборки по всем секциям.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+ACTIVE = "status IN ('PENDING', 'CONFIRMED')"
+
+INDEXES = [
+    ("ix_records_queue_active", "queue_id"),
+    ("ix_records_user_active", "user_id"),
+]
+
+
+def upgrade() -> None:
+    for name, owner_column in INDEXES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON records ({owner_column}, meeting_datetime, record_id) WHERE {ACTIVE}"
+        )
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,116 @@
+"""incrementally maintained queue statistics
+
+queue_stats — число записей очереди по (status, urgency_level), queue_daily_load — число
+активных записей на день встречи. Обе ведёт строковый триггер records_queue_stats в той же
+транзакции, что и изменение записи; перенос секции между таблицами (partitions ensure)
+отключает его через SET LOCAL queue_stats.skip = 'on'.
+
+rebuild_queue_stats() пересчитывает обе таблицы с нуля: используется для начального
+заполнения и после отсоединения секций в архив.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+ACTIVE = "('PENDING', 'CONFIRMED')"
+
+QUEUE_STATS_ADD = f"""
+CREATE FUNCTION queue_stats_add(q uuid, s status, u urgencylevel, meeting timestamp, delta integer)
+RETURNS void AS $$
+BEGIN
+    INSERT INTO queue_stats (queue_id, status, urgency_level, records) VALUES (q, s, u, delta)
+    ON CONFLICT (queue_id, status, urgency_level) DO UPDATE SET records = queue_stats.records + EXCLUDED.records;
+    IF s IN {ACTIVE} THEN
+        INSERT INTO queue_daily_load (queue_id, day, records) VALUES (q, meeting::date, delta)
+        ON CONFLICT (queue_id, day) DO UPDATE SET records = queue_daily_load.records + EXCLUDED.records;
+    END IF;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+QUEUE_STATS_APPLY = """
+CREATE FUNCTION queue_stats_apply() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('queue_stats.skip', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'UPDATE'
+        AND OLD.queue_id = NEW.queue_id AND OLD.status = NEW.status
+        AND OLD.urgency_level = NEW.urgency_level AND OLD.meeting_datetime::date = NEW.meeting_datetime::date THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM queue_stats_add(OLD.queue_id, OLD.status, OLD.urgency_level, OLD.meeting_datetime, -1);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        PERFORM queue_stats_add(NEW.queue_id, NEW.status, NEW.urgency_level, NEW.meeting_datetime, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Перенос строки между секциями при UPDATE выполняется как DELETE + INSERT — их триггер тоже учитывает
+RECORDS_TRIGGER = """
+CREATE TRIGGER records_queue_stats
+AFTER INSERT OR DELETE OR UPDATE OF queue_id, status, urgency_level, meeting_datetime ON records
+FOR EACH ROW EXECUTE FUNCTION queue_stats_apply()
+"""
+
+REBUILD_QUEUE_STATS = f"""
+CREATE FUNCTION rebuild_queue_stats() RETURNS void AS $$
+BEGIN
+    -- Записи не меняются до конца транзакции, чтобы счётчики совпали с таблицей
+    LOCK TABLE records IN SHARE MODE;
+    DELETE FROM queue_stats;
+    DELETE FROM queue_daily_load;
+    INSERT INTO queue_stats (queue_id, status, urgency_level, records)
+        SELECT queue_id, status, urgency_level, count(*) FROM records GROUP BY 1, 2, 3;
+    INSERT INTO queue_daily_load (queue_id, day, records)
+        SELECT queue_id, meeting_datetime::date, count(*) FROM records WHERE status IN {ACTIVE} GROUP BY 1, 2;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    status = postgresql.ENUM(name="status", create_type=False)
+    urgency = postgresql.ENUM(name="urgencylevel", create_type=False)
+    op.create_table(
+        "queue_stats",
+        sa.Column("queue_id", postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey("queues.queue_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("status", status, primary_key=True),
+        sa.Column("urgency_level", urgency, primary_key=True),
+        sa.Column("records", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "queue_daily_load",
+        sa.Column("queue_id", postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey("queues.queue_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("records", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.execute(QUEUE_STATS_ADD)
+    op.execute(QUEUE_STATS_APPLY)
+    op.execute(REBUILD_QUEUE_STATS)
+    op.execute(RECORDS_TRIGGER)
+    op.execute("SELECT rebuild_queue_stats()")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS records_queue_stats ON records")
+    op.execute("DROP FUNCTION IF EXISTS rebuild_queue_stats()")
+    op.execute("DROP FUNCTION IF EXISTS queue_stats_apply()")
+    op.execute("DROP FUNCTION IF EXISTS queue_stats_add(uuid, status, urgencylevel, timestamp, integer)")
+    op.drop_table("queue_daily_load")
+    op.drop_table("queue_stats")
@@ -0,0 +1,33 @@
+"""claim next record
+
+records.claimed_by / claimed_at — менеджер, взявший запись в работу, и время захвата.
+Частичный индекс ix_records_queue_next отдаёт незанятые активные записи очереди в порядке
+"кто следующий". Столбцы nullable, таблица не переписывается; индекс строится без CONCURRENTLY
+(секционированная таблица), записи в records ждут окончания сборки.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE records ADD COLUMN claimed_by UUID REFERENCES users (uuid)")
+    op.execute("ALTER TABLE records ADD COLUMN claimed_at TIMESTAMP WITHOUT TIME ZONE")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_records_queue_next "
+        "ON records (queue_id, urgency_level DESC, meeting_datetime, record_id) "
+        "WHERE status IN ('PENDING', 'CONFIRMED') AND claimed_by IS NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_records_queue_next")
+    op.execute("ALTER TABLE records DROP COLUMN claimed_at")
+    op.execute("ALTER TABLE records DROP COLUMN claimed_by")
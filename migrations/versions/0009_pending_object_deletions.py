@@ -0,0 +1,31 @@
+"""pending S3 object deletions
+
+pending_object_deletions — ключи S3-объектов удалённых вложений. Очистка записей ставит их
+сюда в той же транзакции, что и удаление строк; воркер удаляет объекты и убирает ключи только
+после успеха, неудачные остаются с увеличенным attempts до следующего прохода.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pending_object_deletions",
+        sa.Column("object_key", sa.String(), primary_key=True),
+        sa.Column("queued_at", sa.DateTime(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_attempt_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pending_object_deletions")
@@ -0,0 +1,65 @@
+"""record locator for lookups by record_id
+
+record_locator хранит meeting_datetime каждой записи. Поиск в records по record_id берёт
+время встречи оттуда скалярным подзапросом, и PostgreSQL при выполнении отбрасывает все
+секции, кроме одной, вместо проверки индекса каждой секции.
+
+Таблицу ведёт строковый триггер records_locator. Перенос строки между секциями при UPDATE
+выполняется как DELETE + INSERT: DELETE удаляет строку только со старым временем, INSERT
+пишет новое через ON CONFLICT, поэтому итог не зависит от порядка. Перенос строк из
+records_default в новую секцию (partitions ensure) отключает триггер через
+SET LOCAL record_locator.skip = 'on'.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+RECORD_LOCATOR_APPLY = """
+CREATE FUNCTION record_locator_apply() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('record_locator.skip', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM record_locator WHERE record_id = OLD.record_id AND meeting_datetime = OLD.meeting_datetime;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        INSERT INTO record_locator (record_id, meeting_datetime) VALUES (NEW.record_id, NEW.meeting_datetime)
+        ON CONFLICT (record_id) DO UPDATE SET meeting_datetime = EXCLUDED.meeting_datetime;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+RECORDS_TRIGGER = """
+CREATE TRIGGER records_locator
+AFTER INSERT OR DELETE OR UPDATE OF meeting_datetime ON records
+FOR EACH ROW EXECUTE FUNCTION record_locator_apply()
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "record_locator",
+        sa.Column("record_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("meeting_datetime", sa.DateTime(), nullable=False),
+    )
+    op.execute(RECORD_LOCATOR_APPLY)
+    op.execute(RECORDS_TRIGGER)
+    op.execute("INSERT INTO record_locator (record_id, meeting_datetime) SELECT record_id, meeting_datetime FROM records")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS records_locator ON records")
+    op.execute("DROP FUNCTION IF EXISTS record_locator_apply()")
+    op.drop_table("record_locator")
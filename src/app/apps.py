@@ -1,24 +1,50 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import src.app.internal.data.models
-from src.config.database import engine, Base
+from src.config.database import warm_up_pools, dispose_engines
+from src.app.internal.domain.services.hashing_executor import hashing_executor
+from src.app.internal.domain.services.record_cleanup import start_cleanup_worker
+from src.app.internal.domain.services.queue_cache import start_queue_cache_listener
 from src.app.internal.presentation.api.user_controller import router as user_router
 from src.app.internal.presentation.api.auth_controller  import router as auth_router
 from src.app.internal.presentation.api.queue_controller  import router as queque_router
 from src.app.internal.presentation.api.record_controller  import router as record_router
 from src.app.internal.presentation.api.comment_controller  import router as comment_router
 from src.app.internal.presentation.api.attachment_controller  import router as attachment_router
+from src.app.internal.presentation.api.metrics_controller import router as metrics_router
+from src.app.internal.presentation.middleware import sql_stats_middleware
+
+# Схема базы меняется только миграциями: alembic upgrade head (сервис migrate в docker-compose)
 
 
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_pools()
+    cleanup_task = start_cleanup_worker()
+    queue_cache_task = start_queue_cache_listener()
+    yield
+    for task in (cleanup_task, queue_cache_task):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    await dispose_engines()
+    hashing_executor.shutdown()
+
 
 app = FastAPI(
     title="My API",
     description="API для управления пользователями",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 
+app.middleware("http")(sql_stats_middleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -33,4 +59,5 @@ app.include_router(auth_router)
 app.include_router(queque_router)
 app.include_router(record_router)
 app.include_router(comment_router)
-app.include_router(attachment_router)
\ No newline at end of file
+app.include_router(attachment_router)
+app.include_router(metrics_router)
\ No newline at end of file
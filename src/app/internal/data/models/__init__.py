@@ -3,5 +3,9 @@ from .refresh_token_model import RefreshTokenModel
 from .user_model import UserModel
 from .queue_model import QueueModel
 from .comment_model import CommentModel
+from .queue_stats_model import QueueStatsModel, QueueDailyLoadModel
+from .pending_object_deletion_model import PendingObjectDeletionModel
+from .record_locator_model import RecordLocatorModel
 
-__all__ = ['RecordModel', 'CommentModel', 'UserModel', 'QueueModel', 'RefreshTokenModel',]
\ No newline at end of file
+__all__ = ['RecordModel', 'CommentModel', 'UserModel', 'QueueModel', 'RefreshTokenModel', 'QueueStatsModel', 'QueueDailyLoadModel',
+           'PendingObjectDeletionModel', 'RecordLocatorModel',]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -11,14 +11,14 @@ class AttachmentModel(Base):
 
     attachment_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    record_id = Column(
-        UUID(as_uuid=True),
-        ForeignKey("records.record_id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
-    )
+    # records секционирована, внешний ключ на неё невозможен; вложения удаляются вместе с записью в коде
+    record_id = Column(UUID(as_uuid=True), nullable=False, index=True)
 
     object_key = Column(String(512), nullable=False, unique=True)
     original_filename = Column(String(255), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    record = relationship("RecordModel", back_populates="attachments")
\ No newline at end of file
+    record = relationship(
+        "RecordModel",
+        primaryjoin="foreign(AttachmentModel.record_id) == RecordModel.record_id",
+        back_populates="attachments",
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -9,10 +9,15 @@ from src.config.database import Base
 
 class CommentModel(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Выборка и обрезка последних комментариев очереди
+        Index("ix_comments_queue_created", "queue_id", "created_at"),
+    )
 
     comment_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     queue_id = Column(UUID(as_uuid=True), ForeignKey("queues.queue_id"), nullable=False)
-    record_id = Column(UUID(as_uuid=True), ForeignKey("records.record_id"), nullable=False)
+    # Без внешнего ключа: records секционирована по meeting_datetime
+    record_id = Column(UUID(as_uuid=True), nullable=False)
 
     text = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+from src.config.database import Base
+
+
+class PendingObjectDeletionModel(Base):
+    """
+    S3-объект, который нужно удалить. Ключ ставится в очередь в той же транзакции, что и
+    удаление строки вложения, и убирается отсюда только после успешного удаления из S3.
+    """
+    __tablename__ = "pending_object_deletions"
+
+    object_key = Column(String, primary_key=True)
+    queued_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_attempt_at = Column(DateTime, nullable=True)
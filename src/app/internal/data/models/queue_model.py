@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Interval, String
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, Integer, Interval, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from src.config.database import Base
@@ -7,12 +7,19 @@ import uuid
 
 class QueueModel(Base):
     __tablename__ = "queues"
+    __table_args__ = (
+        Index("ix_queues_owner_name", "owner_id", "name"),
+    )
 
     queue_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(50), unique=True, nullable=False, index=True)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.uuid"), nullable=False, index=True)
     cleanup_interval = Column(Interval, nullable=False, default="1 day")
     record_interval = Column(Interval, nullable=False, default="30 minutes")
+    # Сколько последних комментариев владельца хранится для очереди
+    comments_limit = Column(Integer, nullable=False, default=5, server_default="5")
+    # Растёт при каждом изменении расписания записей очереди; сверяется с in-memory индексом слотов
+    records_version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     # Relationships
     owner = relationship("UserModel", back_populates="queues_owned")
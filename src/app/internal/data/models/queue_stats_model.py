@@ -0,0 +1,27 @@
+from sqlalchemy import BigInteger, Column, Date, Enum, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from src.config.database import Base
+from src.app.internal.data.models.record_model import Status, UrgencyLevel
+
+
+# Обе таблицы ведёт триггер records_queue_stats (миграция 0007) в той же транзакции,
+# что и изменение записи; приложение их только читает
+
+
+class QueueStatsModel(Base):
+    """Число записей очереди по паре (статус, срочность)."""
+    __tablename__ = "queue_stats"
+
+    queue_id = Column(UUID(as_uuid=True), ForeignKey("queues.queue_id", ondelete="CASCADE"), primary_key=True)
+    status = Column(Enum(Status), primary_key=True)
+    urgency_level = Column(Enum(UrgencyLevel), primary_key=True)
+    records = Column(BigInteger, nullable=False, default=0)
+
+
+class QueueDailyLoadModel(Base):
+    """Число активных (PENDING, CONFIRMED) записей очереди на день встречи."""
+    __tablename__ = "queue_daily_load"
+
+    queue_id = Column(UUID(as_uuid=True), ForeignKey("queues.queue_id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    records = Column(BigInteger, nullable=False, default=0)
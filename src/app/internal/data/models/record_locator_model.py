@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from src.config.database import Base
+
+
+class RecordLocatorModel(Base):
+    """
+    Время встречи записи по её id: ключ секционирования для поиска в records по record_id.
+    Таблицу ведёт триггер records_locator (миграция 0010); приложение её только читает.
+    """
+    __tablename__ = "record_locator"
+
+    record_id = Column(UUID(as_uuid=True), primary_key=True)
+    meeting_datetime = Column(DateTime, nullable=False)
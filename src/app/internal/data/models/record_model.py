@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, ForeignKey, Enum, Interval
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, Column, Computed, text, String, Boolean, DateTime, Integer, Text, ForeignKey, Enum, Interval, Index, event
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from src.config.database import Base
 import uuid
 import enum
@@ -20,25 +20,81 @@ class Status(enum.Enum):
     REJECTED = "rejected"
 
 
+# Активные записи — почти все горячие чтения; по ним есть частичные индексы
+ACTIVE_STATUSES = (Status.PENDING, Status.CONFIRMED)
+ACTIVE_STATUSES_SQL = "status IN ({})".format(", ".join(f"'{status.name}'" for status in ACTIVE_STATUSES))
+
+# Конфигурация полнотекстового поиска; зашита в выражение колонки search_vector
+SEARCH_CONFIG = "russian"
+
+
 class RecordModel(Base):
     __tablename__ = "records"
+    __table_args__ = (
+        # Ключи keyset-пагинации списков по очереди и по пользователю
+        Index("ix_records_queue_meeting", "queue_id", "meeting_datetime", "record_id"),
+        Index("ix_records_user_meeting", "user_id", "meeting_datetime", "record_id"),
+        Index("ix_records_search", "search_vector", postgresql_using="gin"),
+        # Частичные индексы списков активных записей: в разы меньше полных и почти целиком в кэше
+        Index(
+            "ix_records_queue_active", "queue_id", "meeting_datetime", "record_id",
+            postgresql_where=text(ACTIVE_STATUSES_SQL),
+        ),
+        Index(
+            "ix_records_user_active", "user_id", "meeting_datetime", "record_id",
+            postgresql_where=text(ACTIVE_STATUSES_SQL),
+        ),
+        # "Кто следующий": незанятые активные записи по убыванию срочности (порядок значений
+        # enum urgencylevel), затем по времени встречи. Статус в ключ не входит: по двум статусам
+        # индекс не дал бы общего порядка
+        Index(
+            "ix_records_queue_next", "queue_id", text("urgency_level DESC"), "meeting_datetime", "record_id",
+            postgresql_where=text(f"{ACTIVE_STATUSES_SQL} AND claimed_by IS NULL"),
+        ),
+        # Помесячные секции создаёт src.app.internal.data.partitions
+        {"postgresql_partition_by": "RANGE (meeting_datetime)"},
+    )
 
     record_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.uuid"), nullable=False, index=True)
     queue_id = Column(UUID(as_uuid=True), ForeignKey("queues.queue_id"), nullable=False, index=True)
     purpose = Column(Text, nullable=False)
-    meeting_datetime = Column(DateTime, nullable=False)
+    # Ключ секционирования входит в первичный ключ секционированной таблицы
+    meeting_datetime = Column(DateTime, primary_key=True, nullable=False)
     urgency_level = Column(Enum(UrgencyLevel), nullable=False, default=UrgencyLevel.MEDIUM)
     status = Column(Enum(Status), nullable=False, default=Status.PENDING)
     manager_comment = Column(Text, nullable=True)
+    # Менеджер, взявший запись в работу через claim next, и время захвата
+    claimed_by = Column(UUID(as_uuid=True), ForeignKey("users.uuid"), nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+    # Поисковый вектор считает сама база: purpose с весом A, manager_comment с весом B.
+    # Колонка отложенная и в сущность не попадает
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(purpose, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(manager_comment, '')), 'B')",
+            persisted=True,
+        ),
+    ))
 
     # Relationships
-    user = relationship("UserModel", back_populates="records")
+    # На users ссылаются user_id и claimed_by: связь строится только по владельцу записи
+    user = relationship("UserModel", back_populates="records", foreign_keys=[user_id])
+    claimer = relationship("UserModel", foreign_keys=[claimed_by])
     queue = relationship("QueueModel", back_populates="records")
+    # Внешнего ключа на секционированную records нет: связь задаётся явным условием
     attachments = relationship(
         "AttachmentModel",
+        primaryjoin="RecordModel.record_id == foreign(AttachmentModel.record_id)",
         back_populates="record",
-        cascade="all, delete-orphan",
-        passive_deletes=True,
         lazy="selectin",
     )
+
+
+# create_all (бенчмарки, одноразовые базы) создаёт и секцию по умолчанию, иначе вставка невозможна
+event.listen(
+    RecordModel.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS records_default PARTITION OF records DEFAULT"),
+)
@@ -10,6 +10,8 @@ class RefreshTokenModel(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_uuid = Column(UUID(as_uuid=True), ForeignKey("users.uuid", ondelete="CASCADE"), nullable=False)
+    # Публичная часть токена для индексного поиска; NULL у токенов старого формата
+    selector = Column(String(32), nullable=True, unique=True, index=True)
     token_hash = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     expires_at = Column(DateTime, nullable=False)
@@ -20,5 +20,7 @@ class UserModel(Base):
     # Relationships
     refresh_tokens = relationship("RefreshTokenModel", back_populates="user", lazy="selectin")
     queues_owned = relationship("QueueModel", back_populates="owner", lazy="selectin")
-    records = relationship("RecordModel", back_populates="user", lazy="selectin")
+    records = relationship(
+        "RecordModel", back_populates="user", foreign_keys="RecordModel.user_id", lazy="selectin"
+    )
 
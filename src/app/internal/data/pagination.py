@@ -0,0 +1,88 @@
+import base64
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from dotenv import load_dotenv
+from sqlalchemy import tuple_
+
+load_dotenv()
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "200"))
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def _to_json(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    raw = json.dumps([_to_json(v) for v in key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[Callable[[Any], Any]]) -> Tuple:
+    """
+    Курсор — base64 от JSON-списка значений ключа сортировки последней строки страницы.
+    types приводит каждое значение обратно к типу колонки.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except Exception:
+        raise InvalidCursorError("Invalid cursor")
+
+
+def keyset(
+    stmt,
+    key_columns: Sequence,
+    cursor: Optional[str],
+    types: Sequence[Callable[[Any], Any]],
+    limit: int,
+    descending: bool = False,
+):
+    """
+    Добавляет к запросу условие "после курсора", стабильный порядок и LIMIT на одну строку больше страницы.
+    descending переворачивает порядок всех колонок ключа (и сравнение с курсором).
+    """
+    if cursor:
+        after = decode_cursor(cursor, types)
+        key, after = tuple_(*key_columns), tuple_(*after)
+        stmt = stmt.where(key < after if descending else key > after)
+    if descending:
+        return stmt.order_by(*(col.desc() for col in key_columns)).limit(limit + 1)
+    return stmt.order_by(*key_columns).limit(limit + 1)
+
+
+def build_page(items: List[T], limit: int, key: Callable[[T], Sequence[Any]]) -> Page[T]:
+    # Лишняя строка означает, что есть следующая страница; сама она не возвращается
+    if len(items) > limit:
+        items = items[:limit]
+        return Page(items=items, next_cursor=encode_cursor(key(items[-1])))
+    return Page(items=items)
+
+
+def parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value)
@@ -0,0 +1,212 @@
+"""
+Обслуживание помесячных секций таблицы records.
+
+    python -m src.app.internal.data.partitions ensure [--months-ahead N]
+    python -m src.app.internal.data.partitions archive --before YYYY-MM
+
+ensure создаёт секции для месяцев, строки которых лежат в records_default, и для текущего
+месяца плюс N вперёд; приложение делает то же по расписанию в воркере record_cleanup.
+archive отсоединяет секции старше указанного месяца и переносит их в схему ARCHIVE_SCHEMA,
+где они остаются доступными для отчётов, но не для приложения.
+Комментарии и вложения архивных записей переносятся туда же (ARCHIVE_SCHEMA.comments,
+ARCHIVE_SCHEMA.attachments); S3-объекты вложений не удаляются — на них ссылается архив.
+"""
+import argparse
+import logging
+import os
+import re
+from datetime import date, datetime
+from typing import List, Set
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.config.database import engine
+
+load_dotenv()
+
+RECORDS_PARTITIONS_AHEAD = int(os.getenv("RECORDS_PARTITIONS_AHEAD", "3"))
+ARCHIVE_SCHEMA = os.getenv("ARCHIVE_SCHEMA", "archive")
+
+PARENT = "records"
+DEFAULT_PARTITION = "records_default"
+# Таблицы со ссылками на record_id (без внешних ключей: records секционирована)
+DEPENDENTS = ("comments", "attachments")
+_PARTITION_NAME = re.compile(r"^records_y(\d{4})m(\d{2})$")
+
+logger = logging.getLogger("partitions")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    for _ in range(months):
+        value = next_month(value)
+    return value
+
+
+def partition_name(month: date) -> str:
+    return f"records_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partition(name: str) -> bool:
+    # Секции создаются этим модулем, а не миграциями: autogenerate их не сравнивает
+    return name == DEFAULT_PARTITION or _PARTITION_NAME.match(name) is not None
+
+
+def existing_partitions(conn: Connection) -> Set[date]:
+    rows = conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT},
+    ).scalars()
+    months = set()
+    for name in rows:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.add(date(int(match.group(1)), int(match.group(2)), 1))
+    return months
+
+
+def months_in_default(conn: Connection) -> List[date]:
+    rows = conn.execute(
+        text(f"SELECT DISTINCT date_trunc('month', meeting_datetime) FROM {DEFAULT_PARTITION}")
+    ).scalars()
+    return sorted(value.date() for value in rows)
+
+
+def stored_columns(conn: Connection, table: str = PARENT) -> List[str]:
+    # Генерируемые колонки (search_vector) база пересчитывает сама, в INSERT их указывать нельзя
+    return list(conn.execute(
+        text(
+            "SELECT attname FROM pg_attribute "
+            "WHERE attrelid = CAST(:table AS regclass) AND attnum > 0 AND NOT attisdropped AND attgenerated = '' "
+            "ORDER BY attnum"
+        ),
+        {"table": table},
+    ).scalars())
+
+
+def create_partition(conn: Connection, month: date) -> int:
+    """
+    Создаёт секцию месяца. Строки месяца из records_default переносятся в неё до ATTACH:
+    иначе PostgreSQL откажет, так как default-секция уже содержит строки нового диапазона.
+    Возвращает число перенесённых строк.
+    """
+    name = partition_name(month)
+    lo, hi = month.isoformat(), next_month(month).isoformat()
+    columns = ", ".join(stored_columns(conn))
+    # Строки остаются в records с тем же временем: счётчики queue_stats и record_locator менять не нужно
+    conn.execute(text("SET LOCAL queue_stats.skip = 'on'"))
+    conn.execute(text("SET LOCAL record_locator.skip = 'on'"))
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING GENERATED)"))
+    moved = conn.execute(
+        text(
+            f"WITH moved AS ("
+            f" DELETE FROM {DEFAULT_PARTITION}"
+            f" WHERE meeting_datetime >= '{lo}' AND meeting_datetime < '{hi}' RETURNING {columns}"
+            f") INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+        )
+    ).rowcount
+    conn.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{lo}') TO ('{hi}')"))
+    return moved
+
+
+def ensure_partitions(months_ahead: int = RECORDS_PARTITIONS_AHEAD) -> List[date]:
+    with engine.connect() as conn:
+        existing = existing_partitions(conn)
+        wanted = set(months_in_default(conn))
+        current = month_start(datetime.utcnow().date())
+        wanted.update(add_months(current, offset) for offset in range(months_ahead + 1))
+
+    created = []
+    for month in sorted(wanted - existing):
+        # Каждый месяц — отдельная транзакция, чтобы не держать блокировку records_default долго
+        with engine.begin() as conn:
+            moved = create_partition(conn, month)
+        logger.info("created partition %s (%d rows moved from default)", partition_name(month), moved)
+        created.append(month)
+    return created
+
+
+def archive_dependents(conn: Connection, partition: str) -> None:
+    """Переносит комментарии и вложения записей архивной секции в одноимённые таблицы архива."""
+    for table in DEPENDENTS:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.{table} (LIKE {table})"))
+        columns = ", ".join(stored_columns(conn, f"{ARCHIVE_SCHEMA}.{table}"))
+        conn.execute(
+            text(
+                f"WITH moved AS ("
+                f" DELETE FROM {table}"
+                f" WHERE record_id IN (SELECT record_id FROM {ARCHIVE_SCHEMA}.{partition}) RETURNING {columns}"
+                f") INSERT INTO {ARCHIVE_SCHEMA}.{table} ({columns}) SELECT {columns} FROM moved"
+            )
+        )
+
+
+def archive_partitions(before: date) -> List[str]:
+    """
+    Отсоединяет секции месяцев раньше before и переносит их в схему архива вместе
+    с комментариями и вложениями их записей — всё в одной транзакции. Расписание затронутых
+    очередей меняется: их records_version увеличивается, queue_stats пересчитывается.
+    """
+    archived = []
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+        for month in sorted(existing_partitions(conn)):
+            if month >= before:
+                continue
+            name = partition_name(month)
+            conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+            conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            archive_dependents(conn, name)
+            # DETACH не запускает триггеры: архивные записи убираются из record_locator явно
+            conn.execute(
+                text(f"DELETE FROM record_locator WHERE record_id IN (SELECT record_id FROM {ARCHIVE_SCHEMA}.{name})")
+            )
+            # Кэши слотов и свободного времени сверяются с records_version и перечитают очередь
+            conn.execute(
+                text(
+                    f"UPDATE queues SET records_version = records_version + 1 "
+                    f"WHERE queue_id IN (SELECT DISTINCT queue_id FROM {ARCHIVE_SCHEMA}.{name})"
+                )
+            )
+            archived.append(name)
+        if archived:
+            # Записи архивных секций больше не входят в статистику очередей
+            conn.execute(text("SELECT rebuild_queue_stats()"))
+    return archived
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(prog="python -m src.app.internal.data.partitions")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ensure = commands.add_parser("ensure", help="create missing monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=RECORDS_PARTITIONS_AHEAD)
+    archive = commands.add_parser("archive", help="detach old partitions into the archive schema")
+    archive.add_argument("--before", required=True, help="first month to keep, YYYY-MM")
+    args = parser.parse_args()
+
+    if args.command == "ensure":
+        created = ensure_partitions(args.months_ahead)
+        print(f"created {len(created)} partitions")
+    else:
+        before = month_start(datetime.strptime(args.before, "%Y-%m").date())
+        archived = archive_partitions(before)
+        print(f"archived {len(archived)} partitions into {ARCHIVE_SCHEMA}: {', '.join(archived) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
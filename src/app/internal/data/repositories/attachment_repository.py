@@ -5,14 +5,20 @@ from src.app.internal.domain.interfaces.attachment_interface import IAttachmentR
 from src.app.internal.domain.services.s3_service import S3StorageService
 from typing import List, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.app.internal.data.models.attachment_model import AttachmentModel
+from src.config.database import on_replica
+from src.app.internal.data.unit_of_work import UnitOfWork, commit
+from src.app.internal.data.statements import entity_columns
+
+ATTACHMENT_COLUMNS = entity_columns(AttachmentModel, AttachmentEntity)
 
 
 class AttachmentRepository(IAttachmentRepository):
     def __init__(
         self,
-        db: Session,
+        db: AsyncSession,
         record_repo: IRecordRepository,
         s3_service: S3StorageService,
     ):
@@ -29,70 +35,82 @@ class AttachmentRepository(IAttachmentRepository):
         record_id: UUID,
         file: UploadFile,
     ) -> AttachmentEntity:
-        record = await self.record_repo.get_record(record_id)
-        if not record:
-            raise ValueError("Record not found")
+        object_key = None
+        try:
+            async with UnitOfWork(self.db):
+                record = await self.record_repo.get_record(record_id)
+                if not record:
+                    raise ValueError("Record not found")
 
-        object_key = self.s3_service.generate_object_key(
-            record_id=str(record_id),
-            filename=file.filename,
-        )
+                object_key = self.s3_service.generate_object_key(
+                    record_id=str(record_id),
+                    filename=file.filename,
+                )
 
-        # upload внутри сервиса
-        self.s3_service.upload(
-            object_key=object_key,
-            file=file.file,
-            content_type=file.content_type,
-        )
-
-        db_attachment = AttachmentModel(
-            record_id=record_id,
-            object_key=object_key,
-            original_filename=file.filename,
-        )
+                row = (await self.db.execute(
+                    insert(AttachmentModel)
+                    .values(
+                        record_id=record_id,
+                        object_key=object_key,
+                        original_filename=file.filename,
+                    )
+                    .returning(*ATTACHMENT_COLUMNS)
+                )).one()
 
-        self.db.add(db_attachment)
-        self.db.commit()
-        self.db.refresh(db_attachment)
+                # upload внутри сервиса; строка в БД зафиксируется только после успешной загрузки
+                self.s3_service.upload(
+                    object_key=object_key,
+                    file=file.file,
+                    content_type=file.content_type,
+                )
+                await commit(self.db)
+        except Exception:
+            if object_key is not None:
+                # Транзакция откатилась — не оставляем в хранилище объект без записи
+                try:
+                    self.s3_service.delete(object_key=object_key)
+                except Exception:
+                    pass
+            raise
 
-        return AttachmentEntity.from_orm(db_attachment)
+        return AttachmentEntity(**row._mapping)
 
     # =========================
     # Read
     # =========================
     async def get_by_id(self, attachment_id: UUID) -> Optional[AttachmentEntity]:
-        attachment = (
-            self.db.query(AttachmentModel)
-            .filter(AttachmentModel.attachment_id == attachment_id)
-            .first()
+        attachment = await self.db.scalar(
+            select(AttachmentModel)
+            .where(AttachmentModel.attachment_id == attachment_id)
         )
         return AttachmentEntity.from_orm(attachment) if attachment else None
 
     async def get_by_record(self, record_id: UUID) -> List[AttachmentEntity]:
-        attachments = (
-            self.db.query(AttachmentModel)
-            .filter(AttachmentModel.record_id == record_id)
+        attachments = (await self.db.scalars(on_replica(
+            select(AttachmentModel)
+            .where(AttachmentModel.record_id == record_id)
             .order_by(AttachmentModel.created_at)
-            .all()
-        )
+        ))).all()
         return [AttachmentEntity.from_orm(a) for a in attachments]
 
     # =========================
     # Delete
     # =========================
     async def detach(self, attachment_id: UUID) -> None:
-        attachment = (
-            self.db.query(AttachmentModel)
-            .filter(AttachmentModel.attachment_id == attachment_id)
-            .first()
-        )
-        if not attachment:
-            raise ValueError("Attachment not found")
+        async with UnitOfWork(self.db):
+            attachment = await self.db.scalar(
+                select(AttachmentModel)
+                .where(AttachmentModel.attachment_id == attachment_id)
+            )
+            if not attachment:
+                raise ValueError("Attachment not found")
 
-        self.s3_service.delete(object_key=attachment.object_key)
+            object_key = attachment.object_key
+            await self.db.delete(attachment)
+            await commit(self.db)
 
-        self.db.delete(attachment)
-        self.db.commit()
+        # Объект удаляем после коммита: сбой S3 оставит лишний файл, но не битую ссылку в БД
+        self.s3_service.delete(object_key=object_key)
 
     # =========================
     # Download (presigned URL)
@@ -103,10 +121,9 @@ class AttachmentRepository(IAttachmentRepository):
             attachment_id: UUID,
             expires: int = 3600,
     ) -> str:
-        attachment = (
-            self.db.query(AttachmentModel)
-            .filter(AttachmentModel.attachment_id == attachment_id)
-            .first()
+        attachment = await self.db.scalar(
+            select(AttachmentModel)
+            .where(AttachmentModel.attachment_id == attachment_id)
         )
         if not attachment:
             raise ValueError("Attachment not found")
@@ -7,54 +7,100 @@ import secrets
 from typing import Optional
 from uuid import UUID
 from fastapi import HTTPException, status, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from src.app.internal.data.models.refresh_token_model import RefreshTokenModel
 from src.app.internal.data.repositories.user_repository import UserRepository
 from src.app.internal.domain.entities.user_entity import UserEntity
-from src.app.internal.domain.services.auth_service import verify_password, get_password_hash, create_access_token, decode_access_token
+from src.app.internal.domain.services.auth_service import verify_password_async, get_password_hash_async, create_access_token, decode_access_token
+from src.app.internal.domain.services.hashing_executor import hashing_executor
+from src.app.internal.domain.services.principal_cache import principal_cache
 from src.app.internal.presentation.scheme.user_schema import UserRegister
+from src.app.internal.data.unit_of_work import commit
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# secrets.token_urlsafe не использует ".", поэтому разделитель однозначен
+TOKEN_SEPARATOR = "."
+
+
+def _verify_token(raw: str, token_hash: str) -> bool:
+    try:
+        return pwd_context.verify(raw, token_hash)
+    except Exception:
+        return False
+
+
+def _match_legacy_token(raw: str, candidates):
+    for c in candidates:
+        if _verify_token(raw, c.token_hash):
+            return c
+    return None
+
 
 class AuthRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.user_repo = UserRepository(db)
 
     # Методы для работы с refresh токенами
+    # Формат токена: "<selector>.<verifier>". По selector (индекс) находится
+    # единственная строка, bcrypt проверяется только для её verifier.
     async def create_refresh_token(self, user_uuid: UUID, expires_days: int = 7) -> str:
-        raw = secrets.token_urlsafe(32)
-        hash_ = pwd_context.hash(raw)
+        selector = secrets.token_urlsafe(12)
+        verifier = secrets.token_urlsafe(32)
+        hash_ = await hashing_executor.run("hash", pwd_context.hash, verifier)
         expires_at = datetime.utcnow() + timedelta(days=expires_days)
-        rt = RefreshTokenModel(user_uuid=user_uuid, token_hash=hash_, expires_at=expires_at)
-        self.db.add(rt)
-        self.db.commit()
-        self.db.refresh(rt)
-        return raw
+        await self.db.execute(insert(RefreshTokenModel).values(
+            user_uuid=user_uuid,
+            selector=selector,
+            token_hash=hash_,
+            expires_at=expires_at,
+        ))
+        await commit(self.db)
+        return f"{selector}{TOKEN_SEPARATOR}{verifier}"
 
     async def find_valid_refresh_token(self, raw_token: str) -> Optional[RefreshTokenModel]:
+        selector, sep, verifier = raw_token.partition(TOKEN_SEPARATOR)
+        if not sep:
+            return await self._find_legacy_refresh_token(raw_token)
+
         now = datetime.utcnow()
-        candidates = self.db.query(RefreshTokenModel).filter(
+        candidate = await self.db.scalar(select(RefreshTokenModel).where(
+            RefreshTokenModel.selector == selector,
             RefreshTokenModel.revoked == False,
             RefreshTokenModel.expires_at > now
-        ).all()
-        for c in candidates:
-            try:
-                if pwd_context.verify(raw_token, c.token_hash):
-                    return c
-            except Exception:
-                continue
+        ))
+        if candidate is None:
+            return None
+        if await hashing_executor.run("verify", _verify_token, verifier, candidate.token_hash):
+            return candidate
         return None
 
+    async def _find_legacy_refresh_token(self, raw_token: str) -> Optional[RefreshTokenModel]:
+        # Токены, выпущенные до появления selector, продолжают работать до истечения срока
+        now = datetime.utcnow()
+        candidates = (await self.db.scalars(select(RefreshTokenModel).where(
+            RefreshTokenModel.selector.is_(None),
+            RefreshTokenModel.revoked == False,
+            RefreshTokenModel.expires_at > now
+        ))).all()
+        # Весь перебор — одна задача в пуле хеширования, а не N отдельных
+        return await hashing_executor.run("verify", _match_legacy_token, raw_token, candidates)
+
     async def revoke_refresh_token_by_model(self, rt: RefreshTokenModel):
-        rt.revoked = True
-        self.db.add(rt)
-        self.db.commit()
-        self.db.refresh(rt)
+        await self.db.execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.id == rt.id)
+            .values(revoked=True)
+            .execution_options(synchronize_session=False)
+        )
+        await commit(self.db)
+        set_committed_value(rt, "revoked", True)
         return rt
 
     async def revoke_refresh_token_by_string(self, refresh_token: str):
@@ -63,11 +109,11 @@ class AuthRepository:
             await self.revoke_refresh_token_by_model(rt)
 
     async def revoke_user_tokens(self, user_uuid: UUID):
-        self.db.query(RefreshTokenModel).filter(
+        await self.db.execute(update(RefreshTokenModel).where(
             RefreshTokenModel.user_uuid == user_uuid,
             RefreshTokenModel.revoked == False
-        ).update({RefreshTokenModel.revoked: True})
-        self.db.commit()
+        ).values(revoked=True))
+        await commit(self.db)
 
     # Методы для работы с пользователями
     async def get_user_by_login(self, login: str):
@@ -84,7 +130,7 @@ class AuthRepository:
         if user is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
         access_token = create_access_token(subject=str(user.uuid))
@@ -117,6 +163,10 @@ class AuthRepository:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+        cached = principal_cache.get(token)
+        if cached is not None:
+            return cached
+
         payload = decode_access_token(token)
         if payload is None:
             raise credentials_exception
@@ -130,10 +180,14 @@ class AuthRepository:
         except Exception:
             raise credentials_exception
 
-        user = await self.get_user_by_uuid(user_uuid)
+        user = await self.user_repo.get_user(user_uuid)
         if user is None:
             raise credentials_exception
 
+        exp = payload.get("exp")
+        if exp is not None:
+            principal_cache.put(token, user, float(exp))
+
         return user
 
     async def register_user(self, user_in: UserRegister):
@@ -152,7 +206,7 @@ class AuthRepository:
             )
 
         try:
-            hashed = get_password_hash(user_in.password)
+            hashed = await get_password_hash_async(user_in.password)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
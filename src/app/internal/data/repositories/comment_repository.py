@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID, uuid4
 from typing import List, Optional
 from datetime import datetime
@@ -6,10 +7,15 @@ from datetime import datetime
 from src.app.internal.data.models.comment_model import CommentModel
 from src.app.internal.domain.entities.comment_entity import CommentEntity
 from src.app.internal.domain.interfaces.comment_interface import ICommentRepository
+from src.config.database import on_replica
+from src.app.internal.data.unit_of_work import commit
+from src.app.internal.data.statements import column_values, entity_columns
+
+COMMENT_COLUMNS = entity_columns(CommentModel, CommentEntity)
 
 
 class CommentRepository(ICommentRepository):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def create_comment(self, comment: CommentEntity) -> CommentEntity:
@@ -18,74 +24,67 @@ class CommentRepository(ICommentRepository):
         if 'comment_id' not in comment_data or comment_data['comment_id'] is None:
             comment_data['comment_id'] = uuid4()
 
-        db_comment = CommentModel(**comment_data)
-        self.db.add(db_comment)
-        self.db.commit()
-        self.db.refresh(db_comment)
-        return CommentEntity.from_orm(db_comment)
+        row = (await self.db.execute(
+            insert(CommentModel)
+            .values(**column_values(CommentModel, comment_data))
+            .returning(*COMMENT_COLUMNS)
+        )).one()
+        await commit(self.db)
+        return CommentEntity(**row._mapping)
 
     async def get_comment(self, comment_id: UUID) -> Optional[CommentEntity]:
-        db_comment = (
-            self.db.query(CommentModel)
-            .filter(CommentModel.comment_id == comment_id)
-            .first()
+        db_comment = await self.db.scalar(
+            select(CommentModel)
+            .where(CommentModel.comment_id == comment_id)
         )
         if db_comment:
             return CommentEntity.from_orm(db_comment)
         return None
 
     async def get_by_queue(self, queue_id: UUID) -> List[CommentEntity]:
-        db_comments = (
-            self.db.query(CommentModel)
-            .filter(CommentModel.queue_id == queue_id)
+        db_comments = (await self.db.scalars(on_replica(
+            select(CommentModel)
+            .where(CommentModel.queue_id == queue_id)
             .order_by(CommentModel.created_at.asc())
-            .all()
-        )
+        ))).all()
         return [CommentEntity.from_orm(c) for c in db_comments]
 
-    async def count_comments_by_queue(self, queue_id: UUID) -> int:
-        return (
-            self.db.query(CommentModel)
-            .filter(CommentModel.queue_id == queue_id)
-            .count()
-        )
-
     async def delete_oldest_comments(self, queue_id: UUID, limit: int) -> None:
-        db_comments = (
-            self.db.query(CommentModel)
-            .filter(CommentModel.queue_id == queue_id)
-            .order_by(CommentModel.created_at.asc())
-            .all()
-        )[::-1]
-
-        if len(db_comments) > limit:
-            for comment in db_comments[limit:]:
-                print(comment.text)
-                self.db.delete(comment)
-
-            self.db.commit()
+        # Одним запросом удаляется всё, что не входит в limit самых свежих комментариев очереди
+        newest = (
+            select(CommentModel.comment_id)
+            .where(CommentModel.queue_id == queue_id)
+            .order_by(CommentModel.created_at.desc(), CommentModel.comment_id.desc())
+            .limit(limit)
+        )
+        await self.db.execute(
+            delete(CommentModel)
+            .where(
+                CommentModel.queue_id == queue_id,
+                CommentModel.comment_id.not_in(newest),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await commit(self.db)
 
     async def update_comment(
         self,
         comment_id: UUID,
         comment: CommentEntity,
     ) -> Optional[CommentEntity]:
-        db_comment = (
-            self.db.query(CommentModel)
-            .filter(CommentModel.comment_id == comment_id)
-            .first()
-        )
+        values = column_values(CommentModel, comment.dict(exclude_none=True), "comment_id")
+        values["last_used_at"] = datetime.utcnow()
 
-        if db_comment:
-            update_data = comment.dict(exclude_none=True)
-            for key, value in update_data.items():
-                if hasattr(db_comment, key) and key != "comment_id":
-                    setattr(db_comment, key, value)
+        row = (await self.db.execute(
+            update(CommentModel)
+            .where(CommentModel.comment_id == comment_id)
+            .values(**values)
+            .returning(*COMMENT_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )).first()
 
-            db_comment.last_used_at = datetime.utcnow()
+        if row:
+            await commit(self.db)
+            return CommentEntity(**row._mapping)
 
-            self.db.commit()
-            self.db.refresh(db_comment)
-            return CommentEntity.from_orm(db_comment)
-
-        return None
\ No newline at end of file
+        return None
@@ -1,12 +1,46 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID, uuid4
-from typing import List, Optional
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
 from src.app.internal.data.models.queue_model import QueueModel
+from src.app.internal.data.models.queue_stats_model import QueueDailyLoadModel, QueueStatsModel
 from src.app.internal.domain.entities.queue_entity import QueueEntity
+from src.app.internal.domain.entities.queue_stats_entity import DailyLoadEntity, QueueStatsEntity
 from src.app.internal.domain.interfaces.queue_interface import IQueueRepository
+from src.app.internal.domain.services.queue_cache import QUEUE_CACHE_CHANNEL, QUEUE_CACHE_NOTIFY, queue_cache
+from src.config.database import RoutingSession, on_replica
+from src.app.internal.data.unit_of_work import commit
+from src.app.internal.data.statements import build_entities, build_entity, column_values, entity_columns
+from src.app.internal.data.pagination import Page, build_page, keyset
+
+QUEUE_COLUMNS = entity_columns(QueueModel, QueueEntity)
+# Имя очереди уникально, поэтому одного столбца достаточно для стабильного порядка
+QUEUE_PAGE_KEY = (QueueModel.name,)
+QUEUE_PAGE_KEY_TYPES = (str,)
+# Очереди, чьи записи в кэше сбрасываются после коммита транзакции сессии
+QUEUE_CACHE_INVALIDATIONS = "queue_cache_invalidations"
+
+
+def _queue_page_key(queue: QueueEntity):
+    return (queue.name,)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _invalidate_cached_queues(session) -> None:
+    # Внутри UnitOfWork commit() репозитория только flush: сбрасывать кэш можно лишь здесь,
+    # иначе параллельный запрос успеет закэшировать ещё не изменённую строку
+    for queue_id in session.info.pop(QUEUE_CACHE_INVALIDATIONS, ()):
+        queue_cache.invalidate(queue_id)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _drop_queue_invalidations(session) -> None:
+    session.info.pop(QUEUE_CACHE_INVALIDATIONS, None)
+
 
 class QueueRepository(IQueueRepository):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def create_queue(self, queue: QueueEntity) -> QueueEntity:
@@ -15,58 +49,141 @@ class QueueRepository(IQueueRepository):
         if 'queue_id' not in queue_data or queue_data['queue_id'] is None:
             queue_data['queue_id'] = uuid4()
 
-        db_queue = QueueModel(**queue_data)
-        self.db.add(db_queue)
-        self.db.commit()
-        self.db.refresh(db_queue)
-        return QueueEntity.from_orm(db_queue)
+        row = (await self.db.execute(
+            insert(QueueModel)
+            .values(**column_values(QueueModel, queue_data))
+            .returning(*QUEUE_COLUMNS)
+        )).one()
+        await commit(self.db)
+        return QueueEntity(**row._mapping)
 
     async def get_queue(self, queue_id: UUID) -> Optional[QueueEntity]:
-        db_queue = self.db.query(QueueModel).filter(QueueModel.queue_id == queue_id).first()
-        if db_queue:
-            return QueueEntity.from_orm(db_queue)
-        return None
+        cached = queue_cache.get(queue_id)
+        if cached is not None:
+            return cached
+        row = (await self.db.execute(select(*QUEUE_COLUMNS).where(QueueModel.queue_id == queue_id))).first()
+        queue = build_entity(QueueEntity, row)
+        if queue is not None:
+            queue_cache.put(queue)
+        return queue
+
+    async def get_queues_by_ids(self, queue_ids: Iterable[UUID]) -> Dict[UUID, QueueEntity]:
+        queues = {}
+        missing = set()
+        for queue_id in set(queue_ids):
+            cached = queue_cache.get(queue_id)
+            if cached is not None:
+                queues[queue_id] = cached
+            else:
+                missing.add(queue_id)
+        if not missing:
+            return queues
+        rows = await self.db.execute(select(*QUEUE_COLUMNS).where(QueueModel.queue_id.in_(missing)))
+        for queue in build_entities(QueueEntity, rows):
+            queue_cache.put(queue)
+            queues[queue.queue_id] = queue
+        return queues
 
     async def get_queue_by_name(self, name: str) -> Optional[QueueEntity]:
-        db_queue = self.db.query(QueueModel).filter(QueueModel.name == name).first()
-        if db_queue:
-            return QueueEntity.from_orm(db_queue)
-        return None
+        cached = queue_cache.get_by_name(name)
+        if cached is not None:
+            return cached
+        row = (await self.db.execute(select(*QUEUE_COLUMNS).where(QueueModel.name == name))).first()
+        queue = build_entity(QueueEntity, row)
+        if queue is not None:
+            queue_cache.put(queue)
+        return queue
 
     async def get_queues_by_owner(self, owner_id: UUID) -> List[QueueEntity]:
-        db_queues = self.db.query(QueueModel).filter(QueueModel.owner_id == owner_id).all()
-        return [QueueEntity.from_orm(queue) for queue in db_queues]
+        rows = await self.db.execute(
+            on_replica(select(*QUEUE_COLUMNS).where(QueueModel.owner_id == owner_id))
+        )
+        return build_entities(QueueEntity, rows)
 
     async def get_all_queues(self) -> List[QueueEntity]:
-        db_queues = self.db.query(QueueModel).all()
-        return [QueueEntity.from_orm(queue) for queue in db_queues]
+        rows = await self.db.execute(on_replica(select(*QUEUE_COLUMNS)))
+        return build_entities(QueueEntity, rows)
+
+    async def get_queues_by_owner_page(
+        self,
+        owner_id: UUID,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Page[QueueEntity]:
+        stmt = keyset(
+            select(*QUEUE_COLUMNS).where(QueueModel.owner_id == owner_id),
+            QUEUE_PAGE_KEY, cursor, QUEUE_PAGE_KEY_TYPES, limit,
+        )
+        rows = await self.db.execute(on_replica(stmt))
+        return build_page(build_entities(QueueEntity, rows), limit, _queue_page_key)
+
+    async def get_all_queues_page(self, limit: int, cursor: Optional[str] = None) -> Page[QueueEntity]:
+        stmt = keyset(select(*QUEUE_COLUMNS), QUEUE_PAGE_KEY, cursor, QUEUE_PAGE_KEY_TYPES, limit)
+        rows = await self.db.execute(on_replica(stmt))
+        return build_page(build_entities(QueueEntity, rows), limit, _queue_page_key)
 
     async def update_queue(self, queue_id: UUID, queue: QueueEntity) -> Optional[QueueEntity]:
-        db_queue = self.db.query(QueueModel).filter(QueueModel.queue_id == queue_id).first()
-        if db_queue:
-            for key, value in queue.dict().items():
-                if hasattr(db_queue, key) and key != 'queue_id':  # Не обновляем первичный ключ
-                    setattr(db_queue, key, value)
-            self.db.commit()
-            self.db.refresh(db_queue)
-            return QueueEntity.from_orm(db_queue)
-        return None
+        return await self.update_queue_partial(queue_id, queue.dict())
 
     async def update_queue_partial(self, queue_id: UUID, update_data: dict) -> Optional[QueueEntity]:
-        db_queue = self.db.query(QueueModel).filter(QueueModel.queue_id == queue_id).first()
-        if db_queue:
-            for key, value in update_data.items():
-                if hasattr(db_queue, key) and key != 'queue_id':  # Не обновляем первичный ключ
-                    setattr(db_queue, key, value)
-            self.db.commit()
-            self.db.refresh(db_queue)
-            return QueueEntity.from_orm(db_queue)
-        return None
+        values = column_values(QueueModel, update_data, 'queue_id')  # Не обновляем первичный ключ
+        if not values:
+            return await self.get_queue(queue_id)
+
+        row = (await self.db.execute(
+            update(QueueModel)
+            .where(QueueModel.queue_id == queue_id)
+            .values(**values)
+            .returning(*QUEUE_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if row is None:
+            return None
+
+        await self._notify_changed(queue_id)
+        await commit(self.db)
+        return QueueEntity(**row._mapping)
 
     async def delete_queue(self, queue_id: UUID) -> bool:
-        db_queue = self.db.query(QueueModel).filter(QueueModel.queue_id == queue_id).first()
+        db_queue = await self.db.scalar(select(QueueModel).where(QueueModel.queue_id == queue_id))
         if db_queue:
-            self.db.delete(db_queue)
-            self.db.commit()
+            await self.db.delete(db_queue)
+            await self._notify_changed(queue_id)
+            await commit(self.db)
             return True
-        return False
\ No newline at end of file
+        return False
+
+    async def _notify_changed(self, queue_id: UUID) -> None:
+        # Свой процесс сбрасывает запись в after_commit, другие — по NOTIFY, который тоже
+        # доставляется только при коммите: никто не сбрасывает кэш раньше, чем изменение станет видно
+        self.db.info.setdefault(QUEUE_CACHE_INVALIDATIONS, set()).add(queue_id)
+        if QUEUE_CACHE_NOTIFY:
+            await self.db.execute(select(func.pg_notify(QUEUE_CACHE_CHANNEL, str(queue_id))))
+
+    async def get_queue_stats(self, queue_id: UUID, since: date, days: int) -> QueueStatsEntity:
+        """
+        Счётчики из queue_stats и queue_daily_load, которые ведёт триггер на records:
+        не больше 20 строк по статусам и days строк по дням, сколько бы записей ни было в очереди.
+        """
+        stats = QueueStatsEntity(queue_id=queue_id)
+        rows = await self.db.execute(on_replica(
+            select(QueueStatsModel.status, QueueStatsModel.urgency_level, QueueStatsModel.records)
+            .where(QueueStatsModel.queue_id == queue_id, QueueStatsModel.records > 0)
+        ))
+        for row in rows:
+            stats.total += row.records
+            stats.by_status[row.status] = stats.by_status.get(row.status, 0) + row.records
+            stats.by_urgency[row.urgency_level] = stats.by_urgency.get(row.urgency_level, 0) + row.records
+
+        rows = await self.db.execute(on_replica(
+            select(QueueDailyLoadModel.day, QueueDailyLoadModel.records)
+            .where(
+                QueueDailyLoadModel.queue_id == queue_id,
+                QueueDailyLoadModel.day >= since,
+                QueueDailyLoadModel.day < since + timedelta(days=days),
+                QueueDailyLoadModel.records > 0,
+            )
+            .order_by(QueueDailyLoadModel.day)
+        ))
+        stats.upcoming = [DailyLoadEntity(day=row.day, records=row.records) for row in rows]
+        return stats
@@ -1,16 +1,108 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, Integer, Interval, and_, bindparam, cast, column, delete, event, exists, func, insert, select, update, values
+from sqlalchemy.dialects.postgresql import REGCONFIG, UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID, uuid4
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+import os
+from datetime import datetime, timedelta
 
-from src.app.internal.data.models.record_model import RecordModel
-from src.app.internal.domain.entities.record_entity import RecordEntity
+from src.app.internal.data.models.queue_model import QueueModel
+from src.app.internal.data.models.comment_model import CommentModel
+from src.app.internal.data.models.record_model import ACTIVE_STATUSES, SEARCH_CONFIG, RecordModel, Status
+from src.app.internal.domain.entities.record_entity import RecordEntity, RecordFilter
 from src.app.internal.domain.interfaces.record_interface import IRecordRepository
-from src.app.internal.domain.services.s3_service import S3StorageService
 from src.app.internal.data.models.attachment_model import AttachmentModel
+from src.app.internal.data.models.pending_object_deletion_model import PendingObjectDeletionModel
+from src.app.internal.data.models.record_locator_model import RecordLocatorModel
+from src.app.internal.domain.services.availability import availability_cache
+from src.app.internal.domain.services.slot_index import (
+    SLOT_INDEX_ENABLED, SLOT_INDEX_HISTORY, QueueSlots, naive_utc, slot_index,
+)
+from src.config.database import RoutingSession, on_replica
+from src.app.internal.data.unit_of_work import commit, in_unit_of_work
+from src.app.internal.data.statements import build_entities, build_entity, column_values, entity_columns
+from src.app.internal.data.pagination import Page, build_page, keyset, parse_datetime
+
+RECORD_COLUMNS = entity_columns(RecordModel, RecordEntity)
+# Статусы, после которых запись больше не меняется и подлежит очистке по cleanup_interval
+FINISHED_STATUSES = (Status.COMPLETED, Status.CANCELLED, Status.REJECTED)
+EXPORT_BATCH_SIZE = int(os.getenv("RECORDS_EXPORT_BATCH_SIZE", "1000"))
+# Пространство ключей advisory-блокировок слотов, чтобы не пересекаться с другими блокировками
+SLOT_LOCK_NAMESPACE = 1001
+# Стабильный порядок для keyset-пагинации: время встречи, затем id как тай-брейкер
+RECORD_PAGE_KEY = (RecordModel.meeting_datetime, RecordModel.record_id)
+RECORD_PAGE_KEY_TYPES = (parse_datetime, UUID)
+# Результаты поиска: сначала более релевантные (ранг по убыванию), затем по id
+SEARCH_PAGE_KEY_TYPES = (float, UUID)
+# Порядок "кто следующий": срочность по убыванию, затем время встречи (индекс ix_records_queue_next)
+NEXT_RECORD_ORDER = (RecordModel.urgency_level.desc(), RecordModel.meeting_datetime, RecordModel.record_id)
+# Изменения индекса слотов, ожидающие коммита транзакции сессии
+SLOT_INDEX_OPS = "slot_index_ops"
+
+
+def _record_page_key(record: RecordEntity):
+    return record.meeting_datetime, record.record_id
+
+
+def _record_key(record_id: UUID, meeting_datetime: Optional[datetime] = None):
+    """
+    Условие поиска записи по id с границей по ключу секционирования: известное вызывающему
+    время встречи либо его значение из record_locator. Скалярный подзапрос вычисляется
+    до сканирования, и PostgreSQL отбрасывает все секции, кроме одной.
+    """
+    if meeting_datetime is None:
+        bound = (
+            select(RecordLocatorModel.meeting_datetime)
+            .where(RecordLocatorModel.record_id == record_id)
+            .scalar_subquery()
+        )
+    else:
+        bound = naive_utc(meeting_datetime)
+    return and_(RecordModel.record_id == record_id, RecordModel.meeting_datetime == bound)
+
+
+def _in_window(stmt, since: Optional[datetime], until: Optional[datetime]):
+    # Граница по meeting_datetime позволяет планировщику отбросить лишние секции records
+    if since is not None:
+        stmt = stmt.where(RecordModel.meeting_datetime >= since)
+    if until is not None:
+        stmt = stmt.where(RecordModel.meeting_datetime < until)
+    return stmt
+
+
+def _status_in(statuses: Sequence[Status]):
+    # Значения подставляются в текст запроса: по параметрам generic-план подготовленного
+    # выражения не может доказать условие частичных индексов по статусу
+    return RecordModel.status.in_(bindparam(
+        "statuses", list(statuses), type_=RecordModel.status.type,
+        expanding=True, literal_execute=True, unique=True,
+    ))
+
+
+def _apply_filter(stmt, filters: Optional[RecordFilter]):
+    if filters is None:
+        return stmt
+    if filters.statuses:
+        stmt = stmt.where(_status_in(filters.statuses))
+    if filters.urgency_levels:
+        stmt = stmt.where(RecordModel.urgency_level.in_(filters.urgency_levels))
+    return _in_window(stmt, filters.since, filters.until)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _apply_slot_index_ops(session) -> None:
+    for queue_id, version, removed, added in session.info.pop(SLOT_INDEX_OPS, ()):
+        slot_index.apply(queue_id, version, [record_id for record_id, _ in removed], added)
+        availability_cache.apply(queue_id, version, [when for _, when in (*removed, *added)])
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _drop_slot_index_ops(session) -> None:
+    session.info.pop(SLOT_INDEX_OPS, None)
 
 
 class RecordRepository(IRecordRepository):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def create_record(self, record: RecordEntity) -> RecordEntity:
@@ -19,108 +111,548 @@ class RecordRepository(IRecordRepository):
         if "record_id" not in record_data or record_data["record_id"] is None:
             record_data["record_id"] = uuid4()
 
-        db_record = RecordModel(**record_data)
-        self.db.add(db_record)
-        self.db.commit()
-        self.db.refresh(db_record)
+        row = (await self.db.execute(
+            insert(RecordModel)
+            .values(**column_values(RecordModel, record_data))
+            .returning(*RECORD_COLUMNS)
+        )).one()
+        await self._touch_schedule(row.queue_id, added=[(row.record_id, row.meeting_datetime)])
+        await commit(self.db)
 
-        return RecordEntity.from_orm(db_record)
+        return RecordEntity(**row._mapping)
 
-    async def get_record(self, record_id: UUID) -> Optional[RecordEntity]:
-        db_record = (
-            self.db.query(RecordModel)
-            .filter(RecordModel.record_id == record_id)
-            .first()
-        )
-        return RecordEntity.from_orm(db_record) if db_record else None
+    async def get_record(self, record_id: UUID, meeting_datetime: Optional[datetime] = None) -> Optional[RecordEntity]:
+        row = (await self.db.execute(
+            select(*RECORD_COLUMNS)
+            .where(_record_key(record_id, meeting_datetime))
+        )).first()
+        return build_entity(RecordEntity, row)
 
     async def get_records_by_queue(self, queue_id: UUID) -> List[RecordEntity]:
-        records = (
-            self.db.query(RecordModel)
-            .filter(RecordModel.queue_id == queue_id)
-            .all()
-        )
-        return [RecordEntity.from_orm(r) for r in records]
+        rows = await self.db.execute(on_replica(
+            select(*RECORD_COLUMNS)
+            .where(RecordModel.queue_id == queue_id)
+        ))
+        return build_entities(RecordEntity, rows)
 
     async def get_records_by_user(self, user_id: UUID) -> List[RecordEntity]:
-        records = (
-            self.db.query(RecordModel)
-            .filter(RecordModel.user_id == user_id)
-            .all()
+        rows = await self.db.execute(on_replica(
+            select(*RECORD_COLUMNS)
+            .where(RecordModel.user_id == user_id)
+        ))
+        return build_entities(RecordEntity, rows)
+
+    async def get_records_by_queue_page(
+        self,
+        queue_id: UUID,
+        limit: int,
+        cursor: Optional[str] = None,
+        filters: Optional[RecordFilter] = None,
+    ) -> Page[RecordEntity]:
+        stmt = keyset(
+            _apply_filter(select(*RECORD_COLUMNS).where(RecordModel.queue_id == queue_id), filters),
+            RECORD_PAGE_KEY, cursor, RECORD_PAGE_KEY_TYPES, limit,
+            descending=filters is not None and filters.descending,
         )
-        return [RecordEntity.from_orm(r) for r in records]
+        rows = await self.db.execute(on_replica(stmt))
+        return build_page(build_entities(RecordEntity, rows), limit, _record_page_key)
+
+    async def get_records_by_user_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        cursor: Optional[str] = None,
+        filters: Optional[RecordFilter] = None,
+    ) -> Page[RecordEntity]:
+        stmt = keyset(
+            _apply_filter(select(*RECORD_COLUMNS).where(RecordModel.user_id == user_id), filters),
+            RECORD_PAGE_KEY, cursor, RECORD_PAGE_KEY_TYPES, limit,
+            descending=filters is not None and filters.descending,
+        )
+        rows = await self.db.execute(on_replica(stmt))
+        return build_page(build_entities(RecordEntity, rows), limit, _record_page_key)
+
+    async def stream_records_by_queue(
+        self,
+        queue_id: UUID,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence]:
+        """
+        Строки записей очереди пачками по batch_size через серверный курсор.
+        Отдаются кортежи колонок без ORM-объектов, поэтому память не зависит от размера очереди.
+        """
+        result = await self.db.stream(on_replica(
+            select(*RECORD_COLUMNS)
+            .where(RecordModel.queue_id == queue_id)
+            .order_by(*RECORD_PAGE_KEY)
+            .execution_options(yield_per=batch_size)
+        ))
+        async for partition in result.partitions():
+            yield partition
 
     async def update_record_partial(
         self,
         record_id: UUID,
-        update_data: dict
+        update_data: dict,
+        meeting_datetime: Optional[datetime] = None,
     ) -> Optional[RecordEntity]:
-        db_record = (
-            self.db.query(RecordModel)
-            .filter(RecordModel.record_id == record_id)
-            .first()
-        )
+        """
+        meeting_datetime — текущее время встречи, если вызывающий его уже знает;
+        иначе оно читается по record_locator.
+        """
+        values = column_values(RecordModel, update_data, "record_id")
+        if not values:
+            return await self.get_record(record_id, meeting_datetime)
 
-        print(update_data)
-        if not db_record:
-            return None
+        # Текущее время — граница UPDATE по ключу секционирования и прежнее окно для кэшей расписания
+        previous = meeting_datetime
+        if previous is None:
+            previous = await self.db.scalar(select(RecordModel.meeting_datetime).where(_record_key(record_id)))
+            if previous is None:
+                return None
 
-        for key, value in update_data.items():
-            if hasattr(db_record, key) and key != "record_id":
-                setattr(db_record, key, value)
+        row = (await self.db.execute(
+            update(RecordModel)
+            .where(_record_key(record_id, previous))
+            .values(**values)
+            .returning(*RECORD_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if row is None:
+            return None
 
-        self.db.commit()
-        self.db.refresh(db_record)
-        return RecordEntity.from_orm(db_record)
+        if "meeting_datetime" in values:
+            await self._touch_schedule(
+                row.queue_id, removed=[(row.record_id, previous)], added=[(row.record_id, row.meeting_datetime)]
+            )
+        await commit(self.db)
+        return RecordEntity(**row._mapping)
 
-    async def delete_record(self, record_id: UUID) -> bool:
-        s3_service = S3StorageService()
+    async def delete_record(self, record_id: UUID, meeting_datetime: Optional[datetime] = None) -> bool:
         try:
-            db_record = (
-                self.db.query(RecordModel)
-                .filter(RecordModel.record_id == record_id)
-                .first()
-            )
+            db_record = (await self.db.execute(
+                select(RecordModel.queue_id, RecordModel.meeting_datetime)
+                .where(_record_key(record_id, meeting_datetime))
+            )).first()
 
             if not db_record:
                 return False
 
-            attachments = (
-                self.db.query(AttachmentModel)
-                .filter(AttachmentModel.record_id == record_id)
-                .all()
-            )
-
-            for attachment in attachments:
-                s3_service.delete(
-                    object_key=attachment.object_key
+            # Внешних ключей на секционированную records нет: зависимые строки удаляются явно.
+            # S3-объекты вложений удалит воркер очистки, когда транзакция закоммитится
+            object_keys = await self._delete_with_dependents([record_id])
+            await self._queue_object_deletions(object_keys)
+            await self.db.execute(
+                delete(RecordModel)
+                .where(
+                    RecordModel.record_id == record_id,
+                    # Граница по ключу секционирования: DELETE затрагивает одну секцию
+                    RecordModel.meeting_datetime == db_record.meeting_datetime,
                 )
-
-            self.db.delete(db_record)
-            self.db.commit()
+                .execution_options(synchronize_session=False)
+            )
+            await self._touch_schedule(db_record.queue_id, removed=[(record_id, db_record.meeting_datetime)])
+            await commit(self.db)
             return True
 
         except Exception:
-            self.db.rollback()
+            if not in_unit_of_work(self.db):
+                await self.db.rollback()
             raise
 
+    async def delete_finished_records(
+            self,
+            queue_id: UUID,
+            older_than: datetime,
+            limit: int,
+    ) -> int:
+        """
+        Удаляет до limit завершённых записей очереди со встречей раньше older_than вместе с
+        комментариями и вложениями. Ключи S3-объектов вложений ставятся в pending_object_deletions
+        в той же транзакции: объекты удаляет воркер, и сбой S3 их не теряет.
+        """
+        batch = (await self.db.execute(
+            select(RecordModel.record_id, RecordModel.meeting_datetime)
+            .where(
+                RecordModel.queue_id == queue_id,
+                RecordModel.status.in_(FINISHED_STATUSES),
+                RecordModel.meeting_datetime < older_than,
+            )
+            .order_by(RecordModel.meeting_datetime)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )).all()
+        if not batch:
+            return 0
+
+        record_ids = [row.record_id for row in batch]
+        object_keys = await self._delete_with_dependents(record_ids)
+        await self.db.execute(
+            delete(RecordModel)
+            .where(
+                RecordModel.record_id.in_(record_ids),
+                RecordModel.meeting_datetime < older_than,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self._queue_object_deletions(object_keys)
+        await self._touch_schedule(queue_id, removed=[(row.record_id, row.meeting_datetime) for row in batch])
+        await commit(self.db)
+
+        return len(batch)
+
+    async def get_pending_object_deletions(self, limit: int, attempted_before: datetime) -> List[str]:
+        # attempted_before исключает ключи, которые уже пробовали удалить в текущем проходе
+        return list((await self.db.execute(
+            select(PendingObjectDeletionModel.object_key)
+            .where(
+                (PendingObjectDeletionModel.last_attempt_at.is_(None))
+                | (PendingObjectDeletionModel.last_attempt_at < attempted_before)
+            )
+            .order_by(PendingObjectDeletionModel.attempts, PendingObjectDeletionModel.queued_at)
+            .limit(limit)
+        )).scalars())
+
+    async def finish_object_deletions(self, deleted: Sequence[str], failed: Sequence[str]) -> None:
+        if deleted:
+            await self.db.execute(
+                delete(PendingObjectDeletionModel)
+                .where(PendingObjectDeletionModel.object_key.in_(deleted))
+                .execution_options(synchronize_session=False)
+            )
+        if failed:
+            await self.db.execute(
+                update(PendingObjectDeletionModel)
+                .where(PendingObjectDeletionModel.object_key.in_(failed))
+                .values(
+                    attempts=PendingObjectDeletionModel.attempts + 1,
+                    last_attempt_at=datetime.utcnow(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        await commit(self.db)
+
+    async def search_records(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        queue_id: Optional[UUID] = None,
+        user_id: Optional[UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Page[RecordEntity]:
+        """
+        Полнотекстовый поиск по purpose и manager_comment в пределах очереди и/или пользователя.
+        query разбирается как websearch_to_tsquery: слова, "фразы", or и -исключения.
+        """
+        tsquery = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), query)
+        # Ключ keyset-пагинации: отрицательный ранг, чтобы "после курсора" значило "менее релевантно"
+        order = (-func.ts_rank(RecordModel.search_vector, tsquery)).label("search_order")
+        stmt = select(*RECORD_COLUMNS, order).where(RecordModel.search_vector.bool_op("@@")(tsquery))
+        if queue_id is not None:
+            stmt = stmt.where(RecordModel.queue_id == queue_id)
+        if user_id is not None:
+            stmt = stmt.where(RecordModel.user_id == user_id)
+        stmt = keyset(
+            _in_window(stmt, since, until),
+            (order, RecordModel.record_id), cursor, SEARCH_PAGE_KEY_TYPES, limit,
+        )
+        rows = (await self.db.execute(on_replica(stmt))).all()
+        page = build_page(rows, limit, lambda row: (row.search_order, row.record_id))
+        return Page(items=build_entities(RecordEntity, page.items), next_cursor=page.next_cursor)
+
+    def _next_record(self, queue_id: UUID):
+        return (
+            select(RecordModel.record_id, RecordModel.meeting_datetime)
+            .where(
+                RecordModel.queue_id == queue_id,
+                _status_in(ACTIVE_STATUSES),
+                RecordModel.claimed_by.is_(None),
+            )
+            .order_by(*NEXT_RECORD_ORDER)
+            .limit(1)
+        )
+
+    async def get_next_record(self, queue_id: UUID) -> Optional[RecordEntity]:
+        # Только просмотр: запись не захватывается и может уйти другому менеджеру
+        next_record = self._next_record(queue_id).subquery()
+        row = (await self.db.execute(
+            select(*RECORD_COLUMNS).join(
+                next_record,
+                (RecordModel.record_id == next_record.c.record_id)
+                & (RecordModel.meeting_datetime == next_record.c.meeting_datetime),
+            )
+        )).first()
+        return build_entity(RecordEntity, row)
+
+    async def claim_next_record(self, queue_id: UUID, manager_id: UUID) -> Optional[RecordEntity]:
+        """
+        Захватывает следующую запись очереди одним UPDATE. SKIP LOCKED пропускает строки,
+        которые в этот момент захватывают другие менеджеры, поэтому параллельные вызовы
+        не ждут друг друга и не получают одну запись дважды.
+        """
+        picked = self._next_record(queue_id).with_for_update(skip_locked=True).cte("picked")
+        row = (await self.db.execute(
+            update(RecordModel)
+            .where(
+                RecordModel.record_id == picked.c.record_id,
+                RecordModel.meeting_datetime == picked.c.meeting_datetime,
+                RecordModel.claimed_by.is_(None),
+            )
+            .values(claimed_by=manager_id, claimed_at=datetime.utcnow())
+            .returning(*RECORD_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )).first()
+        await commit(self.db)
+        return build_entity(RecordEntity, row)
+
+    async def release_record_claim(
+            self, queue_id: UUID, record_id: UUID, claimed_by: Optional[UUID] = None) -> Optional[RecordEntity]:
+        """
+        Снимает захват записи; запись возвращается в очередь "кто следующий" на своё место.
+        claimed_by ограничивает снятие захватами этого менеджера. None — если запись
+        не найдена или не захвачена (захвачена другим).
+        """
+        stmt = (
+            update(RecordModel)
+            .where(
+                RecordModel.queue_id == queue_id,
+                _record_key(record_id),
+                RecordModel.claimed_by.is_not(None),
+            )
+            .values(claimed_by=None, claimed_at=None)
+            .returning(*RECORD_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        if claimed_by is not None:
+            stmt = stmt.where(RecordModel.claimed_by == claimed_by)
+        row = (await self.db.execute(stmt)).first()
+        await commit(self.db)
+        return build_entity(RecordEntity, row)
+
+    async def lock_queue_slots(self, queue_ids: Sequence[UUID]) -> None:
+        """
+        Транзакционная advisory-блокировка расписания очередей. Проверка пересечения и вставка
+        под ней атомарны: конкурирующая запись в ту же очередь ждёт коммита или отката.
+        """
+        # Единый порядок захвата исключает взаимоблокировки при пакетной записи
+        for queue_id in sorted(set(queue_ids), key=str):
+            await self.db.execute(
+                select(func.pg_advisory_xact_lock(SLOT_LOCK_NAMESPACE, func.hashtext(str(queue_id))))
+            )
+
     async def has_time_collision(
             self,
             queue_id: UUID,
             meeting_datetime,
-            interval
+            interval,
+            exclude_record_id: Optional[UUID] = None,
     ) -> bool:
+        if SLOT_INDEX_ENABLED:
+            slots = await self._queue_slots(queue_id, meeting_datetime - interval)
+            return slots.collides(meeting_datetime, interval, exclude_record_id)
+
         start = meeting_datetime - interval
         end = meeting_datetime + interval
 
-        collision = (
-            self.db.query(RecordModel)
-            .filter(
+        stmt = (
+            select(RecordModel.record_id)
+            .where(
                 RecordModel.queue_id == queue_id,
                 RecordModel.meeting_datetime > start,
                 RecordModel.meeting_datetime < end,
             )
-            .first()
+            .limit(1)
         )
+        if exclude_record_id is not None:
+            stmt = stmt.where(RecordModel.record_id != exclude_record_id)
+
+        collision = await self.db.scalar(stmt)
 
         return collision is not None
+
+    async def find_time_collisions(
+            self,
+            candidates: Sequence[Tuple[UUID, datetime, timedelta]],
+    ) -> Set[int]:
+        """
+        Индексы кандидатов (queue_id, meeting_datetime, interval), пересекающихся с уже
+        существующими записями. Один запрос на весь список вместо has_time_collision на каждый.
+        """
+        if not candidates:
+            return set()
+
+        if SLOT_INDEX_ENABLED:
+            not_before = {}
+            for queue_id, meeting_datetime, interval in candidates:
+                start = naive_utc(meeting_datetime - interval)
+                not_before[queue_id] = min(start, not_before.get(queue_id, start))
+            slots = await self._queue_slots_many(not_before)
+            return {
+                idx for idx, (queue_id, meeting_datetime, interval) in enumerate(candidates)
+                if slots[queue_id].collides(meeting_datetime, interval)
+            }
+
+        batch = values(
+            column("idx", Integer),
+            column("queue_id", PG_UUID(as_uuid=True)),
+            column("meeting_datetime", DateTime),
+            column("interval", Interval),
+            name="candidates",
+        ).data([
+            (idx, queue_id, meeting_datetime, interval)
+            for idx, (queue_id, meeting_datetime, interval) in enumerate(candidates)
+        ])
+
+        rows = await self.db.scalars(
+            select(batch.c.idx).where(
+                exists().where(
+                    RecordModel.queue_id == batch.c.queue_id,
+                    RecordModel.meeting_datetime > batch.c.meeting_datetime - batch.c.interval,
+                    RecordModel.meeting_datetime < batch.c.meeting_datetime + batch.c.interval,
+                )
+            )
+        )
+        return set(rows.all())
+
+    async def create_records(self, records: Sequence[RecordEntity]) -> List[RecordEntity]:
+        # Один многострочный INSERT ... RETURNING; порядок результата совпадает с входным
+        if not records:
+            return []
+
+        rows_data = []
+        for record in records:
+            record_data = record.dict(exclude={"manager_comment"})
+            if record_data["record_id"] is None:
+                record_data["record_id"] = uuid4()
+            rows_data.append(column_values(RecordModel, record_data))
+
+        rows = (await self.db.execute(
+            insert(RecordModel)
+            .values(rows_data)
+            .returning(*RECORD_COLUMNS)
+        )).all()
+        added_by_queue = {}
+        for row in rows:
+            added_by_queue.setdefault(row.queue_id, []).append((row.record_id, row.meeting_datetime))
+        for queue_id, added in added_by_queue.items():
+            await self._touch_schedule(queue_id, added=added)
+        await commit(self.db)
+
+        created = {row.record_id: RecordEntity(**row._mapping) for row in rows}
+        return [created[data["record_id"]] for data in rows_data]
+
+    async def get_records_version(self, queue_id: UUID) -> Optional[int]:
+        return await self.db.scalar(
+            select(QueueModel.records_version).where(QueueModel.queue_id == queue_id)
+        )
+
+    async def get_meeting_times_between(self, queue_id: UUID, start: datetime, end: datetime) -> List[datetime]:
+        # Диапазон по индексу ix_records_queue_meeting, без ORM-объектов
+        times = await self.db.scalars(
+            select(RecordModel.meeting_datetime)
+            .where(
+                RecordModel.queue_id == queue_id,
+                RecordModel.meeting_datetime > start,
+                RecordModel.meeting_datetime < end,
+            )
+            .order_by(RecordModel.meeting_datetime)
+        )
+        return list(times.all())
+
+    async def find_nearest_free_slot(self, queue_id: UUID, after: datetime, interval: timedelta) -> datetime:
+        slots = await self._queue_slots(queue_id, after - interval)
+        return slots.nearest_free(after, interval)
+
+    async def _delete_with_dependents(self, record_ids: Sequence[UUID]) -> List[str]:
+        # Комментарии и вложения записей; возвращает ключи S3-объектов удалённых вложений
+        await self.db.execute(
+            delete(CommentModel)
+            .where(CommentModel.record_id.in_(record_ids))
+            .execution_options(synchronize_session=False)
+        )
+        object_keys = await self.db.scalars(
+            delete(AttachmentModel)
+            .where(AttachmentModel.record_id.in_(record_ids))
+            .returning(AttachmentModel.object_key)
+            .execution_options(synchronize_session=False)
+        )
+        return list(object_keys.all())
+
+    async def _queue_object_deletions(self, object_keys: Sequence[str]) -> None:
+        # В той же транзакции, что и удаление строк вложений: откат вернёт и строки, и объекты
+        if object_keys:
+            await self.db.execute(
+                pg_insert(PendingObjectDeletionModel)
+                .values([{"object_key": key} for key in object_keys])
+                .on_conflict_do_nothing(index_elements=[PendingObjectDeletionModel.object_key])
+            )
+
+    async def _touch_schedule(
+            self,
+            queue_id: UUID,
+            removed: Sequence[Tuple[UUID, datetime]] = (),
+            added: Sequence[Tuple[UUID, datetime]] = (),
+    ) -> None:
+        # Новая версия расписания видна другим воркерам вместе с коммитом самих записей
+        version = await self.db.scalar(
+            update(QueueModel)
+            .where(QueueModel.queue_id == queue_id)
+            .values(records_version=QueueModel.records_version + 1)
+            .returning(QueueModel.records_version)
+            .execution_options(synchronize_session=False)
+        )
+        if version is not None:
+            self.db.info.setdefault(SLOT_INDEX_OPS, []).append((queue_id, version, removed, added))
+
+    async def _queue_slots(self, queue_id: UUID, not_before: datetime) -> QueueSlots:
+        return (await self._queue_slots_many({queue_id: not_before}))[queue_id]
+
+    async def _queue_slots_many(self, not_before: Dict[UUID, datetime]) -> Dict[UUID, QueueSlots]:
+        """
+        Индексы слотов очередей, сверенные с records_version в базе; not_before — самое раннее
+        время, о котором спросят по каждой очереди. Версии всех очередей читаются одним запросом;
+        очереди с расхождением версии или без нужной истории перечитываются ещё одним, вместе
+        с версией и только начиная с SLOT_INDEX_HISTORY назад (или not_before, если он раньше).
+        """
+        not_before = {queue_id: naive_utc(start) for queue_id, start in not_before.items()}
+        queue_ids = list(not_before)
+        versions = dict((await self.db.execute(
+            select(QueueModel.queue_id, QueueModel.records_version).where(QueueModel.queue_id.in_(queue_ids))
+        )).all())
+        result = {}
+        for queue_id in queue_ids:
+            slots = slot_index.get(queue_id, versions[queue_id]) if queue_id in versions else None
+            if slots is not None and slots.covers(not_before[queue_id]):
+                result[queue_id] = slots
+
+        missing = [queue_id for queue_id in queue_ids if queue_id not in result]
+        if not missing:
+            return result
+
+        since = min([datetime.utcnow() - SLOT_INDEX_HISTORY] + [not_before[queue_id] for queue_id in missing])
+        rows = (await self.db.execute(
+            select(QueueModel.queue_id, QueueModel.records_version, RecordModel.record_id, RecordModel.meeting_datetime)
+            .select_from(QueueModel)
+            .outerjoin(
+                RecordModel,
+                (RecordModel.queue_id == QueueModel.queue_id) & (RecordModel.meeting_datetime > since),
+            )
+            .where(QueueModel.queue_id.in_(missing))
+        )).all()
+        loaded_versions = {}
+        loaded_rows = {queue_id: [] for queue_id in missing}
+        for row in rows:
+            loaded_versions[row.queue_id] = row.records_version
+            if row.record_id is not None:
+                loaded_rows[row.queue_id].append((row.record_id, row.meeting_datetime))
+
+        # Незакоммиченные изменения этой сессии не должны попасть в общий индекс
+        shared = SLOT_INDEX_ENABLED and not self.db.info.get(SLOT_INDEX_OPS)
+        for queue_id in missing:
+            slots = QueueSlots(loaded_versions.get(queue_id, 0), loaded_rows[queue_id], since)
+            if shared and queue_id in loaded_versions:
+                slot_index.put(queue_id, slots)
+            result[queue_id] = slots
+        return result
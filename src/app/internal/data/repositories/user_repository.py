@@ -1,12 +1,40 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID, uuid4
 from typing import List, Optional
 from src.app.internal.data.models.user_model import UserModel
 from src.app.internal.domain.entities.user_entity import UserEntity
 from src.app.internal.domain.interfaces.user_interface import IUserRepository
+from src.app.internal.domain.services.principal_cache import principal_cache
+from src.config.database import RoutingSession, on_replica
+from src.app.internal.data.unit_of_work import commit
+from src.app.internal.data.statements import build_entities, build_entity, column_values, entity_columns
+from src.app.internal.data.pagination import Page, build_page, keyset
+
+# Только колонки пользователя: без selectin-загрузки токенов, очередей и записей
+USER_COLUMNS = entity_columns(UserModel, UserEntity)
+# login уникален и проиндексирован — стабильный ключ пагинации
+USER_PAGE_KEY = (UserModel.login,)
+USER_PAGE_KEY_TYPES = (str,)
+# Пользователи, чьи записи в кэше принципалов сбрасываются после коммита транзакции сессии
+PRINCIPAL_INVALIDATIONS = "principal_invalidations"
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _invalidate_cached_principals(session) -> None:
+    # Внутри UnitOfWork commit() репозитория только flush: раньше коммита параллельный
+    # запрос успел бы закэшировать ещё не изменённую строку до истечения токена
+    for user_uuid in session.info.pop(PRINCIPAL_INVALIDATIONS, ()):
+        principal_cache.invalidate_user(user_uuid)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _drop_principal_invalidations(session) -> None:
+    session.info.pop(PRINCIPAL_INVALIDATIONS, None)
+
 
 class UserRepository(IUserRepository):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def create_user(self, user: UserEntity) -> UserEntity:
@@ -15,59 +43,66 @@ class UserRepository(IUserRepository):
         if 'uuid' not in user_data or user_data['uuid'] is None:
             user_data['uuid'] = uuid4()
 
-        db_user = UserModel(**user_data)
-        self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
-        return UserEntity.from_orm(db_user)
+        row = (await self.db.execute(
+            insert(UserModel)
+            .values(**column_values(UserModel, user_data))
+            .returning(*USER_COLUMNS)
+        )).one()
+        await commit(self.db)
+        return UserEntity(**row._mapping)
 
     async def get_user(self, user_uuid: UUID) -> Optional[UserEntity]:
-        db_user = self.db.query(UserModel).filter(UserModel.uuid == user_uuid).first()
-        if db_user:
-            return UserEntity.from_orm(db_user)
-        return None
+        row = (await self.db.execute(select(*USER_COLUMNS).where(UserModel.uuid == user_uuid))).first()
+        return build_entity(UserEntity, row)
 
     async def get_user_by_email(self, email: str) -> Optional[UserEntity]:
-        db_user = self.db.query(UserModel).filter(UserModel.email == email).first()
-        if db_user:
-            return UserEntity.from_orm(db_user)
-        return None
+        row = (await self.db.execute(select(*USER_COLUMNS).where(UserModel.email == email))).first()
+        return build_entity(UserEntity, row)
 
     async def get_user_by_login(self, login: str) -> Optional[UserEntity]:
-        db_user = self.db.query(UserModel).filter(UserModel.login == login).first()
-        if db_user:
-            return UserEntity.from_orm(db_user)
-        return None
+        row = (await self.db.execute(select(*USER_COLUMNS).where(UserModel.login == login))).first()
+        return build_entity(UserEntity, row)
 
     async def get_all_users(self) -> List[UserEntity]:
-        db_users = self.db.query(UserModel).all()
-        return [UserEntity.from_orm(user) for user in db_users]
+        rows = await self.db.execute(on_replica(select(*USER_COLUMNS)))
+        return build_entities(UserEntity, rows)
+
+    async def get_all_users_page(self, limit: int, cursor: Optional[str] = None) -> Page[UserEntity]:
+        # Только колонки пользователя: списку не нужны selectin-связи
+        stmt = keyset(select(*USER_COLUMNS), USER_PAGE_KEY, cursor, USER_PAGE_KEY_TYPES, limit)
+        rows = (await self.db.execute(on_replica(stmt))).all()
+        return build_page(build_entities(UserEntity, rows), limit, lambda user: (user.login,))
 
     async def update_user(self, user_uuid: UUID, user: UserEntity) -> Optional[UserEntity]:
-        db_user = self.db.query(UserModel).filter(UserModel.uuid == user_uuid).first()
-        if db_user:
-            for key, value in user.dict().items():
-                setattr(db_user, key, value)
-            self.db.commit()
-            self.db.refresh(db_user)
-            return UserEntity.from_orm(db_user)
-        return None
+        return await self.update_user_partial(user_uuid, user.dict())
 
     async def update_user_partial(self, user_uuid: UUID, update_data: dict) -> Optional[UserEntity]:
-        db_user = self.db.query(UserModel).filter(UserModel.uuid == user_uuid).first()
-        if db_user:
-            for key, value in update_data.items():
-                if hasattr(db_user, key):
-                    setattr(db_user, key, value)
-            self.db.commit()
-            self.db.refresh(db_user)
-            return UserEntity.from_orm(db_user)
-        return None
+        values = column_values(UserModel, update_data, 'uuid')
+        if not values:
+            return await self.get_user(user_uuid)
+
+        row = (await self.db.execute(
+            update(UserModel)
+            .where(UserModel.uuid == user_uuid)
+            .values(**values)
+            .returning(*USER_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if row is None:
+            return None
+
+        self._invalidate_principal(user_uuid)
+        await commit(self.db)
+        return UserEntity(**row._mapping)
 
     async def delete_user(self, user_uuid: UUID) -> bool:
-        db_user = self.db.query(UserModel).filter(UserModel.uuid == user_uuid).first()
+        db_user = await self.db.scalar(select(UserModel).where(UserModel.uuid == user_uuid))
         if db_user:
-            self.db.delete(db_user)
-            self.db.commit()
+            await self.db.delete(db_user)
+            self._invalidate_principal(user_uuid)
+            await commit(self.db)
             return True
         return False
+
+    def _invalidate_principal(self, user_uuid: UUID) -> None:
+        self.db.info.setdefault(PRINCIPAL_INVALIDATIONS, set()).add(user_uuid)
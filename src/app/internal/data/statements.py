@@ -0,0 +1,33 @@
+from typing import Iterable, List, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+E = TypeVar("E", bound=BaseModel)
+
+
+def entity_columns(model, entity_cls: type[BaseModel]) -> Tuple:
+    """
+    Колонки модели, из которых собирается сущность, — для RETURNING и выборок без ORM-объектов.
+    """
+    return tuple(getattr(model, name) for name in entity_cls.model_fields)
+
+
+def column_values(model, data: dict, *exclude: str) -> dict:
+    # Аналог прежней проверки hasattr(db_obj, key): только реальные колонки таблицы
+    columns = model.__table__.c
+    return {key: value for key, value in data.items() if key in columns and key not in exclude}
+
+
+def build_entity(entity_cls: type[E], row) -> Optional[E]:
+    """
+    Сущность из строки select(*COLUMNS) без ORM-объекта и без повторной валидации:
+    типы колонок уже совпадают с полями сущности.
+    """
+    if row is None:
+        return None
+    return entity_cls.model_construct(**row._mapping)
+
+
+def build_entities(entity_cls: type[E], rows: Iterable) -> List[E]:
+    construct = entity_cls.model_construct
+    return [construct(**row._mapping) for row in rows]
@@ -0,0 +1,44 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+UOW_DEPTH = "uow_depth"
+
+
+class UnitOfWork:
+    """
+    Одна транзакция на весь сценарий. Репозитории внутри неё делают только flush,
+    коммит (или откат при исключении) выполняется один раз при выходе из внешнего блока.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self.db.info[UOW_DEPTH] = self.db.info.get(UOW_DEPTH, 0) + 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        depth = self.db.info[UOW_DEPTH] - 1
+        self.db.info[UOW_DEPTH] = depth
+        if depth:
+            # Вложенный блок: транзакцию завершит внешний
+            return False
+
+        if exc_type is None:
+            await self.db.commit()
+        else:
+            await self.db.rollback()
+        return False
+
+
+def in_unit_of_work(db: AsyncSession) -> bool:
+    return db.info.get(UOW_DEPTH, 0) > 0
+
+
+async def commit(db: AsyncSession) -> None:
+    """
+    Коммит для одиночной операции репозитория; внутри UnitOfWork — только flush.
+    """
+    if in_unit_of_work(db):
+        await db.flush()
+    else:
+        await db.commit()
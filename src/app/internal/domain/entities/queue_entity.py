@@ -9,6 +9,7 @@ class QueueEntity(BaseModel):
     owner_id: UUID
     cleanup_interval: timedelta = Field(default=timedelta(days=1))
     record_interval: timedelta = Field(default=timedelta(minutes=30))
+    comments_limit: int = Field(default=5, ge=1)
 
 
     class Config:
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import date
+from typing import Dict, List
+
+from src.app.internal.data.models.record_model import UrgencyLevel, Status
+
+
+class DailyLoadEntity(BaseModel):
+    day: date
+    records: int
+
+
+class QueueStatsEntity(BaseModel):
+    queue_id: UUID
+    total: int = 0
+    by_status: Dict[Status, int] = {}
+    by_urgency: Dict[UrgencyLevel, int] = {}
+    # Активные записи по дням, начиная с сегодняшнего; дни без записей не попадают
+    upcoming: List[DailyLoadEntity] = []
@@ -1,7 +1,8 @@
+from dataclasses import dataclass
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence
 
 from src.app.internal.data.models.record_model import UrgencyLevel, Status
 
@@ -17,6 +18,20 @@ class RecordEntity(BaseModel):
     urgency_level: UrgencyLevel = UrgencyLevel.MEDIUM
     status: Status = Status.PENDING
     manager_comment: Optional[str] = None
+    claimed_by: Optional[UUID] = None
+    claimed_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+@dataclass
+class RecordFilter:
+    """
+    Фильтры и порядок списков записей; пустые наборы и None означают "без ограничения".
+    """
+    statuses: Sequence[Status] = ()
+    urgency_levels: Sequence[UrgencyLevel] = ()
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    descending: bool = False
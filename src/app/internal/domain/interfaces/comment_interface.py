@@ -18,10 +18,6 @@ class ICommentRepository(ABC):
     async def get_by_queue(self, queue_id: UUID) -> List[CommentEntity]:
         ...
 
-    @abstractmethod
-    async def count_comments_by_queue(self, queue_id: UUID) -> int:
-        ...
-
     @abstractmethod
     async def delete_oldest_comments(
         self,
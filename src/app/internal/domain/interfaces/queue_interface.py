@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+from datetime import date
 from uuid import UUID
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from src.app.internal.domain.entities.queue_entity import QueueEntity
+from src.app.internal.domain.entities.queue_stats_entity import QueueStatsEntity
+from src.app.internal.data.pagination import Page
 
 class IQueueRepository(ABC):
     @abstractmethod
@@ -12,6 +15,10 @@ class IQueueRepository(ABC):
     async def get_queue(self, queue_id: UUID) -> Optional[QueueEntity]:
         pass
 
+    @abstractmethod
+    async def get_queues_by_ids(self, queue_ids: Iterable[UUID]) -> Dict[UUID, QueueEntity]:
+        pass
+
     @abstractmethod
     async def get_queue_by_name(self, name: str) -> Optional[QueueEntity]:
         pass
@@ -34,4 +41,16 @@ class IQueueRepository(ABC):
 
     @abstractmethod
     async def delete_queue(self, queue_id: UUID) -> bool:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def get_queues_by_owner_page(self, owner_id: UUID, limit: int, cursor: Optional[str] = None) -> Page[QueueEntity]:
+        pass
+
+    @abstractmethod
+    async def get_all_queues_page(self, limit: int, cursor: Optional[str] = None) -> Page[QueueEntity]:
+        pass
+
+    @abstractmethod
+    async def get_queue_stats(self, queue_id: UUID, since: date, days: int) -> QueueStatsEntity:
+        pass
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from src.app.internal.domain.entities.record_entity import RecordEntity
+from src.app.internal.domain.entities.record_entity import RecordEntity, RecordFilter
+from src.app.internal.data.pagination import Page
 
 
 class IRecordRepository(ABC):
@@ -12,7 +14,7 @@ class IRecordRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_record(self, record_id: UUID) -> Optional[RecordEntity]:
+    async def get_record(self, record_id: UUID, meeting_datetime: Optional[datetime] = None) -> Optional[RecordEntity]:
         pass
 
     @abstractmethod
@@ -24,13 +26,92 @@ class IRecordRepository(ABC):
         pass
 
     @abstractmethod
-    async def delete_record(self, record_id: UUID) -> bool:
+    async def delete_record(self, record_id: UUID, meeting_datetime: Optional[datetime] = None) -> bool:
         pass
 
     @abstractmethod
     async def update_record_partial(
         self,
         record_id: UUID,
-        update_data: dict
+        update_data: dict,
+        meeting_datetime: Optional[datetime] = None,
     ) -> Optional[RecordEntity]:
         pass
+
+    @abstractmethod
+    async def create_records(self, records: Sequence[RecordEntity]) -> List[RecordEntity]:
+        pass
+
+    @abstractmethod
+    async def get_records_by_queue_page(
+        self,
+        queue_id: UUID,
+        limit: int,
+        cursor: Optional[str] = None,
+        filters: Optional[RecordFilter] = None,
+    ) -> Page[RecordEntity]:
+        pass
+
+    @abstractmethod
+    async def get_records_by_user_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        cursor: Optional[str] = None,
+        filters: Optional[RecordFilter] = None,
+    ) -> Page[RecordEntity]:
+        pass
+
+    @abstractmethod
+    async def search_records(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        queue_id: Optional[UUID] = None,
+        user_id: Optional[UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Page[RecordEntity]:
+        pass
+
+    @abstractmethod
+    async def get_next_record(self, queue_id: UUID) -> Optional[RecordEntity]:
+        pass
+
+    @abstractmethod
+    async def claim_next_record(self, queue_id: UUID, manager_id: UUID) -> Optional[RecordEntity]:
+        pass
+
+    @abstractmethod
+    async def release_record_claim(
+            self, queue_id: UUID, record_id: UUID, claimed_by: Optional[UUID] = None) -> Optional[RecordEntity]:
+        pass
+
+    @abstractmethod
+    async def lock_queue_slots(self, queue_ids: Sequence[UUID]) -> None:
+        pass
+
+    @abstractmethod
+    async def find_nearest_free_slot(self, queue_id: UUID, after: datetime, interval: timedelta) -> datetime:
+        pass
+
+    @abstractmethod
+    async def get_records_version(self, queue_id: UUID) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    async def get_meeting_times_between(self, queue_id: UUID, start: datetime, end: datetime) -> List[datetime]:
+        pass
+
+    @abstractmethod
+    async def delete_finished_records(self, queue_id: UUID, older_than: datetime, limit: int) -> int:
+        pass
+
+    @abstractmethod
+    async def get_pending_object_deletions(self, limit: int, attempted_before: datetime) -> List[str]:
+        pass
+
+    @abstractmethod
+    async def finish_object_deletions(self, deleted: Sequence[str], failed: Sequence[str]) -> None:
+        pass
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from uuid import UUID
 from typing import List, Optional
 from src.app.internal.domain.entities.user_entity import UserEntity
+from src.app.internal.data.pagination import Page
 
 class IUserRepository(ABC):
 
@@ -37,3 +38,7 @@ class IUserRepository(ABC):
     @abstractmethod
     async def update_user_partial(self, user_uuid: UUID, update_data: dict) -> Optional[UserEntity]:
         pass
+
+    @abstractmethod
+    async def get_all_users_page(self, limit: int, cursor: Optional[str] = None) -> Page[UserEntity]:
+        pass
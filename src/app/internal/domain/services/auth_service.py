@@ -5,6 +5,8 @@ from passlib.context import CryptContext
 from dotenv import load_dotenv
 from uuid import UUID
 
+from src.app.internal.domain.services.hashing_executor import hashing_executor
+
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -23,6 +25,14 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await hashing_executor.run("verify", verify_password, plain, hashed)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing_executor.run("hash", get_password_hash, password)
+
+
 def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
     now = datetime.utcnow()
     if expires_delta is None:
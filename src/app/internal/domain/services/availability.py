@@ -0,0 +1,187 @@
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from dotenv import load_dotenv
+
+from src.app.internal.domain.services.slot_index import naive_utc
+
+load_dotenv()
+
+AVAILABILITY_CACHE_SIZE = int(os.getenv("AVAILABILITY_CACHE_SIZE", "10000"))
+AVAILABILITY_MAX_DAYS = int(os.getenv("AVAILABILITY_MAX_DAYS", "31"))
+
+ONE_DAY = timedelta(days=1)
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+def free_slots_for_day(day: date, interval: timedelta, times: List[datetime]) -> List[datetime]:
+    """
+    Свободные слоты сетки дня: от полуночи с шагом interval. Слот занят, если какая-либо
+    запись ближе interval (те же границы, что и в проверке пересечения). times отсортированы.
+    """
+    free = []
+    slot = day_start(day)
+    end = slot + ONE_DAY
+    pos = bisect_right(times, slot - interval)
+    while slot < end:
+        while pos < len(times) and times[pos] <= slot - interval:
+            pos += 1
+        if pos == len(times) or times[pos] >= slot + interval:
+            free.append(slot)
+        slot += interval
+    return free
+
+
+def days_touched(meeting_datetime: datetime, interval: timedelta) -> Iterable[date]:
+    # Запись влияет на слоты дней, в окно которых (с запасом interval) она попадает
+    when = naive_utc(meeting_datetime)
+    day = (when - interval).date()
+    last = (when + interval).date()
+    while day <= last:
+        yield day
+        day += ONE_DAY
+
+
+class AvailabilityCache:
+    """
+    LRU свободных слотов по (очередь, день). Записи очереди годны, пока её records_version
+    в базе совпадает с запомненной; свои коммиты сбрасывают только затронутые дни.
+    """
+
+    def __init__(self, maxsize: int = AVAILABILITY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[UUID, date], Tuple[timedelta, List[datetime]]]" = OrderedDict()
+        self._days_by_queue: Dict[UUID, Set[date]] = {}
+        self._versions: Dict[UUID, int] = {}
+        self._lock = threading.Lock()
+
+    def sync_version(self, queue_id: UUID, version: int) -> None:
+        with self._lock:
+            if self._versions.get(queue_id) != version:
+                self._drop_queue(queue_id)
+                self._versions[queue_id] = version
+
+    def get(self, queue_id: UUID, day: date, interval: timedelta) -> Optional[List[datetime]]:
+        with self._lock:
+            entry = self._entries.get((queue_id, day))
+            if entry is None:
+                return None
+            cached_interval, slots = entry
+            if cached_interval != interval:
+                # Шаг сетки очереди изменился
+                self._pop((queue_id, day))
+                return None
+            self._entries.move_to_end((queue_id, day))
+            return slots
+
+    def put(self, queue_id: UUID, version: int, day: date, interval: timedelta, slots: List[datetime]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if self._versions.get(queue_id) != version:
+                return
+            self._entries[(queue_id, day)] = (interval, slots)
+            self._entries.move_to_end((queue_id, day))
+            self._days_by_queue.setdefault(queue_id, set()).add(day)
+            while len(self._entries) > self.maxsize:
+                self._pop(next(iter(self._entries)))
+
+    def apply(self, queue_id: UUID, version: int, changed: Iterable[datetime]) -> None:
+        """
+        Закоммиченные изменения записей очереди: сбрасываются дни, в окно которых попали
+        старое или новое время. Если версия ушла дальше, чем на один шаг, сбрасывается вся очередь.
+        """
+        with self._lock:
+            if queue_id not in self._versions:
+                return
+            if self._versions[queue_id] != version - 1:
+                self._drop_queue(queue_id)
+                del self._versions[queue_id]
+                return
+            self._versions[queue_id] = version
+            for key in [(queue_id, day) for day in self._days_by_queue.get(queue_id, ())]:
+                interval, _ = self._entries[key]
+                if any(key[1] in days_touched(when, interval) for when in changed):
+                    self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._days_by_queue.clear()
+            self._versions.clear()
+
+    def _drop_queue(self, queue_id: UUID) -> None:
+        for day in self._days_by_queue.pop(queue_id, set()):
+            self._entries.pop((queue_id, day), None)
+
+    def _pop(self, key: Tuple[UUID, date]) -> None:
+        self._entries.pop(key)
+        queue_id, day = key
+        days = self._days_by_queue.get(queue_id)
+        if days is not None:
+            days.discard(day)
+            if not days:
+                del self._days_by_queue[queue_id]
+
+
+availability_cache = AvailabilityCache()
+
+
+@dataclass
+class QueueAvailability:
+    queue_id: UUID
+    record_interval: timedelta
+    slots: List[datetime]
+
+
+class GetQueueAvailabilityUseCase:
+
+    def __init__(self, queue_repo, record_repo):
+        self.queue_repo = queue_repo
+        self.record_repo = record_repo
+
+    async def execute(self, queue_id, start: datetime, end: datetime) -> QueueAvailability:
+        start, end = naive_utc(start), naive_utc(end)
+        if end <= start:
+            raise ValueError("'to' must be later than 'from'")
+        if end - start > AVAILABILITY_MAX_DAYS * ONE_DAY:
+            raise ValueError(f"Range must not exceed {AVAILABILITY_MAX_DAYS} days")
+
+        queue = await self.queue_repo.get_queue(queue_id)
+        if queue is None:
+            raise LookupError("Queue not found")
+        interval = queue.record_interval
+
+        version = await self.record_repo.get_records_version(queue_id)
+        availability_cache.sync_version(queue_id, version)
+
+        days = []
+        day = start.date()
+        while day_start(day) < end:
+            days.append(day)
+            day += ONE_DAY
+
+        by_day = {day: availability_cache.get(queue_id, day, interval) for day in days}
+        missing = [day for day, slots in by_day.items() if slots is None]
+        if missing:
+            # Один проход по индексу (queue_id, meeting_datetime) на все непокрытые кэшем дни
+            times = await self.record_repo.get_meeting_times_between(
+                queue_id,
+                day_start(missing[0]) - interval,
+                day_start(missing[-1]) + ONE_DAY + interval,
+            )
+            for day in missing:
+                by_day[day] = free_slots_for_day(day, interval, times)
+                availability_cache.put(queue_id, version, day, interval, by_day[day])
+
+        slots = [slot for day in days for slot in by_day[day] if start <= slot < end]
+        return QueueAvailability(queue_id=queue.queue_id, record_interval=interval, slots=slots)
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Optional
+
+from src.app.internal.domain.entities.record_entity import RecordEntity
+from src.app.internal.domain.services.slot_index import SLOT_INDEX_ENABLED
+
+
+class SlotTakenError(Exception):
+    def __init__(self, message: str, next_free: Optional[datetime] = None):
+        super().__init__(message)
+        self.next_free = next_free
+
+
+class BookRecordUseCase:
+    def __init__(
+        self,
+        record_repo,
+        queue_repo,
+        uow,
+    ):
+        self.record_repo = record_repo
+        self.queue_repo = queue_repo
+        self.uow = uow
+
+    async def execute(
+        self,
+        *,
+        user_id,
+        queue_id,
+        purpose,
+        meeting_datetime,
+        urgency_level,
+    ) -> RecordEntity:
+        # Блокировка очереди, проверка пересечения и вставка — одна транзакция
+        async with self.uow:
+            queue = await self.queue_repo.get_queue(queue_id)
+            if queue is None:
+                raise ValueError("Queue not found")
+
+            await self.record_repo.lock_queue_slots([queue.queue_id])
+
+            has_collision = await self.record_repo.has_time_collision(
+                queue_id=queue.queue_id,
+                meeting_datetime=meeting_datetime,
+                interval=queue.record_interval,
+            )
+            if has_collision:
+                next_free = None
+                if SLOT_INDEX_ENABLED:
+                    # С индексом подсказка ближайшего свободного времени почти бесплатна
+                    next_free = await self.record_repo.find_nearest_free_slot(
+                        queue.queue_id, meeting_datetime, queue.record_interval
+                    )
+                raise SlotTakenError("Record time collides with another record", next_free=next_free)
+
+            record_entity = RecordEntity(
+                user_id=user_id,
+                queue_id=queue.queue_id,
+                purpose=purpose,
+                meeting_datetime=meeting_datetime,
+                urgency_level=urgency_level,
+            )
+            return await self.record_repo.create_record(record_entity)
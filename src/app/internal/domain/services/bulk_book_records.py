@@ -0,0 +1,87 @@
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.app.internal.domain.entities.record_entity import RecordEntity
+
+
+CREATED = "created"
+COLLISION = "collision"
+QUEUE_NOT_FOUND = "queue_not_found"
+
+
+@dataclass
+class BulkBookingResult:
+    index: int
+    status: str
+    record: Optional[RecordEntity] = None
+    detail: Optional[str] = None
+
+
+class BulkBookRecordsUseCase:
+    def __init__(
+        self,
+        record_repo,
+        queue_repo,
+        uow,
+    ):
+        self.record_repo = record_repo
+        self.queue_repo = queue_repo
+        self.uow = uow
+
+    async def execute(self, *, user_id, items) -> List[BulkBookingResult]:
+        results: List[Optional[BulkBookingResult]] = [None] * len(items)
+
+        async with self.uow:
+            queues = await self.queue_repo.get_queues_by_ids(item.queue_id for item in items)
+
+            candidates = []
+            for index, item in enumerate(items):
+                queue = queues.get(item.queue_id)
+                if queue is None:
+                    results[index] = BulkBookingResult(index, QUEUE_NOT_FOUND, detail="Queue not found")
+                    continue
+                candidates.append((index, item, queue.record_interval))
+
+            await self.record_repo.lock_queue_slots([item.queue_id for _, item, _ in candidates])
+
+            # Пересечения с базой — одним запросом на весь пакет
+            db_collisions = await self.record_repo.find_time_collisions(
+                [(item.queue_id, item.meeting_datetime, interval) for _, item, interval in candidates]
+            )
+
+            # Пересечения внутри пакета: выигрывает элемент, стоящий раньше во входном списке
+            accepted_times: Dict = {}
+            accepted = []
+            for position, (index, item, interval) in enumerate(candidates):
+                if position in db_collisions or _collides(accepted_times.get(item.queue_id), item.meeting_datetime, interval):
+                    results[index] = BulkBookingResult(
+                        index, COLLISION, detail="Record time collides with another record"
+                    )
+                    continue
+                insort(accepted_times.setdefault(item.queue_id, []), item.meeting_datetime)
+                accepted.append((index, RecordEntity(
+                    user_id=user_id,
+                    queue_id=item.queue_id,
+                    purpose=item.purpose,
+                    meeting_datetime=item.meeting_datetime,
+                    urgency_level=item.urgency_level,
+                )))
+
+            created = await self.record_repo.create_records([record for _, record in accepted])
+            for (index, _), record in zip(accepted, created):
+                results[index] = BulkBookingResult(index, CREATED, record=record)
+
+        return results
+
+
+def _collides(times: Optional[list], meeting_datetime, interval) -> bool:
+    # Соседи слева и справа в отсортированном списке — единственные кандидаты на пересечение
+    if not times:
+        return False
+    pos = bisect_left(times, meeting_datetime)
+    if pos < len(times) and times[pos] - meeting_datetime < interval:
+        return True
+    if pos > 0 and meeting_datetime - times[pos - 1] < interval:
+        return True
+    return False
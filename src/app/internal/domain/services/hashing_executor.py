@@ -0,0 +1,70 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from dotenv import load_dotenv
+
+from src.config.metrics import metrics
+
+load_dotenv()
+
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "2"))
+HASH_MAX_BACKLOG = int(os.getenv("HASH_MAX_BACKLOG", "32"))
+HASH_RETRY_AFTER_SECONDS = int(os.getenv("HASH_RETRY_AFTER_SECONDS", "1"))
+
+T = TypeVar("T")
+
+hash_queue_depth = metrics.gauge("hash_queue_depth", "Bcrypt jobs queued or running in the hashing executor")
+hash_wait_seconds = metrics.histogram("hash_wait_seconds", "Time a bcrypt job waited for a hashing thread")
+hash_duration_seconds = metrics.histogram("hash_duration_seconds", "Bcrypt hash/verify latency", labels=("operation",))
+hash_rejected_total = metrics.counter("hash_rejected_total", "Requests rejected because the hashing backlog was full")
+
+
+class HashingExecutor:
+    """
+    Отдельный ограниченный пул потоков для bcrypt, чтобы хеширование не блокировало event loop.
+    Счётчик очереди меняется только из потока event loop.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, max_backlog: int = HASH_MAX_BACKLOG):
+        self.max_backlog = max_backlog
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hashing")
+        self._depth = 0
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def is_overloaded(self) -> bool:
+        return self._depth >= self.max_backlog
+
+    def reject(self) -> None:
+        hash_rejected_total.inc()
+
+    async def run(self, operation: str, fn: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        queued_at = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            hash_wait_seconds.observe(started - queued_at)
+            try:
+                return fn(*args)
+            finally:
+                hash_duration_seconds.observe(time.perf_counter() - started, operation=operation)
+
+        self._depth += 1
+        hash_queue_depth.set(self._depth)
+        try:
+            return await loop.run_in_executor(self._executor, timed)
+        finally:
+            self._depth -= 1
+            hash_queue_depth.set(self._depth)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_executor = HashingExecutor()
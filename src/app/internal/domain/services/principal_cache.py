@@ -0,0 +1,72 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+from uuid import UUID
+
+from dotenv import load_dotenv
+
+from src.app.internal.domain.entities.user_entity import UserEntity
+
+load_dotenv()
+
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+
+class PrincipalCache:
+    """
+    LRU проверенных access-токенов: токен -> пользователь до момента exp.
+    Изменение или удаление пользователя сбрасывает все его записи.
+    """
+
+    def __init__(self, maxsize: int = PRINCIPAL_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[UserEntity, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[UUID, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[UserEntity]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.time():
+                self._pop(token)
+                return None
+            self._entries.move_to_end(token)
+            return user
+
+    def put(self, token: str, user: UserEntity, expires_at: float) -> None:
+        if self.maxsize <= 0 or expires_at <= time.time():
+            return
+        with self._lock:
+            if token in self._entries:
+                self._pop(token)
+            self._entries[token] = (user, expires_at)
+            self._tokens_by_user.setdefault(user.uuid, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+
+    def invalidate_user(self, user_uuid: UUID) -> None:
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_uuid, set()):
+                self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _pop(self, token: str) -> None:
+        user, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(user.uuid)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user.uuid]
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+import asyncpg
+from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
+
+from src.app.internal.domain.entities.queue_entity import QueueEntity
+from src.config.database import DATABASE_URL
+from src.config.metrics import metrics
+
+load_dotenv()
+
+# 0 отключает кэш
+QUEUE_CACHE_SIZE = int(os.getenv("QUEUE_CACHE_SIZE", "10000"))
+QUEUE_CACHE_TTL_SECONDS = float(os.getenv("QUEUE_CACHE_TTL_SECONDS", "60"))
+# Межпроцессная инвалидация через LISTEN/NOTIFY; без неё изменения из других воркеров видны через TTL
+QUEUE_CACHE_NOTIFY = os.getenv("QUEUE_CACHE_NOTIFY", "true").lower() in ("1", "true", "yes")
+QUEUE_CACHE_RECONNECT_SECONDS = float(os.getenv("QUEUE_CACHE_RECONNECT_SECONDS", "5"))
+# Простаивающее соединение LISTEN не замечает обрыва TCP, поэтому его периодически проверяют запросом
+QUEUE_CACHE_PING_SECONDS = float(os.getenv("QUEUE_CACHE_PING_SECONDS", "30"))
+QUEUE_CACHE_CHANNEL = "queue_cache"
+
+logger = logging.getLogger("queue_cache")
+
+queue_cache_requests_total = metrics.counter(
+    "queue_cache_requests_total", "Queue metadata lookups served by the cache or the database", labels=("result",)
+)
+queue_cache_invalidations_total = metrics.counter(
+    "queue_cache_invalidations_total", "Queue cache entries dropped after a change", labels=("source",)
+)
+
+
+class QueueCache:
+    """
+    LRU очередей с TTL: по id и по имени. Изменение или удаление очереди сбрасывает её запись
+    в своём процессе после коммита, в остальных — по уведомлению NOTIFY из той же транзакции.
+    Пока слушатель уведомлений не подключён, кэш не используется (available = False).
+    """
+
+    def __init__(self, maxsize: int = QUEUE_CACHE_SIZE, ttl: float = QUEUE_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.available = not QUEUE_CACHE_NOTIFY
+        self._entries: "OrderedDict[UUID, Tuple[QueueEntity, float]]" = OrderedDict()
+        self._ids_by_name: Dict[str, UUID] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, queue_id: UUID) -> Optional[QueueEntity]:
+        with self._lock:
+            queue = self._lookup(queue_id)
+            self._count(queue is not None)
+            return queue
+
+    def get_by_name(self, name: str) -> Optional[QueueEntity]:
+        with self._lock:
+            queue_id = self._ids_by_name.get(name)
+            queue = self._lookup(queue_id) if queue_id is not None else None
+            self._count(queue is not None)
+            return queue
+
+    def put(self, queue: QueueEntity) -> None:
+        if self.maxsize <= 0 or not self.available:
+            return
+        with self._lock:
+            if queue.queue_id in self._entries:
+                self._pop(queue.queue_id)
+            self._entries[queue.queue_id] = (queue, time.monotonic() + self.ttl)
+            self._ids_by_name[queue.name] = queue.queue_id
+            while len(self._entries) > self.maxsize:
+                self._pop(next(iter(self._entries)))
+
+    def invalidate(self, queue_id: UUID, source: str = "local") -> None:
+        with self._lock:
+            if queue_id in self._entries:
+                self._pop(queue_id)
+                queue_cache_invalidations_total.inc(source=source)
+
+    def set_available(self, available: bool) -> None:
+        # Уведомления, пришедшие без слушателя, потеряны: содержимое больше не доверенное
+        with self._lock:
+            self.available = available or not QUEUE_CACHE_NOTIFY
+            self._entries.clear()
+            self._ids_by_name.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def hit_ratio(self) -> float:
+        total = self._hits + self._misses
+        return self._hits / total if total else 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._ids_by_name.clear()
+
+    def _lookup(self, queue_id: UUID) -> Optional[QueueEntity]:
+        if not self.available:
+            return None
+        entry = self._entries.get(queue_id)
+        if entry is None:
+            return None
+        queue, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._pop(queue_id)
+            return None
+        self._entries.move_to_end(queue_id)
+        return queue
+
+    def _count(self, hit: bool) -> None:
+        if hit:
+            self._hits += 1
+        else:
+            self._misses += 1
+        queue_cache_requests_total.inc(result="hit" if hit else "miss")
+
+    def _pop(self, queue_id: UUID) -> None:
+        queue, _ = self._entries.pop(queue_id)
+        if self._ids_by_name.get(queue.name) == queue_id:
+            del self._ids_by_name[queue.name]
+
+
+queue_cache = QueueCache()
+
+metrics.gauge(
+    "queue_cache_hit_ratio", "Share of queue lookups served from the cache since start",
+    callback=lambda: [({}, queue_cache.hit_ratio())],
+)
+metrics.gauge(
+    "queue_cache_entries", "Queues currently cached",
+    callback=lambda: [({}, len(queue_cache))],
+)
+
+
+def _on_notify(connection, pid, channel, payload) -> None:
+    try:
+        queue_cache.invalidate(UUID(payload), source="notify")
+    except ValueError:
+        logger.warning("queue_cache: malformed notification payload %r", payload)
+
+
+async def queue_cache_listener(reconnect: float = QUEUE_CACHE_RECONNECT_SECONDS) -> None:
+    """
+    Держит отдельное соединение с LISTEN queue_cache. При обрыве кэш отключается до переподключения.
+    """
+    dsn = make_url(DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(QUEUE_CACHE_CHANNEL, _on_notify)
+            queue_cache.set_available(True)
+            while not lost.is_set():
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(lost.wait(), QUEUE_CACHE_PING_SECONDS)
+                if not lost.is_set():
+                    await connection.execute("SELECT 1")
+            logger.warning("queue_cache: listener connection lost")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("queue_cache: listener failed")
+        finally:
+            queue_cache.set_available(False)
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(reconnect)
+
+
+def start_queue_cache_listener() -> Optional[asyncio.Task]:
+    if not QUEUE_CACHE_NOTIFY or QUEUE_CACHE_SIZE <= 0:
+        return None
+    return asyncio.create_task(queue_cache_listener(), name="queue-cache-listener")
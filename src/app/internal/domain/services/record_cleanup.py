@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import func, select
+
+from src.app.internal.data.partitions import ensure_partitions
+from src.app.internal.data.repositories.queue_repository import QueueRepository
+from src.app.internal.data.repositories.record_repository import RecordRepository
+from src.app.internal.domain.entities.queue_entity import QueueEntity
+from src.app.internal.domain.services.s3_service import S3StorageService
+from src.config.database import AsyncSessionLocal, async_engine
+from src.config.metrics import metrics
+
+load_dotenv()
+
+CLEANUP_ENABLED = os.getenv("CLEANUP_ENABLED", "true").lower() in ("1", "true", "yes")
+CLEANUP_PERIOD_SECONDS = float(os.getenv("CLEANUP_PERIOD_SECONDS", "300"))
+CLEANUP_BATCH_SIZE = int(os.getenv("CLEANUP_BATCH_SIZE", "500"))
+# Секции records на RECORDS_PARTITIONS_AHEAD месяцев вперёд создаются тем же воркером,
+# а не только при деплое (сервис migrate)
+PARTITIONS_ENSURE_ENABLED = os.getenv("PARTITIONS_ENSURE_ENABLED", "true").lower() in ("1", "true", "yes")
+PARTITIONS_ENSURE_PERIOD_SECONDS = float(os.getenv("PARTITIONS_ENSURE_PERIOD_SECONDS", "3600"))
+# Пространство ключей advisory-блокировок очистки (слоты записей используют 1001)
+CLEANUP_LOCK_NAMESPACE = 1002
+
+logger = logging.getLogger("record_cleanup")
+
+records_cleaned_total = metrics.counter("records_cleaned_total", "Finished records removed by the cleanup worker")
+attachments_cleaned_total = metrics.counter(
+    "attachments_cleaned_total", "S3 objects of attachments removed by the cleanup worker"
+)
+attachments_failed_total = metrics.counter(
+    "attachments_failed_total", "Attempts to remove S3 objects of attachments that failed and were left for retry"
+)
+
+
+async def cleanup_queue(queue: QueueEntity, batch_size: int = CLEANUP_BATCH_SIZE) -> int:
+    """
+    Удаляет завершённые записи очереди старше её cleanup_interval пачками по batch_size.
+    Каждая пачка — отдельная короткая транзакция; ключи S3-объектов её вложений попадают
+    в pending_object_deletions и удаляются purge_deleted_objects.
+    """
+    older_than = datetime.utcnow() - queue.cleanup_interval
+    removed = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            deleted = await RecordRepository(db).delete_finished_records(queue.queue_id, older_than, batch_size)
+
+        removed += deleted
+        records_cleaned_total.inc(deleted)
+        if deleted < batch_size:
+            return removed
+
+
+async def purge_deleted_objects(storage: S3StorageService, batch_size: int = CLEANUP_BATCH_SIZE) -> int:
+    """
+    Удаляет из S3 объекты из pending_object_deletions. Ключ убирается из таблицы только после
+    успешного удаления; при ошибке S3 он остаётся с увеличенным attempts и повторяется
+    на следующем проходе. За один проход каждый ключ пробуется не больше одного раза.
+    """
+    started = datetime.utcnow()
+    purged = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            object_keys = await RecordRepository(db).get_pending_object_deletions(batch_size, started)
+        if not object_keys:
+            return purged
+
+        try:
+            # boto3 блокирующий — в поток, чтобы не держать event loop
+            failed = set(await asyncio.to_thread(storage.delete_many, object_keys))
+        except Exception:
+            logger.exception("cleanup: S3 batch delete failed, %d objects will be retried", len(object_keys))
+            failed = set(object_keys)
+        deleted = [key for key in object_keys if key not in failed]
+        if failed:
+            logger.warning("cleanup: %d S3 objects were not deleted: %s", len(failed), sorted(failed)[:10])
+        attachments_failed_total.inc(len(failed))
+
+        async with AsyncSessionLocal() as db:
+            await RecordRepository(db).finish_object_deletions(deleted, sorted(failed))
+        purged += len(deleted)
+        attachments_cleaned_total.inc(len(deleted))
+        if len(object_keys) < batch_size:
+            return purged
+
+
+async def run_cleanup_pass(
+        storage: Optional[S3StorageService] = None,
+        cleanup: bool = CLEANUP_ENABLED,
+        partitions: bool = False,
+) -> Optional[int]:
+    """
+    Один проход обслуживания: при partitions — создание недостающих секций records,
+    при cleanup — очистка всех очередей. Сессионная advisory-блокировка гарантирует,
+    что проход выполняет только один воркер; остальные сразу возвращают None.
+    """
+    async with async_engine.connect() as lock_conn:
+        # Блокировку держит отдельное соединение без открытой транзакции
+        lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+        acquired = await lock_conn.scalar(select(func.pg_try_advisory_lock(CLEANUP_LOCK_NAMESPACE, 0)))
+        if not acquired:
+            return None
+
+        try:
+            if partitions:
+                try:
+                    # Синхронный движок и DDL — в поток, чтобы не держать event loop
+                    created = await asyncio.to_thread(ensure_partitions)
+                    if created:
+                        logger.info("partitions: created %d monthly partitions of records", len(created))
+                except Exception:
+                    # Очистка не зависит от секций: ошибка не должна её останавливать
+                    logger.exception("partitions: ensure failed")
+
+            removed = 0
+            if cleanup:
+                async with AsyncSessionLocal() as db:
+                    queues = await QueueRepository(db).get_all_queues()
+
+                for queue in queues:
+                    removed += await cleanup_queue(queue)
+                await purge_deleted_objects(storage or S3StorageService())
+            return removed
+        finally:
+            await lock_conn.scalar(select(func.pg_advisory_unlock(CLEANUP_LOCK_NAMESPACE, 0)))
+
+
+async def cleanup_worker(period: float = CLEANUP_PERIOD_SECONDS) -> None:
+    next_partitions_check = 0.0
+    while True:
+        try:
+            partitions = PARTITIONS_ENSURE_ENABLED and time.monotonic() >= next_partitions_check
+            if partitions:
+                next_partitions_check = time.monotonic() + PARTITIONS_ENSURE_PERIOD_SECONDS
+            removed = await run_cleanup_pass(partitions=partitions)
+            if removed:
+                logger.info("cleanup: removed %d finished records", removed)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Ошибка одного прохода не должна останавливать планировщик
+            logger.exception("cleanup pass failed")
+        await asyncio.sleep(period)
+
+
+def start_cleanup_worker() -> Optional[asyncio.Task]:
+    if not CLEANUP_ENABLED and not PARTITIONS_ENSURE_ENABLED:
+        return None
+    return asyncio.create_task(cleanup_worker(), name="record-cleanup")
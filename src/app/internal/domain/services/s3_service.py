@@ -1,6 +1,7 @@
 import os
 import boto3
 import uuid
+from typing import List
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,6 +10,8 @@ S3_ENDPOINT = os.getenv("S3_ENDPOINT")
 S3_BUCKET = os.getenv("S3_BUCKET")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+# Предел S3 API на один DeleteObjects
+S3_DELETE_BATCH = 1000
 
 
 class S3StorageService:
@@ -44,6 +47,21 @@ class S3StorageService:
             Key=object_key,
         )
 
+    def delete_many(self, object_keys: List[str]) -> List[str]:
+        """
+        Пакетное удаление: один запрос DeleteObjects на каждые S3_DELETE_BATCH ключей.
+        Возвращает ключи, которые удалить не удалось.
+        """
+        failed = []
+        for start in range(0, len(object_keys), S3_DELETE_BATCH):
+            chunk = object_keys[start:start + S3_DELETE_BATCH]
+            response = self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in chunk], "Quiet": True},
+            )
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+        return failed
+
     def generate_download_url(self, *, object_key: str, original_filename: str, expires: int = 3600) -> str:
         return self.client.generate_presigned_url(
             "get_object",
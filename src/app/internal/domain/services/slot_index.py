@@ -0,0 +1,150 @@
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SLOT_INDEX_ENABLED = os.getenv("SLOT_INDEX_ENABLED", "false").lower() in ("1", "true", "yes")
+SLOT_INDEX_MAX_QUEUES = int(os.getenv("SLOT_INDEX_MAX_QUEUES", "1000"))
+# Сколько прошлого держит индекс очереди; вопросы о более раннем времени читают базу
+SLOT_INDEX_HISTORY = timedelta(hours=float(os.getenv("SLOT_INDEX_HISTORY_HOURS", "24")))
+
+
+def naive_utc(value: datetime) -> datetime:
+    # meeting_datetime хранится без часового пояса
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class QueueSlots:
+    """
+    Отсортированные времена записей одной очереди на момент версии records_version.
+    since — нижняя граница загрузки: записи не позже since в индексе могут отсутствовать.
+    """
+
+    def __init__(self, version: int, rows: Iterable[Tuple[UUID, datetime]], since: Optional[datetime] = None):
+        self.version = version
+        self.since = naive_utc(since) if since is not None else None
+        pairs = sorted((naive_utc(when), record_id) for record_id, when in rows)
+        self._times: List[datetime] = [when for when, _ in pairs]
+        self._ids: List[UUID] = [record_id for _, record_id in pairs]
+        self._by_id: Dict[UUID, datetime] = {record_id: when for when, record_id in pairs}
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def covers(self, start: datetime) -> bool:
+        # Проверки смотрят только на записи позже start (строгое неравенство, как в SQL)
+        return self.since is None or naive_utc(start) >= self.since
+
+    def collides(self, meeting_datetime: datetime, interval: timedelta, exclude: Optional[UUID] = None) -> bool:
+        # Те же границы, что и в SQL-проверке: пересечение, если |t - m| < interval
+        when = naive_utc(meeting_datetime)
+        pos = bisect_right(self._times, when - interval)
+        while pos < len(self._times) and self._times[pos] < when + interval:
+            if self._ids[pos] != exclude:
+                return True
+            pos += 1
+        return False
+
+    def nearest_free(self, after: datetime, interval: timedelta) -> datetime:
+        """
+        Самое раннее время не раньше after, не пересекающееся ни с одной записью.
+        """
+        when = naive_utc(after)
+        pos = bisect_right(self._times, when - interval)
+        while pos < len(self._times) and self._times[pos] < when + interval:
+            when = self._times[pos] + interval
+            pos += 1
+        return when
+
+    def add(self, record_id: UUID, meeting_datetime: datetime) -> None:
+        when = naive_utc(meeting_datetime)
+        pos = bisect_left(self._times, when)
+        self._times.insert(pos, when)
+        self._ids.insert(pos, record_id)
+        self._by_id[record_id] = when
+
+    def remove(self, record_id: UUID) -> None:
+        when = self._by_id.pop(record_id, None)
+        if when is None:
+            return
+        pos = bisect_left(self._times, when)
+        while self._ids[pos] != record_id:
+            pos += 1
+        del self._times[pos]
+        del self._ids[pos]
+
+
+class SlotIndex:
+    """
+    LRU индексов расписания по очередям. Индекс годен, только пока его версия совпадает
+    с queues.records_version в базе; при расхождении он перечитывается.
+    """
+
+    def __init__(self, maxsize: int = SLOT_INDEX_MAX_QUEUES):
+        self.maxsize = maxsize
+        self._queues: "OrderedDict[UUID, QueueSlots]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, queue_id: UUID, version: int) -> Optional[QueueSlots]:
+        with self._lock:
+            slots = self._queues.get(queue_id)
+            if slots is None:
+                return None
+            if slots.version != version:
+                del self._queues[queue_id]
+                return None
+            self._queues.move_to_end(queue_id)
+            return slots
+
+    def put(self, queue_id: UUID, slots: QueueSlots) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._queues[queue_id] = slots
+            self._queues.move_to_end(queue_id)
+            while len(self._queues) > self.maxsize:
+                self._queues.popitem(last=False)
+
+    def apply(
+        self,
+        queue_id: UUID,
+        version: int,
+        removed: Iterable[UUID] = (),
+        added: Iterable[Tuple[UUID, datetime]] = (),
+    ) -> None:
+        """
+        Изменения закоммиченной транзакции. Применяются, только если индекс был ровно
+        на предыдущей версии; иначе его проще перечитать при следующем обращении.
+        """
+        with self._lock:
+            slots = self._queues.get(queue_id)
+            if slots is None:
+                return
+            if slots.version != version - 1:
+                del self._queues[queue_id]
+                return
+            for record_id in removed:
+                slots.remove(record_id)
+            for record_id, when in added:
+                slots.add(record_id, when)
+            slots.version = version
+
+    def invalidate(self, queue_id: UUID) -> None:
+        with self._lock:
+            self._queues.pop(queue_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queues.clear()
+
+
+slot_index = SlotIndex()
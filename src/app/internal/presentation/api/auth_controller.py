@@ -1,23 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.database import get_db
 from src.app.internal.presentation.scheme.auth_schema import TokenResponse, RefreshIn, LoginIn
 from src.app.internal.presentation.scheme.user_schema import UserResponse, UserRegister
 
 from src.app.internal.data.repositories.auth_repository import AuthRepository
+from src.app.internal.domain.services.hashing_executor import hashing_executor, HASH_RETRY_AFTER_SECONDS
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
-def get_auth_repository(db: Session = Depends(get_db)):
+def get_auth_repository(db: AsyncSession = Depends(get_db)):
     return AuthRepository(db)
 
 
-@router.post("/token", response_model=TokenResponse)
+def require_hashing_capacity():
+    # Быстрый отказ, пока очередь bcrypt переполнена, вместо ожидания в ней
+    if hashing_executor.is_overloaded():
+        hashing_executor.reject()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, retry later",
+            headers={"Retry-After": str(HASH_RETRY_AFTER_SECONDS)},
+        )
+
+
+@router.post("/token", response_model=TokenResponse, dependencies=[Depends(require_hashing_capacity)])
 async def token(
     login_in: LoginIn,
     auth_repo: AuthRepository = Depends(get_auth_repository)
@@ -31,7 +43,7 @@ async def token(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
-@router.post("/refresh", response_model=TokenResponse)
+@router.post("/refresh", response_model=TokenResponse, dependencies=[Depends(require_hashing_capacity)])
 async def refresh(
     data: RefreshIn,
     auth_repo: AuthRepository = Depends(get_auth_repository)
@@ -87,7 +99,12 @@ async def read_own_profile(current_user = Depends(get_current_user)):
     return current_user
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_hashing_capacity)],
+)
 async def register_user(
     user_in: UserRegister,
     auth_repo: AuthRepository = Depends(get_auth_repository)
@@ -1,5 +1,9 @@
-from fastapi import Depends
-from sqlalchemy.orm import Session
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.config.database import get_db
 
 from src.app.internal.data.repositories.comment_repository import CommentRepository
@@ -7,21 +11,75 @@ from src.app.internal.data.repositories.queue_repository import QueueRepository
 from src.app.internal.data.repositories.record_repository import RecordRepository
 from src.app.internal.domain.services.s3_service import S3StorageService
 from src.app.internal.data.repositories.attachment_repository import AttachmentRepository
+from src.app.internal.data.unit_of_work import UnitOfWork
+from src.app.internal.data.pagination import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from src.app.internal.data.models.record_model import Status, UrgencyLevel
+from src.app.internal.domain.entities.record_entity import RecordFilter
 
 
-def get_comment_repository(db: Session = Depends(get_db)):
+def get_comment_repository(db: AsyncSession = Depends(get_db)):
     return CommentRepository(db)
 
 
-def get_queue_repository(db: Session = Depends(get_db)):
+def get_queue_repository(db: AsyncSession = Depends(get_db)):
     return QueueRepository(db)
 
 
-def get_record_repository(db: Session = Depends(get_db)):
+def get_record_repository(db: AsyncSession = Depends(get_db)):
     return RecordRepository(db)
 
+
+def get_unit_of_work(db: AsyncSession = Depends(get_db)) -> UnitOfWork:
+    return UnitOfWork(db)
+
+
+@dataclass
+class PageParams:
+    limit: int
+    cursor: Optional[str]
+
+
+def get_page_params(
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+) -> PageParams:
+    return PageParams(limit=limit, cursor=cursor)
+
+
+@dataclass
+class TimeWindow:
+    since: Optional[datetime]
+    until: Optional[datetime]
+
+
+def get_time_window(
+    since: Optional[datetime] = Query(None, alias="from", description="Only meetings at or after this time"),
+    until: Optional[datetime] = Query(None, alias="to", description="Only meetings before this time"),
+) -> TimeWindow:
+    return TimeWindow(since=since, until=until)
+
+
+def get_record_filter(
+    window: TimeWindow = Depends(get_time_window),
+    statuses: Optional[List[Status]] = Query(None, alias="status", description="Repeat to match several statuses"),
+    urgency_levels: Optional[List[UrgencyLevel]] = Query(
+        None, alias="urgency", description="Repeat to match several urgency levels"
+    ),
+    sort: str = Query(
+        "meeting_datetime", pattern="^-?meeting_datetime$", description="-meeting_datetime for latest first"
+    ),
+) -> RecordFilter:
+    return RecordFilter(
+        statuses=statuses or (),
+        urgency_levels=urgency_levels or (),
+        since=window.since,
+        until=window.until,
+        descending=sort.startswith("-"),
+    )
+
+
 def get_attachment_repository(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> AttachmentRepository:
     return AttachmentRepository(
         db=db,
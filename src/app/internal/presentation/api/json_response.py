@@ -0,0 +1,25 @@
+from functools import lru_cache
+from typing import Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from src.app.internal.data.pagination import Page
+
+
+@lru_cache(maxsize=None)
+def _page_adapter(entity_cls: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(Page[entity_cls])
+
+
+def page_response(page: Page, entity_cls: Type[BaseModel], response_cls: Type[BaseModel]) -> Response:
+    """
+    Страница сущностей сразу сериализуется в JSON, минуя повторную валидацию через
+    response_model. В ответ попадают только поля response_cls; response_model у маршрута
+    остаётся для схемы OpenAPI.
+    """
+    body = _page_adapter(entity_cls).dump_json(
+        page,
+        include={"items": {"__all__": set(response_cls.model_fields)}, "next_cursor": True},
+    )
+    return Response(content=body, media_type="application/json")
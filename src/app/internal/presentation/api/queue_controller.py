@@ -1,24 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List
+from datetime import datetime
 
 from src.config.database import get_db
 from src.app.internal.data.repositories.queue_repository import QueueRepository
+from src.app.internal.data.repositories.record_repository import RecordRepository
+from src.app.internal.domain.services.availability import GetQueueAvailabilityUseCase
 from src.app.internal.domain.entities.queue_entity import QueueEntity
 from src.app.internal.presentation.scheme.queue_schema import (
-    QueueCreate, QueueUpdate, QueueResponse
+    QueueCreate, QueueUpdate, QueueResponse, QueueAvailabilityResponse, QueueStatsResponse
 )
 from src.app.internal.presentation.api.auth_controller import get_current_user
+from src.app.internal.presentation.api.record_controller import get_owned_queue
+from src.app.internal.presentation.scheme.record_schema import RecordResponse
 from src.app.internal.domain.entities.user_entity import UserEntity
+from src.app.internal.presentation.api.dependencies import get_page_params, PageParams
+from src.app.internal.presentation.scheme.page_schema import PageResponse
+from src.app.internal.presentation.api.json_response import page_response
+from src.app.internal.data.pagination import InvalidCursorError
 
 router = APIRouter(prefix="/queues", tags=["queues"])
 
 
-def get_queue_repository(db: Session = Depends(get_db)) -> QueueRepository:
+def get_queue_repository(db: AsyncSession = Depends(get_db)) -> QueueRepository:
     return QueueRepository(db)
 
 
+def get_record_repository(db: AsyncSession = Depends(get_db)) -> RecordRepository:
+    return RecordRepository(db)
+
+
 @router.post("/", response_model=QueueResponse, status_code=status.HTTP_201_CREATED)
 async def create_queue(
         queue_create: QueueCreate,
@@ -41,7 +53,8 @@ async def create_queue(
         name=queue_create.name,
         owner_id=current_user.uuid,
         cleanup_interval=queue_create.cleanup_interval,
-        record_interval=queue_create.record_interval
+        record_interval=queue_create.record_interval,
+        comments_limit=queue_create.comments_limit,
     )
 
     # Сохранение в базу
@@ -50,14 +63,20 @@ async def create_queue(
     return created_queue
 
 
-@router.get("/", response_model=List[QueueResponse])
+@router.get("/", response_model=PageResponse[QueueResponse])
 async def get_all_queues(
+        page: PageParams = Depends(get_page_params),
         queue_repo: QueueRepository = Depends(get_queue_repository)):
     """
-    Получение списка всех очередей.
+    Получение списка всех очередей (постранично, по имени).
     Доступно всем аутентифицированным пользователям.
     """
-    return await queue_repo.get_all_queues()
+    try:
+        queues = await queue_repo.get_all_queues_page(page.limit, page.cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return page_response(queues, QueueEntity, QueueResponse)
 
 
 @router.get("/{queue_id}", response_model=QueueResponse)
@@ -77,25 +96,157 @@ async def get_queue(
     return queue
 
 
-@router.get("/owner/me", response_model=List[QueueResponse])
+@router.get("/{queue_id}/availability", response_model=QueueAvailabilityResponse)
+async def get_queue_availability(
+        queue_id: UUID,
+        from_: datetime = Query(..., alias="from"),
+        to: datetime = Query(...),
+        queue_repo: QueueRepository = Depends(get_queue_repository),
+        record_repo: RecordRepository = Depends(get_record_repository)):
+    """
+    Свободные слоты очереди в интервале [from, to).
+    Сетка слотов начинается с полуночи каждого дня с шагом record_interval очереди.
+    """
+    use_case = GetQueueAvailabilityUseCase(queue_repo=queue_repo, record_repo=record_repo)
+
+    try:
+        return await use_case.execute(queue_id, from_, to)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{queue_id}/stats", response_model=QueueStatsResponse)
+async def get_queue_stats(
+        queue_id: UUID,
+        days: int = Query(14, ge=1, le=90, description="Days of upcoming load, starting today (UTC)"),
+        current_user: UserEntity = Depends(get_current_user),
+        queue_repo: QueueRepository = Depends(get_queue_repository)):
+    """
+    Число записей очереди по статусам и срочности и нагрузка по дням на ближайшие days дней.
+    Счётчики ведутся инкрементально, чтение не зависит от размера очереди.
+    Доступно только владельцу очереди.
+    """
+    queue = await queue_repo.get_queue(queue_id)
+    if queue is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Queue not found"
+        )
+
+    if queue.owner_id != current_user.uuid:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to view statistics of this queue"
+        )
+
+    return await queue_repo.get_queue_stats(queue_id, datetime.utcnow().date(), days)
+
+
+@router.get(
+    "/{queue_id}/next",
+    response_model=RecordResponse,
+    responses={status.HTTP_204_NO_CONTENT: {"description": "No unclaimed pending or confirmed records"}},
+)
+async def get_next_record(
+        queue_id: UUID,
+        current_user: UserEntity = Depends(get_current_user),
+        queue_repo: QueueRepository = Depends(get_queue_repository),
+        record_repo: RecordRepository = Depends(get_record_repository)):
+    """
+    Следующая незанятая запись очереди: самая срочная среди PENDING и CONFIRMED,
+    при равной срочности — с самым ранним временем встречи. Запись не захватывается.
+    Доступно только владельцу очереди.
+    """
+    await get_owned_queue(queue_id, current_user, queue_repo, "manage")
+    record = await record_repo.get_next_record(queue_id)
+    if record is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return record
+
+
+@router.post(
+    "/{queue_id}/next/claim",
+    response_model=RecordResponse,
+    responses={status.HTTP_204_NO_CONTENT: {"description": "No unclaimed pending or confirmed records"}},
+)
+async def claim_next_record(
+        queue_id: UUID,
+        current_user: UserEntity = Depends(get_current_user),
+        queue_repo: QueueRepository = Depends(get_queue_repository),
+        record_repo: RecordRepository = Depends(get_record_repository)):
+    """
+    Захват следующей записи очереди текущим пользователем (claimed_by, claimed_at).
+    Несколько менеджеров могут разбирать одну очередь параллельно: каждый получает свою запись.
+    Доступно только владельцу очереди.
+    """
+    await get_owned_queue(queue_id, current_user, queue_repo, "manage")
+    record = await record_repo.claim_next_record(queue_id, current_user.uuid)
+    if record is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return record
+
+
+@router.delete("/{queue_id}/claims/{record_id}", response_model=RecordResponse)
+async def release_record_claim(
+        queue_id: UUID,
+        record_id: UUID,
+        current_user: UserEntity = Depends(get_current_user),
+        queue_repo: QueueRepository = Depends(get_queue_repository),
+        record_repo: RecordRepository = Depends(get_record_repository)):
+    """
+    Снятие захвата: запись снова доступна через next.
+    Доступно только владельцу очереди; он может снять любой захват в своей очереди.
+    """
+    await get_owned_queue(queue_id, current_user, queue_repo, "manage")
+    record = await record_repo.release_record_claim(queue_id, record_id)
+    if record is not None:
+        return record
+
+    existing = await record_repo.get_record(record_id)
+    if existing is None or existing.queue_id != queue_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Record not found"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Record is not claimed"
+    )
+
+
+@router.get("/owner/me", response_model=PageResponse[QueueResponse])
 async def get_my_queues(
+        page: PageParams = Depends(get_page_params),
         current_user: UserEntity = Depends(get_current_user),
         queue_repo: QueueRepository = Depends(get_queue_repository)):
     """
-    Получение списка очередей текущего пользователя.
+    Получение списка очередей текущего пользователя (постранично).
     """
-    return await queue_repo.get_queues_by_owner(current_user.uuid)
+    try:
+        queues = await queue_repo.get_queues_by_owner_page(current_user.uuid, page.limit, page.cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return page_response(queues, QueueEntity, QueueResponse)
 
 
-@router.get("/owner/{owner_id}", response_model=List[QueueResponse])
+@router.get("/owner/{owner_id}", response_model=PageResponse[QueueResponse])
 async def get_queues_by_owner(
         owner_id: UUID,
+        page: PageParams = Depends(get_page_params),
         queue_repo: QueueRepository = Depends(get_queue_repository)):
     """
-    Получение списка очередей конкретного пользователя.
+    Получение списка очередей конкретного пользователя (постранично).
     Доступно всем аутентифицированным пользователям.
     """
-    return await queue_repo.get_queues_by_owner(owner_id)
+    try:
+        queues = await queue_repo.get_queues_by_owner_page(owner_id, page.limit, page.cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return page_response(queues, QueueEntity, QueueResponse)
 
 
 @router.patch("/{queue_id}", response_model=QueueResponse)
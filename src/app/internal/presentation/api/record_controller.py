@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 from src.config.database import get_db
 from src.app.internal.data.repositories.record_repository import RecordRepository
@@ -10,70 +11,178 @@ from src.app.internal.presentation.scheme.record_schema import (
     RecordCreate,
     RecordUpdate,
     RecordResponse,
+    RecordBulkCreate,
+    RecordBulkItemResult,
 )
 from src.app.internal.presentation.api.auth_controller import get_current_user
 from src.app.internal.domain.entities.user_entity import UserEntity
-from src.app.internal.domain.entities.record_entity import RecordEntity
+from src.app.internal.domain.entities.record_entity import RecordEntity, RecordFilter
+from src.app.internal.data.unit_of_work import UnitOfWork
+from src.app.internal.domain.services.bulk_book_records import BulkBookRecordsUseCase
+from src.app.internal.domain.services.book_record import BookRecordUseCase, SlotTakenError
+from src.app.internal.presentation.api.dependencies import (
+    get_unit_of_work, get_page_params, get_record_filter, get_time_window, PageParams, TimeWindow
+)
+from src.app.internal.presentation.scheme.page_schema import PageResponse
+from src.app.internal.presentation.api.json_response import page_response
+from src.app.internal.data.pagination import InvalidCursorError
+from src.app.internal.presentation.api.record_export import ENCODERS, MEDIA_TYPES
 
 router = APIRouter(prefix="/records", tags=["records"])
 
 
-def get_record_repository(db: Session = Depends(get_db)) -> RecordRepository:
+def get_record_repository(db: AsyncSession = Depends(get_db)) -> RecordRepository:
     return RecordRepository(db)
 
 
-def get_queue_repository(db: Session = Depends(get_db)) -> QueueRepository:
+def get_queue_repository(db: AsyncSession = Depends(get_db)) -> QueueRepository:
     return QueueRepository(db)
 
+async def get_owned_queue(queue_id: UUID, current_user: UserEntity, queue_repo: QueueRepository, action: str):
+    # Операции над всеми записями очереди доступны только её владельцу
+    queue = await queue_repo.get_queue(queue_id)
+    if not queue:
+        raise HTTPException(status_code=404, detail="Queue not found")
+
+    if queue.owner_id != current_user.uuid:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"You don't have permission to {action} this queue"
+        )
+    return queue
+
 @router.post("/", response_model=RecordResponse, status_code=status.HTTP_201_CREATED)
 async def create_record(
     record_create: RecordCreate,
     current_user: UserEntity = Depends(get_current_user),
     record_repo: RecordRepository = Depends(get_record_repository),
     queue_repo: QueueRepository = Depends(get_queue_repository),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ):
-    queue = await queue_repo.get_queue(record_create.queue_id)
-    if not queue:
-        raise HTTPException(status_code=404, detail="Queue not found")
-
-    has_collision = await record_repo.has_time_collision(
-        queue_id=queue.queue_id,
-        meeting_datetime=record_create.meeting_datetime,
-        interval=queue.record_interval,
+    use_case = BookRecordUseCase(
+        record_repo=record_repo,
+        queue_repo=queue_repo,
+        uow=uow,
     )
 
-    if has_collision:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Record time collides with another record"
+    try:
+        return await use_case.execute(
+            user_id=current_user.uuid,  # ✅ from token
+            queue_id=record_create.queue_id,
+            purpose=record_create.purpose,
+            meeting_datetime=record_create.meeting_datetime,
+            urgency_level=record_create.urgency_level,
         )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except SlotTakenError as e:
+        headers = {"X-Next-Free-Slot": e.next_free.isoformat()} if e.next_free else None
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e), headers=headers)
 
 
-    record_entity = RecordEntity(
-        user_id=current_user.uuid,  # ✅ from token
-        queue_id=record_create.queue_id,
-        purpose=record_create.purpose,
-        meeting_datetime=record_create.meeting_datetime,
-        urgency_level=record_create.urgency_level,
+@router.post("/bulk", response_model=List[RecordBulkItemResult], status_code=status.HTTP_200_OK)
+async def create_records_bulk(
+    data: RecordBulkCreate,
+    current_user: UserEntity = Depends(get_current_user),
+    record_repo: RecordRepository = Depends(get_record_repository),
+    queue_repo: QueueRepository = Depends(get_queue_repository),
+    uow: UnitOfWork = Depends(get_unit_of_work),
+):
+    """
+    Пакетная запись на несколько слотов (например, импорт расписания на день).
+    Пересечения проверяются одним запросом к базе и внутри самого пакета,
+    все принятые записи вставляются одним запросом.
+    Для каждого элемента возвращается результат в том же порядке: created, collision или queue_not_found.
+    """
+    use_case = BulkBookRecordsUseCase(
+        record_repo=record_repo,
+        queue_repo=queue_repo,
+        uow=uow,
     )
-
-    return await record_repo.create_record(record_entity)
+    return await use_case.execute(user_id=current_user.uuid, items=data.items)
 
 
-@router.get("/queue/{queue_id}", response_model=List[RecordResponse])
+@router.get("/queue/{queue_id}", response_model=PageResponse[RecordResponse])
 async def get_records_by_queue(
     queue_id: UUID,
+    page: PageParams = Depends(get_page_params),
+    filters: RecordFilter = Depends(get_record_filter),
     record_repo: RecordRepository = Depends(get_record_repository),
 ):
-    return await record_repo.get_records_by_queue(queue_id)
+    try:
+        records = await record_repo.get_records_by_queue_page(queue_id, page.limit, page.cursor, filters)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return page_response(records, RecordEntity, RecordResponse)
 
 
-@router.get("/me", response_model=List[RecordResponse])
+@router.get("/queue/{queue_id}/export")
+async def export_records_by_queue(
+    queue_id: UUID,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    current_user: UserEntity = Depends(get_current_user),
+    record_repo: RecordRepository = Depends(get_record_repository),
+    queue_repo: QueueRepository = Depends(get_queue_repository),
+):
+    """
+    Выгрузка всех записей очереди в NDJSON или CSV для отчётов.
+    Строки читаются серверным курсором пачками и сразу пишутся в ответ.
+    Доступно только владельцу очереди.
+    """
+    await get_owned_queue(queue_id, current_user, queue_repo, "export")
+
+    body = ENCODERS[export_format](record_repo.stream_records_by_queue(queue_id))
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="records-{queue_id}.{export_format}"'},
+    )
+
+
+@router.get("/me", response_model=PageResponse[RecordResponse])
 async def get_my_records(
+    page: PageParams = Depends(get_page_params),
+    filters: RecordFilter = Depends(get_record_filter),
     current_user: UserEntity = Depends(get_current_user),
     record_repo: RecordRepository = Depends(get_record_repository),
 ):
-    return await record_repo.get_records_by_user(current_user.uuid)
+    try:
+        records = await record_repo.get_records_by_user_page(current_user.uuid, page.limit, page.cursor, filters)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return page_response(records, RecordEntity, RecordResponse)
+
+
+@router.get("/search", response_model=PageResponse[RecordResponse])
+async def search_records(
+    q: str = Query(..., min_length=1, max_length=200, description="Search words, \"phrases\", or, -excluded"),
+    queue_id: Optional[UUID] = Query(None),
+    page: PageParams = Depends(get_page_params),
+    window: TimeWindow = Depends(get_time_window),
+    current_user: UserEntity = Depends(get_current_user),
+    record_repo: RecordRepository = Depends(get_record_repository),
+    queue_repo: QueueRepository = Depends(get_queue_repository),
+):
+    """
+    Поиск записей по цели встречи и комментарию менеджера, самые релевантные первыми.
+    С queue_id ищет по всем записям очереди (только владельцу), без него — по своим записям.
+    """
+    if queue_id is not None:
+        await get_owned_queue(queue_id, current_user, queue_repo, "search")
+        scope = {"queue_id": queue_id}
+    else:
+        scope = {"user_id": current_user.uuid}
+
+    try:
+        records = await record_repo.search_records(
+            q, page.limit, page.cursor, since=window.since, until=window.until, **scope
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return page_response(records, RecordEntity, RecordResponse)
 
 
 @router.patch("/{record_id}", response_model=RecordResponse)
@@ -83,6 +192,7 @@ async def update_record(
     current_user: UserEntity = Depends(get_current_user),
     record_repo: RecordRepository = Depends(get_record_repository),
     queue_repo: QueueRepository = Depends(get_queue_repository),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ):
     record = await record_repo.get_record(record_id)
     if not record:
@@ -102,7 +212,28 @@ async def update_record(
         )
 
     update_data = record_update.dict(exclude_unset=True)
-    updated = await record_repo.update_record_partial(record_id, update_data)
+
+    async with uow:
+        new_time = update_data.get("meeting_datetime")
+        if new_time is not None and new_time != record.meeting_datetime:
+            # Перенос встречи проверяется так же, как новая запись: под блокировкой очереди
+            await record_repo.lock_queue_slots([queue.queue_id])
+            has_collision = await record_repo.has_time_collision(
+                queue_id=queue.queue_id,
+                meeting_datetime=new_time,
+                interval=queue.record_interval,
+                exclude_record_id=record_id,
+            )
+            if has_collision:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Record time collides with another record"
+                )
+
+        # Время встречи уже известно: UPDATE обращается к одной секции records
+        updated = await record_repo.update_record_partial(record_id, update_data, record.meeting_datetime)
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Record not found")
 
     return updated
 
@@ -131,7 +262,7 @@ async def delete_record(
             detail="You don't have permission to delete this record"
         )
 
-    success = await record_repo.delete_record(record_id)
+    success = await record_repo.delete_record(record_id, record.meeting_datetime)
     if not success:
         raise HTTPException(status_code=404, detail="Record not found")
 
@@ -0,0 +1,54 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+from uuid import UUID
+
+from src.app.internal.domain.entities.record_entity import RecordEntity
+
+EXPORT_FIELDS = tuple(RecordEntity.model_fields)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+async def encode_ndjson(batches: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        # Одна пачка — один кусок ответа
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row))), ensure_ascii=False) + "\n"
+            for row in batch
+        ).encode()
+
+
+async def encode_csv(batches: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue().encode()
+
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_plain(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+
+
+ENCODERS = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+}
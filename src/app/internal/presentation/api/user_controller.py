@@ -1,18 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List
 from src.config.database import get_db
 from src.app.internal.data.repositories.user_repository import UserRepository
+from src.app.internal.domain.entities.user_entity import UserEntity
 from src.app.internal.presentation.scheme.user_schema import (
     UserCreate, UserUpdate, UserResponse,
     UserEmailUpdate, UserTelegramUpdate
 )
+from src.app.internal.presentation.api.dependencies import get_page_params, PageParams
+from src.app.internal.presentation.scheme.page_schema import PageResponse
+from src.app.internal.presentation.api.json_response import page_response
+from src.app.internal.data.pagination import InvalidCursorError
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-def get_user_repository(db: Session = Depends(get_db)):
+def get_user_repository(db: AsyncSession = Depends(get_db)):
     return UserRepository(db)
 
 
@@ -30,9 +34,17 @@ async def get_user(
     return user
 
 
-@router.get("/", response_model=List[UserResponse])
-async def get_all_users(user_repo: UserRepository = Depends(get_user_repository)):
-    return await user_repo.get_all_users()
+@router.get("/", response_model=PageResponse[UserResponse])
+async def get_all_users(
+        page: PageParams = Depends(get_page_params),
+        user_repo: UserRepository = Depends(get_user_repository)
+):
+    try:
+        users = await user_repo.get_all_users_page(page.limit, page.cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return page_response(users, UserEntity, UserResponse)
 
 
 @router.get("/by-login/{login}", response_model=UserResponse)
@@ -0,0 +1,23 @@
+import time
+
+from fastapi import Request
+
+from src.config.sql_stats import SQL_STATS_ENABLED, SQL_STATS_HEADERS, debug_headers, report_request, track_sql
+
+
+async def sql_stats_middleware(request: Request, call_next):
+    if not SQL_STATS_ENABLED:
+        return await call_next(request)
+
+    with track_sql() as stats:
+        start = time.perf_counter()
+        response = await call_next(request)
+        elapsed = time.perf_counter() - start
+
+    # Шаблон пути (/records/{record_id}), а не сам URL — чтобы не плодить метки метрик
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    report_request(stats, request.method, route, response.status_code, elapsed)
+
+    if SQL_STATS_HEADERS:
+        response.headers.update(debug_headers(stats))
+    return response
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PageResponse(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -1,18 +1,22 @@
 from pydantic import BaseModel, Field
 from uuid import UUID
-from datetime import timedelta
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.app.internal.data.models.record_model import Status, UrgencyLevel
 
 
 class QueueCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=50, description="Unique queue name")
     cleanup_interval: timedelta = Field(default=timedelta(days=1), description="Cleanup interval")
     record_interval: timedelta = Field(default=timedelta(minutes=30), description="Record interval")
+    comments_limit: int = Field(default=5, ge=1, le=100, description="Number of recent owner comments kept")
 
 class QueueUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=50, description="Unique queue name")
     cleanup_interval: Optional[timedelta] = Field(None, description="Cleanup interval")
     record_interval: Optional[timedelta] = Field(None, description="Record interval")
+    comments_limit: Optional[int] = Field(None, ge=1, le=100, description="Number of recent owner comments kept")
 
 class QueueResponse(BaseModel):
     queue_id: UUID
@@ -20,3 +24,26 @@ class QueueResponse(BaseModel):
     owner_id: UUID
     cleanup_interval: timedelta
     record_interval: timedelta
+    comments_limit: int
+
+
+class QueueAvailabilityResponse(BaseModel):
+    queue_id: UUID
+    record_interval: timedelta
+    slots: List[datetime] = Field(..., description="Free slot start times within [from, to)")
+
+
+class DailyLoadResponse(BaseModel):
+    day: date
+    records: int
+
+
+class QueueStatsResponse(BaseModel):
+    queue_id: UUID
+    total: int
+    by_status: Dict[Status, int]
+    by_urgency: Dict[UrgencyLevel, int]
+    upcoming: List[DailyLoadResponse] = Field(..., description="Pending and confirmed records per day")
+
+    class Config:
+        from_attributes = True
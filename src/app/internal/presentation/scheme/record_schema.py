@@ -1,9 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
+import os
 from src.app.internal.data.models.record_model import UrgencyLevel, Status
 
+RECORDS_BULK_MAX_ITEMS = int(os.getenv("RECORDS_BULK_MAX_ITEMS", "500"))
+
 
 class RecordCreate(BaseModel):
     queue_id: UUID
@@ -29,6 +32,22 @@ class RecordResponse(BaseModel):
     urgency_level: UrgencyLevel
     status: Status
     manager_comment: Optional[str]
+    claimed_by: Optional[UUID] = None
+    claimed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RecordBulkCreate(BaseModel):
+    items: List[RecordCreate] = Field(..., min_length=1, max_length=RECORDS_BULK_MAX_ITEMS)
+
+
+class RecordBulkItemResult(BaseModel):
+    index: int
+    status: Literal["created", "collision", "queue_not_found"]
+    record: Optional[RecordResponse] = None
+    detail: Optional[str] = None
 
     class Config:
         from_attributes = True
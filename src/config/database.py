@@ -1,21 +1,112 @@
+import asyncio
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from dotenv import load_dotenv
 import os
 
+from src.config.pool_metrics import instrumented_pool_class, register_pool
+from src.config.sql_stats import instrument_engine
+
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Тот же адрес, но через asyncpg: DATABASE_URL остаётся в привычном формате postgresql://
+ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+# Необязательная реплика для чтения; без неё все запросы идут в основную базу
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL") or None
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# -1 отключает пересоздание соединений по возрасту
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
 
 
+def _create_async_engine(url, name: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=instrumented_pool_class(name),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+# Синхронный движок нужен только для DDL и служебных скриптов
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = _create_async_engine(ASYNC_DATABASE_URL, "primary")
+register_pool("primary", async_engine)
+instrument_engine(async_engine)
+
+if DATABASE_REPLICA_URL:
+    replica_engine = _create_async_engine(
+        make_url(DATABASE_REPLICA_URL).set(drivername="postgresql+asyncpg"), "replica"
+    )
+    register_pool("replica", replica_engine)
+    instrument_engine(replica_engine)
+else:
+    replica_engine = async_engine
+
+USE_REPLICA = "use_replica"
+STICK_TO_PRIMARY = "stick_to_primary"
+
+
+def on_replica(stmt):
+    """
+    Помечает запрос только на чтение: он уйдёт в реплику, если в этой сессии ещё не было записи.
+    """
+    return stmt.execution_options(**{USE_REPLICA: True})
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or (clause is not None and getattr(clause, "is_dml", False)):
+            # После первой записи чтения этой сессии (запроса) идут только в основную базу
+            self.info[STICK_TO_PRIMARY] = True
+            return async_engine.sync_engine
+
+        options = getattr(clause, "get_execution_options", None)
+        if options is not None and not self.info.get(STICK_TO_PRIMARY) and options().get(USE_REPLICA):
+            return replica_engine.sync_engine
+
+        return async_engine.sync_engine
+
+
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+async def warm_up_pool(target: AsyncEngine = async_engine, connections: int = DB_POOL_SIZE) -> None:
+    # Открываем pool_size соединений сразу, чтобы первые запросы не платили за handshake
+    conns = await asyncio.gather(*(target.connect() for _ in range(connections)))
+    await asyncio.gather(*(conn.close() for conn in conns))
+
+
+async def warm_up_pools() -> None:
+    await warm_up_pool(async_engine)
+    if replica_engine is not async_engine:
+        await warm_up_pool(replica_engine)
+
+
+async def dispose_engines() -> None:
+    await async_engine.dispose()
+    if replica_engine is not async_engine:
+        await replica_engine.dispose()
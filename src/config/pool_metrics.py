@@ -0,0 +1,68 @@
+import time
+from typing import Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.config.metrics import metrics
+
+_pools: Dict[str, AsyncEngine] = {}
+
+
+def _pool_samples(read):
+    for name, engine in list(_pools.items()):
+        yield {"pool": name}, read(engine.pool)
+
+
+pool_checkout_wait_seconds = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    labels=("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+pool_checkout_timeouts_total = metrics.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    labels=("pool",),
+)
+metrics.gauge(
+    "db_pool_size", "Configured pool size", labels=("pool",),
+    callback=lambda: _pool_samples(lambda p: p.size()),
+)
+metrics.gauge(
+    "db_pool_checked_out", "Connections currently in use", labels=("pool",),
+    callback=lambda: _pool_samples(lambda p: p.checkedout()),
+)
+metrics.gauge(
+    "db_pool_checked_in", "Idle connections held by the pool", labels=("pool",),
+    callback=lambda: _pool_samples(lambda p: p.checkedin()),
+)
+metrics.gauge(
+    "db_pool_overflow", "Connections opened above pool_size", labels=("pool",),
+    # overflow() отрицателен, пока пул заполнен не до конца
+    callback=lambda: _pool_samples(lambda p: max(p.overflow(), 0)),
+)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    metrics_name = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_checkout_timeouts_total.inc(pool=self.metrics_name)
+            raise
+        finally:
+            pool_checkout_wait_seconds.observe(time.perf_counter() - start, pool=self.metrics_name)
+
+
+def instrumented_pool_class(name: str):
+    # Имя хранится в классе, а не в экземпляре: пул пересоздаётся через self.__class__
+    return type(f"InstrumentedAsyncQueuePool_{name}", (InstrumentedAsyncQueuePool,), {"metrics_name": name})
+
+
+def register_pool(name: str, engine: AsyncEngine) -> None:
+    _pools[name] = engine
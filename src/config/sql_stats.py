@@ -0,0 +1,157 @@
+import heapq
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config.metrics import metrics
+
+load_dotenv()
+
+SQL_STATS_ENABLED = os.getenv("SQL_STATS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Запросы дольше порога попадают в лог вместе со статистикой SQL
+SQL_SLOW_REQUEST_MS = float(os.getenv("SQL_SLOW_REQUEST_MS", "500"))
+# Столько одинаковых по форме запросов за один HTTP-запрос считаются подозрением на N+1
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+SQL_SLOWEST_KEPT = int(os.getenv("SQL_SLOWEST_KEPT", "3"))
+# Отдавать X-DB-* заголовки в ответах; только для отладки
+SQL_STATS_HEADERS = os.getenv("SQL_STATS_HEADERS", "false").lower() in ("1", "true", "yes")
+
+logger = logging.getLogger("sql_stats")
+
+_QUERY_START = "sql_stats_query_start"
+# Списки параметров ($1, $2, ...) сворачиваются, чтобы IN разной длины давал одну форму
+_PARAMS = re.compile(r"(\$\d+|%\(\w+\)s)(\s*,\s*(\$\d+|%\(\w+\)s))*")
+
+queries_per_request = metrics.histogram(
+    "db_queries_per_request",
+    "SQL statements issued while handling one HTTP request",
+    labels=("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+db_time_per_request_seconds = metrics.histogram(
+    "db_time_per_request_seconds",
+    "Total SQL execution time per HTTP request",
+    labels=("route",),
+)
+n_plus_one_suspects_total = metrics.counter(
+    "db_n_plus_one_suspects_total",
+    "Requests that repeated one statement shape at least SQL_N_PLUS_ONE_THRESHOLD times",
+    labels=("route",),
+)
+
+
+def statement_shape(statement: str) -> str:
+    return _PARAMS.sub("?", " ".join(statement.split()))
+
+
+@dataclass
+class RequestSqlStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    shapes: Dict[str, int] = field(default_factory=dict)
+    _slowest: List[Tuple[float, str]] = field(default_factory=list)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        shape = statement_shape(statement)
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+        if len(self._slowest) < SQL_SLOWEST_KEPT:
+            heapq.heappush(self._slowest, (seconds, shape))
+        elif self._slowest and seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, shape))
+
+    def slowest(self) -> List[Tuple[float, str]]:
+        return sorted(self._slowest, reverse=True)
+
+    def n_plus_one_suspects(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        return sorted(
+            ((shape, count) for shape, count in self.shapes.items() if count >= threshold),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+
+_current: ContextVar[Optional[RequestSqlStats]] = ContextVar("request_sql_stats", default=None)
+
+
+@contextmanager
+def track_sql() -> Iterator[RequestSqlStats]:
+    """
+    Собирает статистику всех SQL-запросов, выполненных в текущем контексте (HTTP-запросе).
+    Контекст переходит в greenlet'ы SQLAlchemy, поэтому события движка видят тот же объект.
+    """
+    stats = RequestSqlStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_QUERY_START, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_QUERY_START)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute не вызывается для упавшего запроса
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_QUERY_START):
+        conn.info[_QUERY_START].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    if not SQL_STATS_ENABLED:
+        return
+    target = engine.sync_engine
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target, "handle_error", _handle_error)
+
+
+def report_request(stats: RequestSqlStats, method: str, route: str, status_code: int, elapsed: float) -> None:
+    queries_per_request.observe(stats.count, route=route)
+    db_time_per_request_seconds.observe(stats.total_seconds, route=route)
+
+    suspects = stats.n_plus_one_suspects()
+    if suspects:
+        n_plus_one_suspects_total.inc(route=route)
+
+    if elapsed * 1000 < SQL_SLOW_REQUEST_MS and not suspects:
+        return
+
+    lines = [
+        f"{method} {route} -> {status_code} in {elapsed * 1000:.1f} ms: "
+        f"{stats.count} queries, {stats.total_seconds * 1000:.1f} ms in db"
+    ]
+    lines.extend(f"  slow {seconds * 1000:.1f} ms: {shape}" for seconds, shape in stats.slowest())
+    lines.extend(f"  n+1 suspect x{count}: {shape}" for shape, count in suspects)
+    logger.warning("\n".join(lines))
+
+
+def debug_headers(stats: RequestSqlStats) -> Dict[str, str]:
+    return {
+        "X-DB-Query-Count": str(stats.count),
+        "X-DB-Time-Ms": f"{stats.total_seconds * 1000:.1f}",
+        "X-DB-N-Plus-One-Suspects": str(len(stats.n_plus_one_suspects())),
+    }
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from src.app.internal.domain.services import availability
+from src.app.internal.domain.services.availability import (
+    AvailabilityCache, GetQueueAvailabilityUseCase, days_touched, free_slots_for_day,
+)
+
+DAY = date(2026, 3, 2)
+SIX_HOURS = timedelta(hours=6)
+
+
+def at(hour: int, minute: int = 0, day: date = DAY) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute)
+
+
+def test_free_slots_of_empty_day_cover_the_grid():
+    assert free_slots_for_day(DAY, SIX_HOURS, []) == [at(0), at(6), at(12), at(18)]
+
+
+def test_records_block_slots_closer_than_interval():
+    # 09:00 блокирует 06:00 и 12:00; 23:00 предыдущего дня — полночь
+    times = [at(23, day=DAY - timedelta(days=1)), at(9)]
+    assert free_slots_for_day(DAY, SIX_HOURS, times) == [at(18)]
+
+
+def test_record_exactly_one_interval_away_does_not_block():
+    assert free_slots_for_day(DAY, SIX_HOURS, [at(6)]) == [at(0), at(12), at(18)]
+
+
+def test_days_touched_include_neighbours_within_interval():
+    assert list(days_touched(at(1), SIX_HOURS)) == [DAY - timedelta(days=1), DAY]
+    assert list(days_touched(at(12), SIX_HOURS)) == [DAY]
+
+
+def test_apply_drops_only_touched_days():
+    queue_id = uuid4()
+    cache = AvailabilityCache(maxsize=10)
+    cache.sync_version(queue_id, 1)
+    other_day = DAY + timedelta(days=5)
+    cache.put(queue_id, 1, DAY, SIX_HOURS, [at(0)])
+    cache.put(queue_id, 1, other_day, SIX_HOURS, [at(0, day=other_day)])
+
+    cache.apply(queue_id, 2, [at(12)])
+    assert cache.get(queue_id, DAY, SIX_HOURS) is None
+    assert cache.get(queue_id, other_day, SIX_HOURS) == [at(0, day=other_day)]
+
+
+def test_apply_after_missed_version_drops_queue():
+    queue_id = uuid4()
+    cache = AvailabilityCache(maxsize=10)
+    cache.sync_version(queue_id, 1)
+    cache.put(queue_id, 1, DAY, SIX_HOURS, [at(0)])
+
+    cache.apply(queue_id, 3, [])
+    assert cache.get(queue_id, DAY, SIX_HOURS) is None
+    # Без известной версии новые значения не кэшируются до sync_version
+    cache.put(queue_id, 3, DAY, SIX_HOURS, [at(0)])
+    assert cache.get(queue_id, DAY, SIX_HOURS) is None
+
+
+def test_changed_interval_misses():
+    queue_id = uuid4()
+    cache = AvailabilityCache(maxsize=10)
+    cache.sync_version(queue_id, 1)
+    cache.put(queue_id, 1, DAY, SIX_HOURS, [at(0)])
+    assert cache.get(queue_id, DAY, timedelta(hours=1)) is None
+
+
+class FakeRecordRepository:
+    def __init__(self, times):
+        self.times = times
+        self.reads = 0
+
+    async def get_records_version(self, queue_id):
+        return 1
+
+    async def get_meeting_times_between(self, queue_id, start, end):
+        self.reads += 1
+        return [when for when in self.times if start <= when < end]
+
+
+class FakeQueueRepository:
+    def __init__(self, queue):
+        self.queue = queue
+
+    async def get_queue(self, queue_id):
+        return self.queue
+
+
+def test_use_case_reads_missing_days_once_and_then_hits_cache(monkeypatch):
+    monkeypatch.setattr(availability, "availability_cache", AvailabilityCache(maxsize=10))
+    queue = SimpleNamespace(queue_id=uuid4(), record_interval=SIX_HOURS)
+    records = FakeRecordRepository([at(9)])
+    use_case = GetQueueAvailabilityUseCase(FakeQueueRepository(queue), records)
+
+    first = asyncio.run(use_case.execute(queue.queue_id, at(0), at(0) + timedelta(days=2)))
+    second = asyncio.run(use_case.execute(queue.queue_id, at(0), at(0) + timedelta(days=2)))
+
+    next_day = DAY + timedelta(days=1)
+    assert first.slots == [at(0), at(18), at(0, day=next_day), at(6, day=next_day), at(12, day=next_day),
+                           at(18, day=next_day)]
+    assert second.slots == first.slots
+    assert records.reads == 1
+
+
+def test_use_case_rejects_inverted_range():
+    use_case = GetQueueAvailabilityUseCase(FakeQueueRepository(None), FakeRecordRepository([]))
+    with pytest.raises(ValueError):
+        asyncio.run(use_case.execute(uuid4(), at(12), at(0)))
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.app.internal.data.models.record_model import UrgencyLevel
+from src.app.internal.domain.services.bulk_book_records import (
+    COLLISION, CREATED, QUEUE_NOT_FOUND, BulkBookRecordsUseCase, _collides,
+)
+
+HALF_HOUR = timedelta(minutes=30)
+NINE = datetime(2026, 3, 2, 9, 0)
+
+
+class FakeUnitOfWork:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeQueueRepository:
+    def __init__(self, queues):
+        self.queues = queues
+
+    async def get_queues_by_ids(self, queue_ids):
+        return {queue_id: self.queues[queue_id] for queue_id in set(queue_ids) if queue_id in self.queues}
+
+
+class FakeRecordRepository:
+    def __init__(self, taken=()):
+        self.taken = list(taken)
+        self.locked = []
+        self.created = []
+
+    async def lock_queue_slots(self, queue_ids):
+        self.locked.extend(queue_ids)
+
+    async def find_time_collisions(self, candidates):
+        return {
+            position for position, (queue_id, when, interval) in enumerate(candidates)
+            if any(q == queue_id and abs(t - when) < interval for q, t in self.taken)
+        }
+
+    async def create_records(self, records):
+        self.created.extend(records)
+        return [record.model_copy(update={"record_id": uuid4()}) for record in records]
+
+
+def item(queue_id, when):
+    return SimpleNamespace(queue_id=queue_id, meeting_datetime=when, purpose="bulk", urgency_level=UrgencyLevel.MEDIUM)
+
+
+def test_collides_checks_both_neighbours():
+    times = [NINE, NINE + 2 * HALF_HOUR]
+    assert _collides(times, NINE + timedelta(minutes=20), HALF_HOUR)
+    assert _collides(times, NINE + timedelta(minutes=40), HALF_HOUR)
+    assert not _collides(times, NINE + HALF_HOUR, HALF_HOUR)
+    assert not _collides(None, NINE, HALF_HOUR)
+
+
+def test_results_follow_input_order_and_earlier_items_win():
+    queue_id, missing = uuid4(), uuid4()
+    queues = {queue_id: SimpleNamespace(record_interval=HALF_HOUR)}
+    records = FakeRecordRepository(taken=[(queue_id, NINE)])
+    use_case = BulkBookRecordsUseCase(records, FakeQueueRepository(queues), FakeUnitOfWork())
+
+    results = asyncio.run(use_case.execute(user_id=uuid4(), items=[
+        item(queue_id, NINE + timedelta(minutes=10)),  # пересекается с записью в базе
+        item(queue_id, NINE + HALF_HOUR),
+        item(queue_id, NINE + timedelta(minutes=50)),  # пересекается с предыдущим элементом пакета
+        item(missing, NINE),
+        item(queue_id, NINE + 2 * HALF_HOUR),
+    ]))
+
+    assert [result.status for result in results] == [COLLISION, CREATED, COLLISION, QUEUE_NOT_FOUND, CREATED]
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert len(records.created) == 2
+    assert results[1].record.meeting_datetime == NINE + HALF_HOUR
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.app.internal.domain.services.hashing_executor import HashingExecutor
+
+
+def test_depth_counts_queued_and_running_jobs():
+    executor = HashingExecutor(workers=1, max_backlog=2)
+    release = threading.Event()
+
+    async def scenario():
+        jobs = [asyncio.ensure_future(executor.run("verify", release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        overloaded = executor.is_overloaded()
+        release.set()
+        await asyncio.gather(*jobs)
+        return overloaded
+
+    try:
+        assert asyncio.run(scenario())
+        assert executor.depth == 0
+        assert not executor.is_overloaded()
+    finally:
+        executor.shutdown()
+
+
+def test_run_returns_result_and_propagates_errors():
+    executor = HashingExecutor(workers=1, max_backlog=1)
+    try:
+        assert asyncio.run(executor.run("hash", str.upper, "abc")) == "ABC"
+        with pytest.raises(ValueError):
+            asyncio.run(executor.run("hash", int, "not a number"))
+        assert executor.depth == 0
+    finally:
+        executor.shutdown()
@@ -0,0 +1,39 @@
+import pytest
+
+from src.config.metrics import MetricsRegistry, _Metric
+
+
+def test_metric_base_is_abstract():
+    with pytest.raises(TypeError):
+        _Metric("base", "abstract")
+
+
+def test_counter_and_callback_gauge_render():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", labels=("route",))
+    requests.inc(route="/records")
+    requests.inc(2, route="/records")
+    registry.gauge("entries", "Entries", callback=lambda: [({}, 7)])
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/records"} 3.0' in lines
+    assert "entries 7" in lines
+
+
+def test_registry_returns_existing_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("hits", "Hits") is registry.counter("hits", "Hits")
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in lines
+    assert "latency_seconds_count 2" in lines
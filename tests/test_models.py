@@ -0,0 +1,22 @@
+from sqlalchemy.orm import configure_mappers
+
+import src.app.internal.data.models  # noqa: F401
+from src.app.internal.data.models.attachment_model import AttachmentModel
+from src.app.internal.data.models.record_model import RecordModel
+from src.app.internal.data.models.user_model import UserModel
+
+
+def test_mappers_configure():
+    configure_mappers()
+
+
+def test_record_user_relationships_use_distinct_columns():
+    configure_mappers()
+    assert list(RecordModel.user.property.local_columns) == [RecordModel.__table__.c.user_id]
+    assert list(RecordModel.claimer.property.local_columns) == [RecordModel.__table__.c.claimed_by]
+    assert UserModel.records.property.back_populates == "user"
+
+
+def test_attachments_join_without_foreign_key():
+    configure_mappers()
+    assert AttachmentModel.record.property.mapper.class_ is RecordModel
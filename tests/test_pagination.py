@@ -0,0 +1,43 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, select
+from sqlalchemy.dialects import postgresql
+
+from src.app.internal.data.pagination import (
+    InvalidCursorError, build_page, decode_cursor, encode_cursor, keyset, parse_datetime,
+)
+
+
+def test_cursor_round_trip():
+    key = (datetime(2026, 3, 1, 9, 30), uuid4())
+    cursor = encode_cursor(key)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, (parse_datetime, type(key[1]))) == key
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor([1]), encode_cursor({"a": 1}), ""])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, (int, int))
+
+
+def test_build_page_drops_the_extra_row():
+    page = build_page([1, 2, 3], 2, lambda item: (item,))
+    assert page.items == [1, 2]
+    assert decode_cursor(page.next_cursor, (int,)) == (2,)
+
+    last = build_page([1, 2], 2, lambda item: (item,))
+    assert last.next_cursor is None
+
+
+def test_keyset_descending_compares_and_orders_backwards():
+    table = Table("t", MetaData(), Column("at", DateTime), Column("id", Integer))
+    cursor = encode_cursor((datetime(2026, 1, 1), 5))
+    stmt = keyset(select(table), (table.c.at, table.c.id), cursor, (parse_datetime, int), 10, descending=True)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "(t.at, t.id) < (" in sql
+    assert "ORDER BY t.at DESC, t.id DESC" in sql
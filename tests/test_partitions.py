@@ -0,0 +1,16 @@
+from datetime import date
+
+from src.app.internal.data.partitions import add_months, is_partition, next_month, partition_name
+
+
+def test_next_month_rolls_over_year():
+    assert next_month(date(2025, 12, 1)) == date(2026, 1, 1)
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+
+
+def test_partition_names_are_recognised():
+    assert partition_name(date(2026, 3, 1)) == "records_y2026m03"
+    assert is_partition("records_y2026m03")
+    assert is_partition("records_default")
+    assert not is_partition("records")
+    assert not is_partition("records_flat")
@@ -0,0 +1,29 @@
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.app.internal.data.repositories import user_repository
+from src.app.internal.domain.entities.user_entity import UserEntity
+from src.app.internal.domain.services.principal_cache import PrincipalCache
+
+
+def make_user(login: str) -> UserEntity:
+    return UserEntity(uuid=uuid4(), login=login, password_hash="x", email=f"{login}@example.com")
+
+
+def test_invalidation_waits_for_commit(monkeypatch):
+    cache = PrincipalCache(maxsize=10)
+    monkeypatch.setattr(user_repository, "principal_cache", cache)
+    committed, rolled_back = make_user("a"), make_user("b")
+    expires_at = time.time() + 60
+    cache.put("token-a", committed, expires_at)
+    cache.put("token-b", rolled_back, expires_at)
+
+    session = SimpleNamespace(info={user_repository.PRINCIPAL_INVALIDATIONS: {committed.uuid}})
+    user_repository._invalidate_cached_principals(session)
+    assert cache.get("token-a") is None
+
+    session.info[user_repository.PRINCIPAL_INVALIDATIONS] = {rolled_back.uuid}
+    user_repository._drop_principal_invalidations(session)
+    user_repository._invalidate_cached_principals(session)
+    assert cache.get("token-b") is rolled_back
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.app.internal.data.repositories import queue_repository
+from src.app.internal.domain.entities.queue_entity import QueueEntity
+from src.app.internal.domain.services import queue_cache as queue_cache_module
+from src.app.internal.domain.services.queue_cache import QueueCache
+
+
+def make_queue(name: str) -> QueueEntity:
+    return QueueEntity(queue_id=uuid4(), name=name, owner_id=uuid4())
+
+
+def make_cache(maxsize: int = 2, ttl: float = 60) -> QueueCache:
+    cache = QueueCache(maxsize=maxsize, ttl=ttl)
+    cache.set_available(True)
+    return cache
+
+
+def test_lookup_by_id_and_name():
+    cache = make_cache()
+    queue = make_queue("dentist")
+    cache.put(queue)
+
+    assert cache.get(queue.queue_id) is queue
+    assert cache.get_by_name("dentist") is queue
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(maxsize=2)
+    first, second, third = make_queue("a"), make_queue("b"), make_queue("c")
+    cache.put(first)
+    cache.put(second)
+    cache.get(first.queue_id)
+    cache.put(third)
+
+    assert cache.get(second.queue_id) is None
+    assert cache.get_by_name("b") is None
+    assert cache.get(first.queue_id) is first
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(queue_cache_module.time, "monotonic", lambda: now[0])
+    cache = make_cache(ttl=10)
+    queue = make_queue("a")
+    cache.put(queue)
+
+    now[0] += 9
+    assert cache.get(queue.queue_id) is queue
+    now[0] += 2
+    assert cache.get(queue.queue_id) is None
+    assert len(cache) == 0
+
+
+def test_unavailable_cache_stores_nothing(monkeypatch):
+    monkeypatch.setattr(queue_cache_module, "QUEUE_CACHE_NOTIFY", True)
+    cache = QueueCache(maxsize=2, ttl=60)
+    cache.set_available(False)
+    queue = make_queue("a")
+    cache.put(queue)
+
+    assert cache.get(queue.queue_id) is None
+    assert cache.hit_ratio() == 0.0
+
+
+def test_invalidation_waits_for_commit(monkeypatch):
+    cache = make_cache()
+    monkeypatch.setattr(queue_repository, "queue_cache", cache)
+    committed, rolled_back = make_queue("a"), make_queue("b")
+    cache.put(committed)
+    cache.put(rolled_back)
+
+    session = SimpleNamespace(info={queue_repository.QUEUE_CACHE_INVALIDATIONS: {committed.queue_id}})
+    queue_repository._invalidate_cached_queues(session)
+    assert cache.get(committed.queue_id) is None
+
+    session.info[queue_repository.QUEUE_CACHE_INVALIDATIONS] = {rolled_back.queue_id}
+    queue_repository._drop_queue_invalidations(session)
+    queue_repository._invalidate_cached_queues(session)
+    assert cache.get(rolled_back.queue_id) is rolled_back
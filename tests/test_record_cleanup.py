@@ -0,0 +1,61 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from src.app.internal.domain.services import record_cleanup
+
+
+class FakeRepository:
+    pending = {}
+
+    def __init__(self, db):
+        pass
+
+    async def get_pending_object_deletions(self, limit, attempted_before):
+        keys = [key for key, attempted in self.pending.items() if attempted is None or attempted < attempted_before]
+        return keys[:limit]
+
+    async def finish_object_deletions(self, deleted, failed):
+        for key in deleted:
+            del self.pending[key]
+        for key in failed:
+            self.pending[key] = record_cleanup.datetime.utcnow()
+
+
+class FakeStorage:
+    def __init__(self, failing=(), raising=False):
+        self.failing = set(failing)
+        self.raising = raising
+        self.calls = []
+
+    def delete_many(self, object_keys):
+        self.calls.append(list(object_keys))
+        if self.raising:
+            raise ConnectionError("S3 unavailable")
+        return [key for key in object_keys if key in self.failing]
+
+
+@asynccontextmanager
+async def fake_session():
+    yield None
+
+
+def purge(monkeypatch, storage, keys, batch_size=2):
+    FakeRepository.pending = dict.fromkeys(keys)
+    monkeypatch.setattr(record_cleanup, "RecordRepository", FakeRepository)
+    monkeypatch.setattr(record_cleanup, "AsyncSessionLocal", fake_session)
+    return asyncio.run(record_cleanup.purge_deleted_objects(storage, batch_size))
+
+
+def test_purge_keeps_failed_keys_for_retry(monkeypatch):
+    storage = FakeStorage(failing={"b"})
+    assert purge(monkeypatch, storage, ["a", "b", "c"]) == 2
+    assert list(FakeRepository.pending) == ["b"]
+    # Неудачный ключ не повторяется в том же проходе
+    assert sum(call.count("b") for call in storage.calls) == 1
+
+
+def test_purge_survives_storage_errors(monkeypatch):
+    storage = FakeStorage(raising=True)
+    assert purge(monkeypatch, storage, ["a", "b", "c"]) == 0
+    assert sorted(FakeRepository.pending) == ["a", "b", "c"]
+    assert len(storage.calls) == 2
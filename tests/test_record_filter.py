@@ -0,0 +1,84 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.record_filter_plans import explain_indexes, page
+from src.app.internal.data.models.record_model import ACTIVE_STATUSES, ACTIVE_STATUSES_SQL, RecordModel, UrgencyLevel
+from src.app.internal.domain.entities.record_entity import RecordFilter
+from src.config.database import engine
+
+ACTIVE = RecordFilter(statuses=ACTIVE_STATUSES)
+
+
+def compile_where(stmt) -> str:
+    # Так выражение видит сервер: literal_execute-параметры подставлены в текст
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True}))
+    return sql.split("WHERE", 1)[1]
+
+
+@pytest.mark.parametrize("owner_column", [RecordModel.queue_id, RecordModel.user_id])
+@pytest.mark.parametrize("filters", [
+    ACTIVE,
+    RecordFilter(statuses=ACTIVE_STATUSES, descending=True),
+    RecordFilter(statuses=ACTIVE_STATUSES, urgency_levels=(UrgencyLevel.HIGH,)),
+])
+def test_status_literals_match_partial_index_predicate(owner_column, filters):
+    # Условие частичных индексов доказывается только по литералам, не по параметрам
+    assert f"records.{ACTIVE_STATUSES_SQL}" in compile_where(page(owner_column, uuid4(), filters))
+
+
+def test_unfiltered_page_has_no_status_condition():
+    assert "records.status" not in compile_where(page(RecordModel.queue_id, uuid4()))
+
+
+@pytest.fixture
+def conn():
+    try:
+        connection = engine.connect()
+    except OperationalError:
+        pytest.skip("PostgreSQL из DATABASE_URL недоступна")
+    try:
+        if not inspect(connection).has_table("records"):
+            pytest.skip("к базе не применены миграции")
+        transaction = connection.begin()
+        try:
+            yield connection
+        finally:
+            transaction.rollback()
+    finally:
+        connection.close()
+
+
+def test_active_pages_use_partial_indexes(conn):
+    user_id, queue_id = uuid4(), uuid4()
+    conn.execute(
+        text(
+            "INSERT INTO users (uuid, login, password_hash, email, email_notifications, telegram_notifications) "
+            "VALUES (:id, :login, 'x', :email, false, false)"
+        ),
+        {"id": user_id, "login": f"test-{user_id}", "email": f"test-{user_id}@example.com"},
+    )
+    conn.execute(
+        text(
+            "INSERT INTO queues (queue_id, name, owner_id, cleanup_interval, record_interval) "
+            "VALUES (:id, :name, :owner, interval '30 days', interval '30 minutes')"
+        ),
+        {"id": queue_id, "name": f"test-{queue_id}", "owner": user_id},
+    )
+    conn.execute(
+        text(
+            "INSERT INTO records (record_id, user_id, queue_id, purpose, meeting_datetime, urgency_level, status) "
+            "SELECT gen_random_uuid(), :user_id, :queue_id, 'test', "
+            "timestamp '2024-01-01' + n * interval '30 minutes', 'MEDIUM'::urgencylevel, "
+            "(CASE WHEN n % 20 = 0 THEN 'PENDING' ELSE 'COMPLETED' END)::status "
+            "FROM generate_series(0, 19999) AS n"
+        ),
+        {"user_id": user_id, "queue_id": queue_id},
+    )
+    conn.execute(text("ANALYZE records"))
+
+    assert "ix_records_queue_active" in explain_indexes(conn, page(RecordModel.queue_id, queue_id, ACTIVE))
+    assert "ix_records_user_active" in explain_indexes(conn, page(RecordModel.user_id, user_id, ACTIVE))
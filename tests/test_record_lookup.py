@@ -0,0 +1,25 @@
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.app.internal.data.models.record_model import RecordModel
+from src.app.internal.data.repositories.record_repository import _record_key
+
+
+def compile_where(record_id, meeting_datetime=None) -> str:
+    stmt = select(RecordModel.record_id).where(_record_key(record_id, meeting_datetime))
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_known_meeting_time_bounds_the_lookup():
+    sql = compile_where(uuid4(), datetime(2026, 3, 2, 9, 0))
+    assert "records.meeting_datetime = %(meeting_datetime_1)s" in sql
+    assert "record_locator" not in sql
+
+
+def test_unknown_meeting_time_comes_from_record_locator():
+    sql = compile_where(uuid4())
+    assert "records.meeting_datetime = (SELECT record_locator.meeting_datetime" in sql
+    assert "WHERE record_locator.record_id = " in sql
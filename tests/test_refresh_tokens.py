@@ -0,0 +1,54 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.app.internal.data.repositories.auth_repository import TOKEN_SEPARATOR, AuthRepository, pwd_context
+
+
+class FakeSession:
+    def __init__(self, candidate=None, legacy=()):
+        self.info = {}
+        self.inserted = []
+        self.candidate = candidate
+        self.legacy = list(legacy)
+        self.legacy_queried = False
+
+    async def execute(self, stmt):
+        self.inserted.append(stmt.compile().params)
+
+    async def commit(self):
+        pass
+
+    async def scalar(self, stmt):
+        return self.candidate
+
+    async def scalars(self, stmt):
+        self.legacy_queried = True
+        return SimpleNamespace(all=lambda: self.legacy)
+
+
+def test_refresh_token_is_selector_and_verifier():
+    db = FakeSession()
+    token = asyncio.run(AuthRepository(db).create_refresh_token(user_uuid=None))
+
+    selector, verifier = token.split(TOKEN_SEPARATOR)
+    stored = db.inserted[0]
+    assert stored["selector"] == selector
+    assert len(selector) <= 32
+    assert pwd_context.verify(verifier, stored["token_hash"])
+    assert not pwd_context.verify(token, stored["token_hash"])
+
+
+def test_lookup_checks_only_the_verifier_of_the_selected_row():
+    candidate = SimpleNamespace(token_hash=pwd_context.hash("verifier"))
+    repo = AuthRepository(FakeSession(candidate=candidate))
+
+    assert asyncio.run(repo.find_valid_refresh_token(f"selector{TOKEN_SEPARATOR}verifier")) is candidate
+    assert asyncio.run(repo.find_valid_refresh_token(f"selector{TOKEN_SEPARATOR}other")) is None
+
+
+def test_token_without_separator_uses_legacy_scan():
+    legacy = SimpleNamespace(token_hash=pwd_context.hash("legacy-token"))
+    db = FakeSession(legacy=[legacy])
+
+    assert asyncio.run(AuthRepository(db).find_valid_refresh_token("legacy-token")) is legacy
+    assert db.legacy_queried
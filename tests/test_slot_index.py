@@ -0,0 +1,140 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.app.internal.data.repositories import record_repository
+from src.app.internal.data.repositories.record_repository import RecordRepository
+from src.app.internal.domain.services.slot_index import QueueSlots, SlotIndex
+
+HALF_HOUR = timedelta(minutes=30)
+NINE = datetime(2026, 3, 2, 9, 0)
+
+
+def test_collision_uses_open_interval():
+    first = uuid4()
+    slots = QueueSlots(1, [(first, NINE)])
+
+    assert slots.collides(NINE + timedelta(minutes=29), HALF_HOUR)
+    assert not slots.collides(NINE + HALF_HOUR, HALF_HOUR)
+    assert not slots.collides(NINE - HALF_HOUR, HALF_HOUR)
+    # Перенос записи не пересекается с ней самой
+    assert not slots.collides(NINE + timedelta(minutes=10), HALF_HOUR, exclude=first)
+
+
+def test_aware_times_are_compared_as_utc():
+    slots = QueueSlots(1, [(uuid4(), NINE)])
+    moscow = timezone(timedelta(hours=3))
+    assert slots.collides(datetime(2026, 3, 2, 12, 10, tzinfo=moscow), HALF_HOUR)
+
+
+def test_nearest_free_skips_back_to_back_records():
+    slots = QueueSlots(1, [(uuid4(), NINE), (uuid4(), NINE + HALF_HOUR), (uuid4(), NINE + 3 * HALF_HOUR)])
+
+    assert slots.nearest_free(NINE, HALF_HOUR) == NINE + 2 * HALF_HOUR
+    assert slots.nearest_free(NINE - 2 * HALF_HOUR, HALF_HOUR) == NINE - 2 * HALF_HOUR
+
+
+def test_add_and_remove_keep_order():
+    moved = uuid4()
+    slots = QueueSlots(1, [(uuid4(), NINE), (moved, NINE + 4 * HALF_HOUR)])
+    slots.remove(moved)
+    slots.add(moved, NINE + HALF_HOUR)
+
+    assert len(slots) == 2
+    assert slots.collides(NINE + HALF_HOUR, HALF_HOUR)
+    assert not slots.collides(NINE + 4 * HALF_HOUR, HALF_HOUR)
+
+
+def test_index_applies_only_the_next_version():
+    queue_id, record_id = uuid4(), uuid4()
+    index = SlotIndex(maxsize=2)
+    index.put(queue_id, QueueSlots(1, []))
+
+    index.apply(queue_id, 2, added=[(record_id, NINE)])
+    slots = index.get(queue_id, 2)
+    assert slots is not None and slots.collides(NINE, HALF_HOUR)
+
+    # Пропущенная версия: индекс сбрасывается и будет перечитан
+    index.apply(queue_id, 4, removed=[record_id])
+    assert index.get(queue_id, 4) is None
+
+
+def test_index_evicts_least_recently_used_queue():
+    index = SlotIndex(maxsize=2)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    index.put(first, QueueSlots(1, []))
+    index.put(second, QueueSlots(1, []))
+    index.get(first, 1)
+    index.put(third, QueueSlots(1, []))
+
+    assert index.get(second, 1) is None
+    assert index.get(first, 1) is not None
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, versions, records):
+        self.info = {}
+        self.versions = versions
+        self.records = records
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        if len(self.statements) == 1:
+            return FakeResult(list(self.versions.items()))
+        loaded = stmt.compile().params
+        queue_ids = next(value for value in loaded.values() if isinstance(value, list))
+        return FakeResult([
+            SimpleNamespace(queue_id=queue_id, records_version=self.versions[queue_id], record_id=record_id,
+                            meeting_datetime=when)
+            for queue_id in queue_ids for record_id, when in self.records.get(queue_id, [(None, None)])
+        ])
+
+
+def test_queue_slots_are_loaded_with_one_version_query(monkeypatch):
+    cached, stale = uuid4(), uuid4()
+    index = SlotIndex(maxsize=10)
+    index.put(cached, QueueSlots(3, [], since=NINE - HALF_HOUR))
+    monkeypatch.setattr(record_repository, "slot_index", index)
+    monkeypatch.setattr(record_repository, "SLOT_INDEX_ENABLED", True)
+    db = FakeSession({cached: 3, stale: 7}, {stale: [(uuid4(), NINE)]})
+
+    slots = asyncio.run(RecordRepository(db)._queue_slots_many({cached: NINE, stale: NINE}))
+
+    assert len(db.statements) == 2
+    assert slots[cached] is index.get(cached, 3)
+    assert slots[stale].version == 7 and slots[stale].collides(NINE, HALF_HOUR)
+    assert index.get(stale, 7) is slots[stale]
+
+
+def test_cached_slots_without_enough_history_are_reloaded(monkeypatch):
+    queue_id = uuid4()
+    index = SlotIndex(maxsize=10)
+    index.put(queue_id, QueueSlots(3, [], since=NINE))
+    monkeypatch.setattr(record_repository, "slot_index", index)
+    monkeypatch.setattr(record_repository, "SLOT_INDEX_ENABLED", True)
+    earlier = NINE - timedelta(days=30)
+    db = FakeSession({queue_id: 3}, {queue_id: [(uuid4(), earlier)]})
+
+    slots = asyncio.run(RecordRepository(db)._queue_slots(queue_id, earlier - HALF_HOUR))
+
+    assert len(db.statements) == 2
+    assert slots.covers(earlier - HALF_HOUR) and slots.collides(earlier, HALF_HOUR)
+    # Граница загрузки по ключу секционирования попадает в сам запрос
+    assert "records.meeting_datetime >" in str(db.statements[1])
+
+
+def test_slots_cover_only_times_after_load_bound():
+    slots = QueueSlots(1, [], since=NINE)
+    assert slots.covers(NINE)
+    assert not slots.covers(NINE - timedelta(minutes=1))
+    assert QueueSlots(1, []).covers(datetime(2000, 1, 1))